@@ -0,0 +1,75 @@
+"""
+Benchmark: sync vs async database path of the Phase 4 API.
+
+Starts `phase4_database.crud_api:app` under uvicorn twice (TASKS_ASYNC_DB=0
+and TASKS_ASYNC_DB=1) against a throwaway SQLite file, then fires a mix of
+GET /tasks/{id} and GET /tasks?limit=50 at several concurrency levels.
+
+Run from the repo root:
+    python -m benchmarks.bench_async_db
+    python -m benchmarks.bench_async_db --concurrency 1 64 --requests 4000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+from pathlib import Path
+
+from .common import run_load, seed, start_server, stop_server
+
+
+def pick_read(max_id: int):
+    """80% single-task reads, 20% pages of 50 from a random cursor."""
+    def pick():
+        if random.random() < 0.8:
+            return "GET", f"/tasks/{random.randint(1, max_id)}", None
+        after = random.randint(0, max_id)
+        return "GET", f"/tasks?limit=50&after={after}", None
+    return pick
+
+
+def main() -> None:
+    """Run both modes and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+",
+                        default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results: dict[str, dict[int, dict]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        base_url = f"http://127.0.0.1:{args.port}"
+        for mode in ("sync", "async"):
+            proc = start_server(
+                "phase4_database.crud_api:app", args.port,
+                {"TASKS_DB_PATH": str(db_path),
+                 "TASKS_ASYNC_DB": "1" if mode == "async" else "0"})
+            try:
+                if mode == "sync":
+                    seed(base_url, args.rows)
+                results[mode] = {
+                    c: asyncio.run(run_load(base_url, c, args.requests,
+                                            pick_read(args.rows)))
+                    for c in args.concurrency
+                }
+            finally:
+                stop_server(proc)
+
+    print(f"{'conc':>5} | {'mode':>5} | {'req/s':>8} | {'p50 ms':>8} | "
+          f"{'p99 ms':>8} | {'errors':>6}")
+    print("-" * 57)
+    for c in args.concurrency:
+        for mode in ("sync", "async"):
+            r = results[mode][c]
+            print(f"{c:>5} | {mode:>5} | {r['rps']:>8.0f} | "
+                  f"{r['p50_ms']:>8.2f} | {r['p99_ms']:>8.2f} | "
+                  f"{r['errors']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: Phase 1 calculator, scalar loop vs whole-column batches.
+
+- scalar: simple_calculator's add/subtract/multiply/divide called once
+          per row, catching ZeroDivisionError (the loop a batch job
+          would write without batch_calculator)
+- batch:  batch_calculator.calculate() on whole columns (NumPy if
+          installed, else array-module loops)
+
+Also times the CSV mode end to end (parse, calculate, write) against a
+scalar csv.reader loop, and POST /calculate on the Phase 2 calculator
+API under uvicorn.
+
+Run from the repo root:
+    python -m benchmarks.bench_batch_calculator
+    python -m benchmarks.bench_batch_calculator --rows 5000000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import io
+import random
+import time
+
+from phase1_basics import batch_calculator
+from phase1_basics.simple_calculator import OPERATIONS
+
+from .common import run_load, start_server, stop_server
+
+
+def scalar_loop(fn, xs, ys) -> list:
+    """One call per row; division by zero gives nan."""
+    results = []
+    for x, y in zip(xs, ys):
+        try:
+            results.append(fn(x, y))
+        except ZeroDivisionError:
+            results.append(float("nan"))
+    return results
+
+
+def scalar_csv(text: str) -> None:
+    """The CSV job as a per-row loop over csv.reader."""
+    reader = csv.reader(io.StringIO(text))
+    writer = csv.writer(io.StringIO(), lineterminator="\n")
+    writer.writerow(next(reader) + ["result", "error"])
+    for row in reader:
+        try:
+            writer.writerow(row + [repr(float(row[0]) / float(row[1])), ""])
+        except ZeroDivisionError:
+            writer.writerow(row + ["", "division by zero"])
+
+
+def rate(fn, rows: int) -> float:
+    """Rows per second of fn()."""
+    started = time.perf_counter()
+    fn()
+    return rows / (time.perf_counter() - started)
+
+
+def main() -> None:
+    """Time each path and print tables."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--api-rows", type=int, default=10_000,
+                        help="rows per POST /calculate")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    # 1% of divisors are zero
+    xs = [random.uniform(-1000, 1000) for _ in range(args.rows)]
+    ys = [0.0 if random.random() < 0.01 else random.uniform(-1000, 1000)
+          for _ in range(args.rows)]
+    engine = "NumPy" if batch_calculator.np is not None else "array loops"
+    print(f"{args.rows:,} rows, batch engine: {engine}")
+    print(f"{'op':<9} | {'scalar rows/s':>13} | {'batch rows/s':>12} | "
+          f"{'speedup':>7}")
+    print("-" * 51)
+    for op, fn in OPERATIONS.items():
+        scalar = rate(lambda: scalar_loop(fn, xs, ys), args.rows)
+        batch = rate(lambda: batch_calculator.calculate(op, xs, ys),
+                     args.rows)
+        print(f"{op:<9} | {scalar:>13,.0f} | {batch:>12,.0f} | "
+              f"{batch / scalar:>6.1f}x")
+
+    text = "x,y\n" + "".join(f"{x!r},{y!r}\n" for x, y in zip(xs, ys))
+    scalar = rate(lambda: scalar_csv(text), args.rows)
+    batch = rate(lambda: batch_calculator.calculate_csv(
+        "divide", io.StringIO(text), io.StringIO()), args.rows)
+    print(f"\nCSV divide, end to end: scalar {scalar:,.0f} rows/s, "
+          f"batch {batch:,.0f} rows/s ({batch / scalar:.1f}x)")
+
+    body = {"op": "divide", "x": xs[:args.api_rows],
+            "y": ys[:args.api_rows]}
+    proc = start_server("phase2_fastapi.calculator_api:app", args.port,
+                        probe="/openapi.json")
+    try:
+        r = asyncio.run(run_load(f"http://127.0.0.1:{args.port}", 1,
+                                 args.requests,
+                                 lambda: ("POST", "/calculate", body)))
+    finally:
+        stop_server(proc)
+    print(f"POST /calculate, {args.api_rows:,} rows: {r['rps']:.0f} req/s "
+          f"({r['rps'] * args.api_rows:,.0f} rows/s), "
+          f"p50 {r['p50_ms']:.1f} ms, p99 {r['p99_ms']:.1f} ms, "
+          f"{r['errors']} errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: Phase 1 breach list checks, set vs memory-mapped index.
+
+- set:   every listed password held in a Python set (the simple way)
+- index: build_index() to a file of sorted 8-byte SHA-1 prefixes, then
+         BreachIndex (mmap + binary search)
+
+Reports build time, memory (tracemalloc peak for the set, file size
+for the index), lookup time for listed and unlisted passwords, and the
+rate of screen() over a candidates file.
+
+Run from the repo root:
+    python -m benchmarks.bench_breach_check
+    python -m benchmarks.bench_breach_check --size 10000000
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from phase1_basics.breach_check import BreachIndex, build_index, screen
+from phase1_basics.password_generator import generate_passwords
+
+
+def per_lookup_us(contains, passwords) -> float:
+    """Average microseconds per membership test."""
+    started = time.perf_counter()
+    for password in passwords:
+        contains(password)
+    return (time.perf_counter() - started) / len(passwords) * 1e6
+
+
+def main() -> None:
+    """Time both approaches and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000,
+                        help="passwords on the breach list")
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--candidates", type=int, default=1_000_000,
+                        help="passwords in the screened file")
+    args = parser.parse_args()
+
+    listed = generate_passwords(args.size, length=10, use_symbols=False)
+    hits = listed[:args.lookups]
+    misses = generate_passwords(args.lookups, length=11, use_symbols=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        wordlist = Path(tmp) / "words.txt"
+        wordlist.write_text("\n".join(listed) + "\n")
+        candidates = Path(tmp) / "candidates.txt"
+        with open(candidates, "w") as f:
+            for start in range(0, args.candidates, 100_000):
+                count = min(100_000, args.candidates - start)
+                f.write("\n".join(generate_passwords(count, length=16)))
+                f.write("\n")
+        del listed
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        with open(wordlist) as f:
+            words = {line.rstrip("\n") for line in f}
+        set_build = time.perf_counter() - started
+        set_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+        set_hit = per_lookup_us(words.__contains__, hits)
+        set_miss = per_lookup_us(words.__contains__, misses)
+        del words
+
+        path = Path(tmp) / "words.idx"
+        started = time.perf_counter()
+        with open(wordlist) as f:
+            build_index(f, path)
+        index_build = time.perf_counter() - started
+        index_mb = os.path.getsize(path) / 1e6
+        # again under tracemalloc, which slows it down, for the peak
+        tracemalloc.start()
+        with open(wordlist) as f:
+            build_index(f, path)
+        build_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+        with BreachIndex(path) as index:
+            index_hit = per_lookup_us(index.__contains__, hits)
+            index_miss = per_lookup_us(index.__contains__, misses)
+            started = time.perf_counter()
+            with open(candidates) as f:
+                screened, _ = screen(index, f, io.StringIO(), flagged=True)
+            rate = screened / (time.perf_counter() - started)
+
+    print(f"{args.size:,} listed passwords")
+    print(f"{'approach':<8} | {'build s':>7} | {'memory MB':>9} | "
+          f"{'hit us':>6} | {'miss us':>7}")
+    print("-" * 50)
+    print(f"{'set':<8} | {set_build:>7.2f} | {set_mb:>9.1f} | "
+          f"{set_hit:>6.2f} | {set_miss:>7.2f}")
+    print(f"{'index':<8} | {index_build:>7.2f} | {index_mb:>9.1f} | "
+          f"{index_hit:>6.2f} | {index_miss:>7.2f}")
+    print(f"index build peak (tracemalloc): {build_mb:.1f} MB")
+    print(f"screen(): {rate:,.0f} candidates/s over {screened:,}")
+
+
+if __name__ == "__main__":
+    main()
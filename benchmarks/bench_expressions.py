@@ -0,0 +1,67 @@
+"""
+Benchmark: Phase 1 expression engine, parsing vs the compiled cache.
+
+For each formula, µs per evaluation with fresh variable values:
+
+- parse:    Expression(source) every time (tokenize, parse, compile)
+- cached:   evaluate(source, env), compile_expression() LRU lookup + call
+- compiled: an Expression compiled once, called directly
+- eval:     Python's own compile() + eval() of the same text, for scale
+            (unsafe on user input; what the engine replaces)
+
+Run from the repo root:
+    python -m benchmarks.bench_expressions
+    python -m benchmarks.bench_expressions --evals 200000
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+
+from phase1_basics.expression_engine import Expression, evaluate
+
+FORMULAS = [
+    "x + 1",
+    "2 * (x + 1) ** 2 - sqrt(y)",
+    "max(x, y) / (1 + abs(x - y)) + log(y + 1, 2)",
+]
+
+
+def per_eval_us(run, envs) -> float:
+    """Average µs of run(env) over envs."""
+    started = time.perf_counter()
+    for env in envs:
+        run(env)
+    return (time.perf_counter() - started) / len(envs) * 1e6
+
+
+def main() -> None:
+    """Time each approach and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--evals", type=int, default=100_000)
+    args = parser.parse_args()
+
+    envs = [{"x": random.uniform(1, 100), "y": random.uniform(1, 100)}
+            for _ in range(args.evals)]
+    parse_envs = envs[:args.evals // 20]
+    names = {"sqrt": math.sqrt, "log": math.log, "max": max, "abs": abs}
+
+    print(f"{'formula':<46} | {'parse':>7} | {'cached':>6} | "
+          f"{'compiled':>8} | {'eval':>5}")
+    print("-" * 85)
+    for source in FORMULAS:
+        parsed = per_eval_us(lambda env: Expression(source)(env), parse_envs)
+        cached = per_eval_us(lambda env: evaluate(source, env), envs)
+        compiled = Expression(source)
+        direct = per_eval_us(compiled, envs)
+        code = compile(source, "<formula>", "eval")
+        builtin = per_eval_us(lambda env: eval(code, names, env), envs)
+        print(f"{source:<46} | {parsed:>7.2f} | {cached:>6.2f} | "
+              f"{direct:>8.2f} | {builtin:>5.2f}")
+    print("(µs per evaluation)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: group commit on/off for write-heavy Phase 4 traffic.
+
+Starts `phase4_database.crud_api:app` under uvicorn with
+TASKS_GROUP_COMMIT=0 and =1 for each SQLite profile, every run against
+its own scratch file, and sends only writes (2:1 PATCH:POST by default)
+at several concurrency levels. With group commit on, the average batch
+size is read back from GET /stats.
+
+Run from the repo root:
+    python -m benchmarks.bench_group_commit
+    python -m benchmarks.bench_group_commit --profiles default --window 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+from pathlib import Path
+
+import httpx
+
+from .bench_sqlite_profile import PROFILES, pick_mixed
+from .common import run_load, seed, start_server, stop_server
+
+
+def main() -> None:
+    """Run every profile with group commit off and on; print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+",
+                        default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--writes", type=float, default=1.0,
+                        help="fraction of requests that write (0-1)")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES))
+    parser.add_argument("--window", default="2",
+                        help="TASKS_GROUP_COMMIT_WINDOW_MS")
+    parser.add_argument("--max-batch", default="64",
+                        help="TASKS_GROUP_COMMIT_MAX_BATCH")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    print(f"{'conc':>5} | {'profile':>10} | {'group':>5} | {'req/s':>8} | "
+          f"{'p50 ms':>8} | {'p99 ms':>8} | {'errors':>6} | "
+          f"{'avg batch':>9}")
+    print("-" * 82)
+    with tempfile.TemporaryDirectory() as tmp:
+        base_url = f"http://127.0.0.1:{args.port}"
+        for profile in args.profiles:
+            for group in ("off", "on"):
+                proc = start_server(
+                    "phase4_database.crud_api:app", args.port,
+                    {"TASKS_DB_PATH": str(Path(tmp) / f"{profile}-{group}.db"),
+                     "TASKS_DB_PROFILE": profile,
+                     "TASKS_GROUP_COMMIT": "1" if group == "on" else "0",
+                     "TASKS_GROUP_COMMIT_WINDOW_MS": args.window,
+                     "TASKS_GROUP_COMMIT_MAX_BATCH": args.max_batch})
+                try:
+                    seed(base_url, args.rows)
+                    for c in args.concurrency:
+                        before = _group_stats(base_url)
+                        r = asyncio.run(run_load(
+                            base_url, c, args.requests,
+                            pick_mixed(args.rows, args.writes)))
+                        after = _group_stats(base_url)
+                        batches = after["batches"] - before["batches"]
+                        avg = ((after["ops"] - before["ops"]) / batches
+                               if batches else 0.0)
+                        print(f"{c:>5} | {profile:>10} | {group:>5} | "
+                              f"{r['rps']:>8.0f} | {r['p50_ms']:>8.2f} | "
+                              f"{r['p99_ms']:>8.2f} | {r['errors']:>6} | "
+                              f"{avg:>9.1f}")
+                finally:
+                    stop_server(proc)
+
+
+def _group_stats(base_url: str) -> dict:
+    """Group commit counters from GET /stats (zeros when disabled)."""
+    stats = httpx.get(f"{base_url}/stats").json()["group_commit"]
+    return stats or {"batches": 0, "ops": 0}
+
+
+if __name__ == "__main__":
+    main()
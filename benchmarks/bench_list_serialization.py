@@ -0,0 +1,106 @@
+"""
+Microbenchmark: serialization of GET /tasks list responses.
+
+Compares, in-process and with the list cache disabled, the time to turn
+a page of rows into response bytes:
+
+- orm+pydantic: load Task instances, snapshot them, validate each one
+  through the Pydantic Task model and render with json (the path used
+  before the column read path; what FastAPI does for response_model)
+- core+json:    select the record columns, encode from the tuples, json
+- core+orjson:  the same, encoded with orjson (skipped if not installed)
+
+Run from the repo root:
+    python -m benchmarks.bench_list_serialization
+    python -m benchmarks.bench_list_serialization --sizes 50 5000 --rows 50000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+
+def best_ms(fn: Callable[[], bytes], seconds: float) -> float:
+    """Best time of one call in ms, over about `seconds` of repeats."""
+    best = float("inf")
+    deadline = time.perf_counter() + seconds
+    while True:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        if start + elapsed > deadline:
+            return best * 1000
+
+
+def main() -> None:
+    """Seed a scratch database and time each path per page size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[50, 1000, 20_000])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    # the database module reads its path at import time
+    os.environ["TASKS_DB_PATH"] = str(Path(tmp.name) / "bench.db")
+    from pydantic import TypeAdapter
+    from sqlalchemy import insert, select
+
+    from phase4_database import crud_api
+    from phase4_database.database_orm import (
+        SessionLocal, Task, TaskRecord, init_db, list_cache, orm_list_tasks,
+    )
+
+    init_db()
+    list_cache.maxsize = 0
+    with SessionLocal.begin() as session:
+        session.execute(insert(Task), [
+            {"title": f"task {i} ✓", "description": "", "completed": i % 2}
+            for i in range(args.rows)
+        ])
+    adapter = TypeAdapter(List[crud_api.Task])
+
+    def orm_pydantic(session, size: int) -> bytes:
+        tasks = session.scalars(select(Task).order_by(Task.id).limit(size))
+        records = [TaskRecord.from_task(task) for task in tasks]
+        session.expunge_all()
+        value = adapter.validate_python(records, from_attributes=True)
+        content = adapter.dump_python(value, mode="json")
+        return json.dumps(content, ensure_ascii=False,
+                          separators=(",", ":")).encode()
+
+    def core(session, size: int) -> bytes:
+        return crud_api.encode_tasks(orm_list_tasks(session, limit=size))
+
+    orjson = crud_api.orjson
+    paths = {"orm+pydantic": (orm_pydantic, None),
+             "core+json": (core, None)}
+    if orjson is not None:
+        paths["core+orjson"] = (core, orjson)
+
+    print(f"{'rows':>6} | {'path':>12} | {'ms/call':>8} | {'speedup':>7}")
+    print("-" * 44)
+    with SessionLocal() as session:
+        for size in args.sizes:
+            baseline = None
+            for name, (fn, encoder) in paths.items():
+                crud_api.orjson = encoder
+                expected = orm_pydantic(session, size)
+                assert json.loads(fn(session, size)) == json.loads(expected)
+                ms = best_ms(lambda: fn(session, size), args.seconds)
+                baseline = baseline or ms
+                print(f"{size:>6} | {name:>12} | {ms:>8.3f} | "
+                      f"{baseline / ms:>6.1f}x")
+    crud_api.orjson = orjson
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
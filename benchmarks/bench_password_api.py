@@ -0,0 +1,74 @@
+"""
+Benchmark: Phase 2 password API latency, and cached PasswordPolicy.
+
+- in-process: µs per single password from a policy built on every call
+  (what generate_password() did before) vs the cached password_policy()
+- HTTP: starts `phase2_fastapi.password_api:app` under uvicorn and
+  sends GET /passwords?count=N at each concurrency level
+
+Run from the repo root:
+    python -m benchmarks.bench_password_api
+    python -m benchmarks.bench_password_api --counts 1 1000 --concurrency 1 32
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from phase1_basics.password_generator import password_policy
+
+from .common import run_load, start_server, stop_server
+
+
+def per_call_us(make_policy, calls: int) -> float:
+    """Average µs to get a policy and draw one password from it."""
+    started = time.perf_counter()
+    for _ in range(calls):
+        make_policy(16, enforce_requirements=True).generate(1)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    """Time both and print tables."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--counts", type=int, nargs="+",
+                        default=[1, 100, 10_000])
+    parser.add_argument("--concurrency", type=int, nargs="+",
+                        default=[1, 16])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--calls", type=int, default=50_000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    rebuilt = per_call_us(password_policy.__wrapped__, args.calls)
+    cached = per_call_us(password_policy, args.calls)
+    print("one password of length 16, enforced:")
+    print(f"  policy rebuilt every call: {rebuilt:.2f} us")
+    print(f"  cached policy:             {cached:.2f} us "
+          f"({rebuilt / cached:.1f}x)")
+    print()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    proc = start_server("phase2_fastapi.password_api:app", args.port,
+                        probe="/passwords")
+    try:
+        print(f"{'count':>6} | {'conc':>4} | {'req/s':>7} | "
+              f"{'passwords/s':>11} | {'p50 ms':>7} | {'p99 ms':>7} | "
+              f"{'errors':>6}")
+        print("-" * 67)
+        for count in args.counts:
+            url = f"/passwords?count={count}&length=16&enforce=true"
+            for c in args.concurrency:
+                r = asyncio.run(run_load(base_url, c, args.requests,
+                                         lambda: ("GET", url, None)))
+                print(f"{count:>6} | {c:>4} | {r['rps']:>7.0f} | "
+                      f"{r['rps'] * count:>11,.0f} | "
+                      f"{r['p50_ms']:>7.2f} | {r['p99_ms']:>7.2f} | "
+                      f"{r['errors']:>6}")
+    finally:
+        stop_server(proc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: Phase 1 password generation across worker processes.
+
+Writes --count passwords to a temp file with write_passwords() (one
+process, no pool) and with write_passwords_parallel() for each worker
+count, ordered and unordered, and reports passwords per second.
+
+Speedup is bounded by the CPUs this machine has (printed first).
+
+Run from the repo root:
+    python -m benchmarks.bench_password_workers
+    python -m benchmarks.bench_password_workers --count 20000000 --workers 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from phase1_basics.password_generator import (
+    write_passwords,
+    write_passwords_parallel,
+)
+
+
+def main() -> None:
+    """Time each worker count and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=5_000_000)
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[1, 2, 4])
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}, {args.count:,} passwords of length "
+          f"{args.length}")
+    print(f"{'mode':<22} | {'seconds':>7} | {'passwords/s':>12} | "
+          f"{'vs 1 proc':>9}")
+    print("-" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        output = str(Path(tmp) / "passwords.txt")
+        runs = [("in-process", None, True)]
+        for workers in args.workers:
+            runs.append((f"{workers} workers, ordered", workers, True))
+            runs.append((f"{workers} workers, unordered", workers, False))
+        base = None
+        for name, workers, ordered in runs:
+            started = time.perf_counter()
+            if workers is None:
+                write_passwords(args.count, output, length=args.length)
+            else:
+                write_passwords_parallel(args.count, output,
+                                         workers=workers, ordered=ordered,
+                                         length=args.length)
+            elapsed = time.perf_counter() - started
+            base = base or elapsed
+            print(f"{name:<22} | {elapsed:>7.2f} | "
+                  f"{args.count / elapsed:>12,.0f} | "
+                  f"{base / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
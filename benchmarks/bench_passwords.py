@@ -0,0 +1,74 @@
+"""
+Benchmark: Phase 1 password generation, per character vs bulk.
+
+- old:  the original generate_password(), one secrets.choice() call per
+        character (and secure_shuffle() with requirements), in a loop
+- bulk: generate_passwords(n), os.urandom blocks mapped to the pool by
+        bytes.translate() with rejection sampling
+
+Reports passwords per second for each length and requirements setting.
+
+Run from the repo root:
+    python -m benchmarks.bench_passwords
+    python -m benchmarks.bench_passwords --count 200000 --lengths 16
+"""
+from __future__ import annotations
+
+import argparse
+import secrets
+import string
+import time
+
+from phase1_basics.password_generator import generate_passwords
+
+
+def secure_shuffle(chars: list[str]) -> None:
+    """The original generator's Fisher-Yates shuffle."""
+    for i in range(len(chars) - 1, 0, -1):
+        j = secrets.randbelow(i + 1)
+        chars[i], chars[j] = chars[j], chars[i]
+
+
+def old_generate_password(length: int, enforce_requirements: bool) -> str:
+    """The original generate_password() with digits and symbols."""
+    pool = string.ascii_letters + string.digits + string.punctuation
+    if enforce_requirements:
+        required = [secrets.choice(string.digits),
+                    secrets.choice(string.punctuation)]
+        chars = required + [secrets.choice(pool)
+                            for _ in range(length - len(required))]
+        secure_shuffle(chars)
+        return "".join(chars)
+    return "".join(secrets.choice(pool) for _ in range(length))
+
+
+def main() -> None:
+    """Time both generators and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100_000,
+                        help="passwords per bulk measurement")
+    parser.add_argument("--old-count", type=int, default=10_000,
+                        help="passwords per old measurement")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[12, 32])
+    args = parser.parse_args()
+
+    print(f"{'length':>6} | {'enforce':>7} | {'old /s':>9} | "
+          f"{'bulk /s':>10} | {'speedup':>7}")
+    print("-" * 52)
+    for length in args.lengths:
+        for enforce in (False, True):
+            started = time.perf_counter()
+            for _ in range(args.old_count):
+                old_generate_password(length, enforce)
+            old = args.old_count / (time.perf_counter() - started)
+
+            started = time.perf_counter()
+            generate_passwords(args.count, length=length,
+                               enforce_requirements=enforce)
+            bulk = args.count / (time.perf_counter() - started)
+            print(f"{length:>6} | {str(enforce):>7} | {old:>9,.0f} | "
+                  f"{bulk:>10,.0f} | {bulk / old:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
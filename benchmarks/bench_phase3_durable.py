@@ -0,0 +1,97 @@
+"""
+Benchmark: Phase 3 DurableTaskStore write throughput and startup time.
+
+Writes: creates tasks one by one with each fsync policy (every change,
+batched every few ms, never) and reports changes per second. The
+in-memory TaskStore is the ceiling.
+
+Startup: fills a store with N tasks, then times opening it again
+from the log alone, from a snapshot, and from a snapshot plus a log
+tail of updates.
+
+Run from the repo root:
+    python -m benchmarks.bench_phase3_durable
+    python -m benchmarks.bench_phase3_durable --writes 5000 --sizes 100000
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from typing import Optional
+
+from phase3_crud.durable_store import DurableTaskStore
+from phase3_crud.task_store import TaskStore
+
+
+def bench_writes(count: int, fsync_interval: Optional[float],
+                 durable: bool = True) -> float:
+    """Creates per second into a fresh store."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = (DurableTaskStore(tmp, fsync_interval=fsync_interval,
+                                  snapshot_every=0)
+                 if durable else TaskStore())
+        started = time.perf_counter()
+        for i in range(count):
+            store.create(f"task {i}")
+        elapsed = time.perf_counter() - started
+        if durable:
+            store.close()
+    return count / elapsed
+
+
+def bench_startup(size: int, tail: int) -> dict:
+    """Seconds to reopen a store of `size` tasks in three states."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DurableTaskStore(tmp, fsync_interval=None, snapshot_every=0)
+        for i in range(size):
+            store.create(f"task {i}")
+        store.sync()
+        results["log only"] = DurableTaskStore(
+            tmp, snapshot_every=0).load_seconds
+
+        store.snapshot()
+        results["snapshot"] = DurableTaskStore(
+            tmp, snapshot_every=0).load_seconds
+
+        for i in range(tail):
+            store.update(i % size + 1, done=True)
+        store.sync()
+        results[f"snapshot + {tail} log"] = DurableTaskStore(
+            tmp, snapshot_every=0).load_seconds
+    return results
+
+
+def main() -> None:
+    """Run both benchmarks and print tables."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writes", type=int, default=20_000)
+    parser.add_argument("--fsync-ms", type=float, default=10)
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[100_000, 1_000_000])
+    parser.add_argument("--tail", type=int, default=10_000,
+                        help="log records after the snapshot")
+    args = parser.parse_args()
+
+    policies = [
+        ("in-memory TaskStore", None, False),
+        ("fsync every change", 0.0, True),
+        (f"fsync every {args.fsync_ms:g} ms", args.fsync_ms / 1000, True),
+        ("never fsync", None, True),
+    ]
+    print(f"{'policy':<24} | {'writes/s':>9}")
+    print("-" * 36)
+    for name, interval, durable in policies:
+        rate = bench_writes(args.writes, interval, durable)
+        print(f"{name:<24} | {rate:>9.0f}")
+
+    print(f"\n{'tasks':>9} | {'start from':<22} | {'load s':>7}")
+    print("-" * 45)
+    for size in args.sizes:
+        for name, seconds in bench_startup(size, args.tail).items():
+            print(f"{size:>9} | {name:<22} | {seconds:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: Phase 3 task storage, list scans vs TaskStore.
+
+For each size, fills both stores directly and times single operations on
+random ids, in-process (no HTTP):
+
+- list:  the original module globals; find_task_index() scans the list,
+         generate_next_id() takes max() of every id, delete pops by index
+- store: phase3_crud.task_store.TaskStore, a dict by id plus a counter
+
+The list version is O(n) per operation, so it is sampled with fewer ops
+at large sizes.
+
+Run from the repo root:
+    python -m benchmarks.bench_phase3_store
+    python -m benchmarks.bench_phase3_store --sizes 10000 100000 --ops 5000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from phase3_crud.task_store import TaskStore
+
+
+class ListStore:
+    """The original Phase 3 storage, kept here as the baseline."""
+
+    def __init__(self, size: int) -> None:
+        self.tasks: List[Dict[str, Any]] = [
+            {"id": i, "title": f"task {i}", "done": False}
+            for i in range(1, size + 1)
+        ]
+
+    def find_task_index(self, task_id: int) -> Optional[int]:
+        """Linear scan, as before."""
+        for i, t in enumerate(self.tasks):
+            if int(t.get("id", -1)) == int(task_id):
+                return i
+        return None
+
+    def generate_next_id(self) -> int:
+        """max() over every task, as before."""
+        if not self.tasks:
+            return 1
+        return max(int(t.get("id", 0)) for t in self.tasks) + 1
+
+    def get(self, task_id: int):
+        """GET /tasks/{id}."""
+        idx = self.find_task_index(task_id)
+        return self.tasks[idx] if idx is not None else None
+
+    def create(self, title: str, done: bool = False):
+        """POST /tasks."""
+        task = {"id": self.generate_next_id(), "title": title, "done": done}
+        self.tasks.append(task)
+        return task
+
+    def update(self, task_id: int, *, done=None):
+        """PATCH /tasks/{id} (done only)."""
+        idx = self.find_task_index(task_id)
+        if done is not None:
+            self.tasks[idx]["done"] = done
+        return self.tasks[idx]
+
+    def delete(self, task_id: int) -> bool:
+        """DELETE /tasks/{id}."""
+        idx = self.find_task_index(task_id)
+        self.tasks.pop(idx)
+        return True
+
+
+def filled_task_store(size: int) -> TaskStore:
+    """A TaskStore holding `size` tasks."""
+    store = TaskStore()
+    for i in range(1, size + 1):
+        store.create(f"task {i}")
+    return store
+
+
+def time_op(op: Callable[[int], Any], ids: List[int]) -> float:
+    """Mean microseconds per call of op(task_id)."""
+    start = time.perf_counter()
+    for task_id in ids:
+        op(task_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main() -> None:
+    """Time get/update/create/delete per size and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=20_000,
+                        help="operations per measurement (TaskStore)")
+    parser.add_argument("--list-budget", type=int, default=20_000_000,
+                        help="ops x size cap for the list baseline")
+    args = parser.parse_args()
+
+    print(f"{'size':>9} | {'store':>5} | {'get us':>9} | {'update us':>9} | "
+          f"{'create us':>9} | {'delete us':>9} | {'fill s':>6}")
+    print("-" * 74)
+    for size in args.sizes:
+        for name in ("list", "store"):
+            started = time.perf_counter()
+            store = ListStore(size) if name == "list" \
+                else filled_task_store(size)
+            fill = time.perf_counter() - started
+            ops = min(args.ops, size) if name == "store" \
+                else max(10, min(args.ops, args.list_budget // size))
+            ids = random.sample(range(1, size + 1), ops)
+            get = time_op(store.get, ids)
+            update = time_op(lambda i: store.update(i, done=True), ids)
+            create = time_op(lambda _: store.create("new"), ids)
+            delete = time_op(store.delete, ids)
+            print(f"{size:>9} | {name:>5} | {get:>9.2f} | {update:>9.2f} | "
+                  f"{create:>9.2f} | {delete:>9.2f} | {fill:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: SQLite tuning profiles of the Phase 4 engine.
+
+Starts `phase4_database.crud_api:app` under uvicorn once per
+TASKS_DB_PROFILE, each against its own scratch SQLite file, and runs a
+mixed workload (by default 70% reads, 20% PATCH, 10% POST) at several
+concurrency levels. Errors are 5xx responses such as "database is locked".
+
+Run from the repo root:
+    python -m benchmarks.bench_sqlite_profile
+    python -m benchmarks.bench_sqlite_profile --concurrency 8 32 --writes 1
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+from pathlib import Path
+
+from .common import run_load, seed, start_server, stop_server
+
+PROFILES = ("default", "production")
+
+
+def pick_mixed(max_id: int, writes: float):
+    """Reads, with `writes` of the traffic split 2:1 PATCH:POST."""
+    def pick():
+        roll = random.random()
+        task_id = random.randint(1, max_id)
+        if roll >= writes:
+            return "GET", f"/tasks/{task_id}", None
+        if roll < writes * 2 / 3:
+            return "PATCH", f"/tasks/{task_id}", {"completed": True}
+        return "POST", "/tasks", {"title": "bench"}
+    return pick
+
+
+def main() -> None:
+    """Run every profile and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+",
+                        default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--writes", type=float, default=0.3,
+                        help="fraction of requests that write (0-1)")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    results: dict[str, dict[int, dict]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        base_url = f"http://127.0.0.1:{args.port}"
+        for profile in PROFILES:
+            proc = start_server(
+                "phase4_database.crud_api:app", args.port,
+                {"TASKS_DB_PATH": str(Path(tmp) / f"{profile}.db"),
+                 "TASKS_DB_PROFILE": profile})
+            try:
+                seed(base_url, args.rows)
+                results[profile] = {
+                    c: asyncio.run(run_load(base_url, c, args.requests,
+                                            pick_mixed(args.rows, args.writes)))
+                    for c in args.concurrency
+                }
+            finally:
+                stop_server(proc)
+
+    print(f"{'conc':>5} | {'profile':>10} | {'req/s':>8} | {'p50 ms':>8} | "
+          f"{'p99 ms':>8} | {'errors':>6}")
+    print("-" * 62)
+    for c in args.concurrency:
+        for profile in PROFILES:
+            r = results[profile][c]
+            print(f"{c:>5} | {profile:>10} | {r['rps']:>8.0f} | "
+                  f"{r['p50_ms']:>8.2f} | {r['p99_ms']:>8.2f} | "
+                  f"{r['errors']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: Phase 1 task file formats, save/load time, size and memory.
+
+For each size, saves and loads the same tasks three ways:
+
+- json-old: the original format; json.dump(indent=2) with string ids,
+            then json.load() plus a second list of task dicts
+            (ids and fields, no TaskStore)
+- json:     save_tasks()/load_tasks() on a .json file; one compact
+            object per line, parsed one record at a time
+- binary:   save_tasks()/load_tasks() on a .bin file; length-prefixed
+            struct records
+
+Every save is fsynced. "peak MB" is the tracemalloc peak during a
+load, measured in a separate run.
+
+Run from the repo root:
+    python -m benchmarks.bench_task_formats
+    python -m benchmarks.bench_task_formats --sizes 10000 100000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Sized
+
+from phase1_basics.task_list_manager import (
+    PRIORITIES,
+    Task,
+    TaskStore,
+    load_tasks,
+    save_tasks,
+)
+
+
+def save_old(path: Path, tasks: TaskStore) -> None:
+    """The original save_tasks(), plus an fsync."""
+    data = [{"id": str(t.id), "title": str(t.title),
+             "priority": str(t.priority), "done": bool(t.done)}
+            for t in tasks]
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_old(path: Path) -> List[Dict[str, object]]:
+    """The original load_tasks()."""
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    tasks: List[Dict[str, object]] = []
+    for item in data:
+        tasks.append({
+            "id": int(item["id"]),
+            "title": item["title"],
+            "priority": item["priority"],
+            "done": bool(item["done"]),
+        })
+    return tasks
+
+
+def peak_mb(load: Callable[[Path], Sized], path: Path) -> float:
+    """Peak traced allocation while loading, in MB."""
+    tracemalloc.start()
+    tasks = load(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return peak / 1e6
+
+
+def main() -> None:
+    """Time each format per size and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    formats = [
+        ("json-old", "tasks.json", save_old, load_old),
+        ("json", "tasks.json", save_tasks, load_tasks),
+        ("binary", "tasks.bin", save_tasks, load_tasks),
+    ]
+    print(f"{'tasks':>9} | {'format':<8} | {'save ms':>8} | "
+          f"{'load ms':>8} | {'file MB':>7} | {'peak MB':>7}")
+    print("-" * 62)
+    for size in args.sizes:
+        tasks = TaskStore(
+            Task(i, f"Task number {i}", PRIORITIES[i % 3], i % 2 == 0)
+            for i in range(1, size + 1))
+        for name, filename, save, load in formats:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / filename
+                started = time.perf_counter()
+                save(path, tasks)
+                save_ms = (time.perf_counter() - started) * 1000
+                started = time.perf_counter()
+                loaded = load(path)
+                load_ms = (time.perf_counter() - started) * 1000
+                assert len(loaded) == size
+                del loaded
+                file_mb = path.stat().st_size / 1e6
+                peak = peak_mb(load, path)
+            print(f"{size:>9} | {name:<8} | {save_ms:>8.1f} | "
+                  f"{load_ms:>8.1f} | {file_mb:>7.2f} | {peak:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
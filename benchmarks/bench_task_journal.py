@@ -0,0 +1,65 @@
+"""
+Benchmark: Phase 1 task list saves, full rewrite vs journal.
+
+For each size, times one save after changing a few tasks:
+
+- full:    save_tasks() rewrites the whole file (temp file + rename)
+- journal: TaskJournal.save() appends only the changed tasks
+
+Both fsync, so the numbers include one disk flush per save.
+
+Run from the repo root:
+    python -m benchmarks.bench_task_journal
+    python -m benchmarks.bench_task_journal --sizes 1000 100000 --changes 1
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from phase1_basics.task_list_manager import TaskJournal, TaskStore, save_tasks
+
+
+def main() -> None:
+    """Time both save modes per size and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1_000, 10_000, 100_000])
+    parser.add_argument("--changes", type=int, default=10,
+                        help="tasks changed before each save")
+    parser.add_argument("--saves", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>7} | {'full ms':>8} | {'journal ms':>10} | "
+          f"{'speedup':>7}")
+    print("-" * 43)
+    for size in args.sizes:
+        tasks = TaskStore()
+        for i in range(size):
+            tasks.add(f"task {i}")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "tasks.json"
+            save_tasks(path, tasks)
+            journal = TaskJournal(path, compact_every=0)
+            full = journaled = 0.0
+            for n in range(args.saves):
+                for k in range(args.changes):
+                    tid = (n * args.changes + k) % size + 1
+                    journal.record(tid, tasks.mark_done(tid))
+                started = time.perf_counter()
+                journal.save(tasks)
+                journaled += time.perf_counter() - started
+
+                started = time.perf_counter()
+                save_tasks(path.with_name("full.json"), tasks)
+                full += time.perf_counter() - started
+        full_ms = full / args.saves * 1000
+        journal_ms = journaled / args.saves * 1000
+        print(f"{size:>7} | {full_ms:>8.2f} | {journal_ms:>10.2f} | "
+              f"{full_ms / journal_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark: Phase 1 task list, list of dicts vs indexed TaskStore.
+
+For each size, fills both stores directly (1 in 100 tasks high
+priority, 1 in 10 done) and times, in-process:
+
+- filter: done=True, priority=high, and both (ms per call)
+- add, mark done, delete on random ids (us per call)
+
+The list version is the original code: filter_tasks() comprehensions,
+find_task_index() scans and next_id() max() over every task. It is
+O(n) per operation, so it is sampled with fewer ops at large sizes.
+
+Run from the repo root:
+    python -m benchmarks.bench_task_store
+    python -m benchmarks.bench_task_store --sizes 10000 100000 --ops 5000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from phase1_basics.task_list_manager import Task, TaskStore
+
+
+class ListTasks:
+    """The original Phase 1 functions, kept here as the baseline."""
+
+    def __init__(self, size: int) -> None:
+        self.tasks: List[Dict[str, Any]] = [
+            {"id": i, "title": f"task {i}", "priority": priority_of(i),
+             "done": i % 10 == 0}
+            for i in range(1, size + 1)
+        ]
+
+    def find_task_index(self, task_id: int):
+        """Linear scan, as before."""
+        for i, t in enumerate(self.tasks):
+            if int(t["id"]) == task_id:
+                return i
+        return None
+
+    def filter(self, *, done=None, priority=None):
+        """filter_tasks(), as before."""
+        out = self.tasks
+        if done is not None:
+            out = [t for t in out if bool(t["done"]) is done]
+        if priority is not None:
+            out = [t for t in out if str(t["priority"]) == priority]
+        return out
+
+    def add(self, title: str):
+        """add_task() with next_id(), as before."""
+        task_id = max(int(t["id"]) for t in self.tasks) + 1
+        self.tasks.append({"id": task_id, "title": title,
+                           "priority": "med", "done": False})
+
+    def mark_done(self, task_id: int):
+        """mark_done(), as before."""
+        self.tasks[self.find_task_index(task_id)]["done"] = True
+
+    def delete(self, task_id: int):
+        """delete_task(), as before."""
+        del self.tasks[self.find_task_index(task_id)]
+
+
+def priority_of(i: int) -> str:
+    """1 in 100 tasks is high priority, the rest low or med."""
+    if i % 100 == 0:
+        return "high"
+    return "low" if i % 2 else "med"
+
+
+def filled_store(size: int) -> TaskStore:
+    """A TaskStore holding the same tasks as ListTasks(size)."""
+    return TaskStore(Task(i, f"task {i}", priority_of(i), i % 10 == 0)
+                     for i in range(1, size + 1))
+
+
+def time_per_call(op: Callable[[], Any], calls: int) -> float:
+    """Mean seconds per call of op()."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        op()
+    return (time.perf_counter() - start) / calls
+
+
+def time_op(op: Callable[[int], Any], ids: List[int]) -> float:
+    """Mean microseconds per call of op(task_id)."""
+    start = time.perf_counter()
+    for task_id in ids:
+        op(task_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main() -> None:
+    """Time filters and single-task changes per size and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=20_000,
+                        help="add/mark/delete calls per measurement")
+    parser.add_argument("--list-budget", type=int, default=20_000_000,
+                        help="ops x size cap for the list baseline")
+    args = parser.parse_args()
+
+    print(f"{'size':>9} | {'store':>5} | {'done ms':>8} | {'high ms':>8} | "
+          f"{'both ms':>8} | {'add us':>9} | {'mark us':>9} | "
+          f"{'del us':>9}")
+    print("-" * 90)
+    for size in args.sizes:
+        for name in ("list", "store"):
+            store = ListTasks(size) if name == "list" else filled_store(size)
+            calls = 5 if name == "list" else 50
+            done = time_per_call(lambda: store.filter(done=True), calls)
+            high = time_per_call(
+                lambda: store.filter(priority="high"), calls)
+            both = time_per_call(
+                lambda: store.filter(done=True, priority="high"), calls)
+            ops = min(args.ops, size) if name == "store" \
+                else max(10, min(args.ops, args.list_budget // size))
+            ids = random.sample(range(1, size + 1), ops)
+            add = time_op(lambda _: store.add("new"), ids)
+            mark = time_op(store.mark_done, ids)
+            delete = time_op(store.delete, ids)
+            print(f"{size:>9} | {name:>5} | {done * 1e3:>8.3f} | "
+                  f"{high * 1e3:>8.3f} | {both * 1e3:>8.3f} | "
+                  f"{add:>9.2f} | {mark:>9.2f} | {delete:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: single-task UPDATE/DELETE latency in the Phase 4 ORM layer.
+
+Times one committed write transaction per operation, the way PATCH and
+DELETE /tasks/{id} run, alternating between two implementations:
+
+- get+flush:  session.get() loads the Task, then the change is flushed
+              (the helpers before UPDATE/DELETE ... RETURNING)
+- returning:  orm_update_task() / orm_delete_task(), one statement each
+
+Both are run with and without an If-Match style version check, against a
+scratch SQLite file using the TASKS_DB_PROFILE in effect.
+
+Run from the repo root:
+    python -m benchmarks.bench_write_returning
+    python -m benchmarks.bench_write_returning --ops 5000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+from .common import percentile
+
+
+def main() -> None:
+    """Seed a scratch database and time each implementation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=30_000)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    # the database module reads its path at import time
+    os.environ["TASKS_DB_PATH"] = str(Path(tmp.name) / "bench.db")
+    from sqlalchemy import insert
+
+    from phase4_database.database_orm import (
+        SessionLocal, Task, VersionConflict, init_db, orm_delete_task,
+        orm_update_task, session_scope,
+    )
+
+    init_db()
+    with SessionLocal.begin() as session:
+        session.execute(insert(Task), [
+            {"title": f"task {i}", "description": "", "completed": False}
+            for i in range(args.rows)
+        ])
+    versions = {task_id: 1 for task_id in range(1, args.rows + 1)}
+
+    def get_flush_update(session, task_id, expected_versions=None):
+        task = session.get(Task, task_id)
+        if expected_versions is not None and \
+                task.version not in expected_versions:
+            raise VersionConflict(task_id, task.version)
+        task.version += 1
+        task.completed = not task.completed
+        session.flush()
+        return task.version
+
+    def returning_update(session, task_id, expected_versions=None):
+        return orm_update_task(session, task_id, completed=True,
+                               expected_versions=expected_versions).version
+
+    def get_flush_delete(session, task_id, expected_versions=None):
+        task = session.get(Task, task_id)
+        if expected_versions is not None and \
+                task.version not in expected_versions:
+            raise VersionConflict(task_id, task.version)
+        session.delete(task)
+        session.flush()
+
+    def returning_delete(session, task_id, expected_versions=None):
+        orm_delete_task(session, task_id,
+                        expected_versions=expected_versions)
+
+    cases: Dict[str, Dict[str, Callable]] = {
+        "update": {"get+flush": get_flush_update,
+                   "returning": returning_update},
+        "delete": {"get+flush": get_flush_delete,
+                   "returning": returning_delete},
+    }
+    print(f"{'operation':>9} | {'if-match':>8} | {'path':>9} | "
+          f"{'p50 ms':>7} | {'p99 ms':>7} | {'ops/s':>6}")
+    print("-" * 62)
+    for operation, paths in cases.items():
+        for checked in (False, True):
+            alive = list(versions)
+            random.shuffle(alive)
+            latencies: Dict[str, list] = {name: [] for name in paths}
+            # alternate the paths op by op so drift hits both alike
+            for i, task_id in enumerate(alive[:args.ops * len(paths)]):
+                name = list(paths)[i % len(paths)]
+                expected = {versions[task_id]} if checked else None
+                t0 = time.perf_counter()
+                with session_scope(write=True) as session:
+                    version = paths[name](session, task_id, expected)
+                latencies[name].append(time.perf_counter() - t0)
+                if operation == "delete":
+                    del versions[task_id]
+                else:
+                    versions[task_id] = version
+            for name, values in latencies.items():
+                values.sort()
+                print(f"{operation:>9} | {'yes' if checked else 'no':>8} | "
+                      f"{name:>9} | {percentile(values, 50) * 1000:>7.3f} | "
+                      f"{percentile(values, 99) * 1000:>7.3f} | "
+                      f"{len(values) / sum(values):>6.0f}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
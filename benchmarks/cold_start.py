@@ -0,0 +1,188 @@
+"""
+Benchmark: cold start of the gateway vs the APIs it mounts.
+
+- imports: `python -X importtime` for `gateway` and each mounted API
+           module, with the packages that take the most time
+- servers: ms from spawning uvicorn to the first answer, for the lazy
+           gateway, the eager gateway (GATEWAY_EAGER=1) and each API
+           alone; for the lazy gateway also each mount's first request
+
+With --check, fails (exit 1) if the gateway imports FastAPI, Starlette,
+Pydantic or SQLAlchemy, or if its import or lazy startup time is more
+than --tolerance (plus --slack-ms, for timer noise) above
+benchmarks/cold_start_baseline.json. Refresh the baseline with
+--save-baseline.
+
+Run from the repo root:
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --check
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from gateway import HEAVY_MODULES, MOUNTS
+
+from .common import REPO_ROOT, stop_server
+
+BASELINE = Path(__file__).resolve().parent / "cold_start_baseline.json"
+MARKER = "-- cold start --"
+# First request sent to each mount (and to each API alone)
+PROBES = {"/phase2": "/hello", "/phase3": "/tasks", "/phase4": "/tasks"}
+
+
+def import_profile(module: str) -> Tuple[float, Counter]:
+    """
+    Import module in a fresh interpreter under -X importtime. Return the
+    total ms and the self ms per top-level package.
+    """
+    code = (f"import sys; sys.stderr.write({MARKER!r} + '\\n'); "
+            f"import {module}")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=REPO_ROOT,
+        capture_output=True, text=True, check=True)
+    lines = result.stderr.splitlines()
+    per_package: Counter = Counter()
+    for line in lines[lines.index(MARKER) + 1:]:
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        per_package[name.strip().split(".")[0]] += int(self_us) / 1000
+    return sum(per_package.values()), per_package
+
+
+def time_until_answer(url: str, started: float, timeout: float = 30) -> float:
+    """ms from started until url answers with a non-5xx status."""
+    deadline = started + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(url, timeout=timeout).status_code < 500:
+                return (time.perf_counter() - started) * 1000
+        except httpx.TransportError:
+            time.sleep(0.005)
+    raise RuntimeError(f"{url} did not answer")
+
+
+def spawn(app: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    """Start uvicorn without waiting for it."""
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port),
+         "--log-level", "warning"],
+        cwd=REPO_ROOT, env=dict(os.environ, **env))
+
+
+def cold_start(app: str, port: int, env: Dict[str, str], path: str,
+               first_requests: Optional[Dict[str, str]] = None):
+    """
+    ms until app answers path after spawning it, and ms for each of
+    first_requests (name -> path) sent one after another afterwards.
+    """
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = spawn(app, port, env)
+    try:
+        ready = time_until_answer(base + path, started)
+        firsts = {}
+        for name, url in (first_requests or {}).items():
+            t0 = time.perf_counter()
+            httpx.get(base + url, timeout=30)
+            firsts[name] = (time.perf_counter() - t0) * 1000
+        return ready, firsts
+    finally:
+        stop_server(proc)
+
+
+def main() -> None:
+    """Print the import report and cold start table; check regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3,
+                        help="runs per measurement (the median is used)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown over the baseline "
+                             "(default 0.5 = 50%%)")
+    parser.add_argument("--slack-ms", type=float, default=50,
+                        help="allowed slowdown in ms on top of --tolerance")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    modules = ["gateway"] + [t.partition(":")[0] for t in MOUNTS.values()]
+    print(f"{'import':<34} | {'ms':>7} | slowest packages (self ms)")
+    print("-" * 90)
+    import_ms = {}
+    heavy = []
+    for module in modules:
+        profiles = [import_profile(module) for _ in range(args.runs)]
+        import_ms[module] = statistics.median(p[0] for p in profiles)
+        packages = profiles[0][1]
+        top = ", ".join(f"{name} {ms:.0f}"
+                        for name, ms in packages.most_common(4))
+        print(f"{module:<34} | {import_ms[module]:>7.1f} | {top}")
+        if module == "gateway":
+            heavy = [name for name in HEAVY_MODULES if name in packages]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {"TASKS_DB_PATH": str(Path(tmp) / "cold.db")}
+        firsts = {prefix: prefix + probe for prefix, probe in PROBES.items()}
+        runs = [cold_start("gateway:app", args.port, env, "/", firsts)
+                for _ in range(args.runs)]
+        lazy = statistics.median(r[0] for r in runs)
+        first_ms = {name: statistics.median(r[1][name] for r in runs)
+                    for name in firsts}
+        eager = statistics.median(
+            cold_start("gateway:app", args.port,
+                       dict(env, GATEWAY_EAGER="1"), "/")[0]
+            for _ in range(args.runs))
+        alone = {
+            prefix: statistics.median(
+                cold_start(target, args.port, env, PROBES[prefix])[0]
+                for _ in range(args.runs))
+            for prefix, target in MOUNTS.items()
+        }
+
+    print(f"\n{'server':<34} | {'ready ms':>8} | first request ms")
+    print("-" * 64)
+    print(f"{'gateway (lazy)':<34} | {lazy:>8.0f} | " + ", ".join(
+        f"{name} {ms:.0f}" for name, ms in first_ms.items()))
+    print(f"{'gateway (GATEWAY_EAGER=1)':<34} | {eager:>8.0f} |")
+    for prefix, target in MOUNTS.items():
+        print(f"{target:<34} | {alone[prefix]:>8.0f} |")
+
+    measured = {"gateway_import_ms": import_ms["gateway"],
+                "gateway_ready_ms": lazy}
+    if args.save_baseline:
+        BASELINE.write_text(json.dumps(
+            {k: round(v, 1) for k, v in measured.items()}, indent=2) + "\n")
+        print(f"\nSaved {BASELINE.name}")
+    if args.check:
+        failures = []
+        if heavy:
+            failures.append(f"gateway imports {', '.join(heavy)}")
+        baseline = json.loads(BASELINE.read_text())
+        for key, value in measured.items():
+            limit = baseline[key] * (1 + args.tolerance) + args.slack_ms
+            status = "ok" if value <= limit else "REGRESSION"
+            print(f"{key}: {value:.1f} (baseline {baseline[key]:.1f}, "
+                  f"limit {limit:.1f}) {status}")
+            if value > limit:
+                failures.append(f"{key} {value:.1f} > {limit:.1f}")
+        if failures:
+            sys.exit("Cold start check failed: " + "; ".join(failures))
+        print("Cold start check passed")
+
+
+if __name__ == "__main__":
+    main()
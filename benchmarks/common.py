@@ -0,0 +1,105 @@
+"""
+Shared helpers for the benchmark scripts: run an app under uvicorn in a
+child process, seed it, drive it with concurrent clients and summarize
+latencies.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def start_server(app: str, port: int, env: Optional[Dict[str, str]] = None,
+                 probe: str = "/tasks?limit=1") -> subprocess.Popen:
+    """
+    Start `uvicorn <app>` on 127.0.0.1:<port> with extra environment
+    variables and wait until `probe` answers.
+    """
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app,
+         "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT, env=dict(os.environ, **(env or {})),
+    )
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}{probe}", timeout=1)
+            return proc
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"uvicorn {app} did not start")
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    """Stop a server started with start_server()."""
+    proc.terminate()
+    proc.wait()
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def seed(base_url: str, rows: int) -> None:
+    """Fill the Phase 4 tasks table through the bulk endpoint."""
+    for start in range(0, rows, 5000):
+        count = min(5000, rows - start)
+        httpx.post(f"{base_url}/tasks/bulk", timeout=60,
+                   json=[{"title": f"task {start + i}"} for i in range(count)])
+
+
+async def run_load(base_url: str, concurrency: int, total: int,
+                   pick: Callable[[], Tuple[str, str, Any]]) -> dict:
+    """
+    Send `total` requests from `concurrency` workers sharing one client.
+    `pick()` returns (method, url, json body or None) for each request.
+    Returns req/s, p50/p95/p99 latency in ms and the number of failures
+    (5xx responses or transport errors).
+    """
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, url, body = pick()
+            t0 = time.perf_counter()
+            try:
+                resp = await client.request(method, url, json=body)
+                failed = resp.status_code >= 500
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - t0)
+            errors += failed
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits,
+                                 timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
@@ -0,0 +1,205 @@
+"""
+Load benchmark suite for the Phase 3 and Phase 4 task APIs.
+
+Starts each app under uvicorn (Phase 4 against a scratch SQLite file),
+seeds it, then runs read-heavy, write-heavy and mixed workloads at each
+concurrency level and reports req/s and p50/p95/p99 latency. Results are
+written to a JSON file; with --baseline they are compared against an
+earlier results file and the run fails (exit code 1) if throughput drops
+or p99 latency grows by more than the thresholds.
+
+Run from the repo root:
+    python -m benchmarks.load_suite
+    python -m benchmarks.load_suite --apps phase4 --workloads read mixed \\
+        --concurrency 1 16 --output new.json --baseline old.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from .common import run_load, seed, start_server, stop_server
+
+Pick = Callable[[], Tuple[str, str, Any]]
+
+# Share of traffic per request kind: GET one, GET a list, PATCH, POST.
+WORKLOADS: Dict[str, Dict[str, float]] = {
+    "read": {"get": 0.9, "list": 0.1, "patch": 0.0, "post": 0.0},
+    "write": {"get": 0.0, "list": 0.0, "patch": 0.6, "post": 0.4},
+    "mixed": {"get": 0.6, "list": 0.1, "patch": 0.2, "post": 0.1},
+}
+
+
+def _seed_phase3(base_url: str, rows: int) -> None:
+    """Phase 3 has no bulk endpoint: one POST per task."""
+    with httpx.Client(base_url=base_url) as client:
+        for i in range(rows):
+            client.post("/tasks", json={"title": f"task {i}"})
+
+
+# How to start, seed and talk to each app. The Phase 3 API has no paging,
+# so its list request returns every task.
+APPS: Dict[str, Dict[str, Any]] = {
+    "phase3": {
+        "app": "phase3_crud.crud_api:app",
+        "probe": "/tasks",
+        "seed": _seed_phase3,
+        "rows": 1000,
+        "list_url": "/tasks",
+        "done_field": "done",
+    },
+    "phase4": {
+        "app": "phase4_database.crud_api:app",
+        "probe": "/tasks?limit=1",
+        "seed": seed,
+        "rows": 20_000,
+        "list_url": "/tasks?limit=50",
+        "done_field": "completed",
+    },
+}
+
+
+def make_pick(app: Dict[str, Any], mix: Dict[str, float], rows: int) -> Pick:
+    """Request picker for one app and workload mix."""
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+
+    def pick():
+        kind = random.choices(kinds, weights)[0]
+        task_id = random.randint(1, rows)
+        if kind == "get":
+            return "GET", f"/tasks/{task_id}", None
+        if kind == "list":
+            return "GET", app["list_url"], None
+        if kind == "patch":
+            return "PATCH", f"/tasks/{task_id}", {app["done_field"]: True}
+        return "POST", "/tasks", {"title": "bench"}
+    return pick
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    """Run every app x workload x concurrency; key results by name."""
+    results: Dict[str, Dict[str, float]] = {}
+    base_url = f"http://127.0.0.1:{args.port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.apps:
+            app = APPS[name]
+            rows = args.rows or app["rows"]
+            for workload in args.workloads:
+                # fresh server per workload, so earlier writes don't
+                # change what later workloads see
+                proc = start_server(
+                    app["app"], args.port,
+                    {"TASKS_DB_PATH": str(Path(tmp) / f"{workload}.db")},
+                    probe=app["probe"])
+                try:
+                    app["seed"](base_url, rows)
+                    pick = make_pick(app, WORKLOADS[workload], rows)
+                    for c in args.concurrency:
+                        key = f"{name}/{workload}/c{c}"
+                        results[key] = asyncio.run(
+                            run_load(base_url, c, args.requests, pick))
+                        print_row(key, results[key])
+                finally:
+                    stop_server(proc)
+    return results
+
+
+def print_row(key: str, r: Dict[str, float]) -> None:
+    """One line of the results table."""
+    print(f"{key:<22} | {r['rps']:>8.0f} | {r['p50_ms']:>8.2f} | "
+          f"{r['p95_ms']:>8.2f} | {r['p99_ms']:>8.2f} | "
+          f"{r['errors']:>6}")
+
+
+def compare(results: Dict[str, Dict[str, float]],
+            baseline: Dict[str, Dict[str, float]],
+            max_rps_drop: float, max_p99_rise: float) -> List[str]:
+    """
+    Return one message per regression: req/s lower than the baseline by
+    more than `max_rps_drop`, or p99 higher by more than `max_p99_rise`
+    (both fractions, e.g. 0.1 = 10%), or new errors.
+    """
+    regressions = []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if r["rps"] < base["rps"] * (1 - max_rps_drop):
+            regressions.append(f"{key}: req/s {base['rps']:.0f} -> "
+                               f"{r['rps']:.0f}")
+        if r["p99_ms"] > base["p99_ms"] * (1 + max_p99_rise):
+            regressions.append(f"{key}: p99 {base['p99_ms']:.2f} ms -> "
+                               f"{r['p99_ms']:.2f} ms")
+        if r["errors"] > base["errors"]:
+            regressions.append(f"{key}: errors {base['errors']} -> "
+                               f"{r['errors']}")
+    return regressions
+
+
+def main() -> None:
+    """Parse arguments, run the suite, save and compare results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--apps", nargs="+", choices=list(APPS),
+                        default=list(APPS))
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS),
+                        default=list(WORKLOADS))
+    parser.add_argument("--concurrency", type=int, nargs="+",
+                        default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="requests per app/workload/concurrency")
+    parser.add_argument("--rows", type=int, default=0,
+                        help="rows to seed (default: per app)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed for the request mix")
+    parser.add_argument("--output", type=Path,
+                        default=Path("benchmarks/results/latest.json"))
+    parser.add_argument("--baseline", type=Path,
+                        help="earlier --output file to compare against")
+    parser.add_argument("--max-rps-drop", type=float, default=0.10)
+    parser.add_argument("--max-p99-rise", type=float, default=0.25)
+    parser.add_argument("--port", type=int, default=8768)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    print(f"{'run':<22} | {'req/s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | "
+          f"{'p99 ms':>8} | {'errors':>6}")
+    print("-" * 75)
+    results = run_suite(args)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "results": results,
+    }, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.max_rps_drop,
+                              args.max_p99_rise)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
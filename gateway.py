@@ -0,0 +1,211 @@
+"""
+Gateway: one ASGI app in front of the Phase 2, 3 and 4 APIs
+Each API is mounted under a path prefix and imported on its first
+request, so the gateway starts without loading FastAPI, Pydantic or
+SQLAlchemy.
+
+Run from the repo root:
+    uvicorn gateway:app
+    GATEWAY_EAGER=1 uvicorn gateway:app    # load every API at startup
+
+Then e.g. http://127.0.0.1:8000/phase2/hello, /phase3/tasks,
+/phase4/tasks; / lists the mounts and what has been loaded.
+"""
+import asyncio
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# path prefix -> "module:attribute" of the ASGI app served under it
+MOUNTS = {
+    "/phase2": "phase2_fastapi.hello_world_api:app",
+    "/phase3": "phase3_crud.crud_api:app",
+    "/phase4": "phase4_database.crud_api:app",
+}
+# Libraries the gateway itself must not import (see the startup report
+# and benchmarks/cold_start.py --check)
+HEAVY_MODULES = ("fastapi", "starlette", "pydantic", "sqlalchemy")
+# Import every app at startup instead of on first request
+EAGER = os.getenv("GATEWAY_EAGER", "0") == "1"
+
+# A child of uvicorn's logger, so the reports show with uvicorn's own
+# startup lines (and are silenced by --log-level warning)
+logger = logging.getLogger("uvicorn.error.gateway")
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class LazyApp:
+    """
+    An ASGI app imported from "module:attribute" on first use. Its
+    lifespan is run on load and again, to shut it down, by close():
+    Starlette mounts skip sub-app lifespans, and Phase 3 and 4 need
+    theirs.
+    """
+
+    def __init__(self, target: str) -> None:
+        self.target = target
+        self.app: Optional[Callable] = None
+        self.import_ms: Optional[float] = None
+        self.new_modules = 0
+        self.state: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+        self._lifespan: Optional[asyncio.Task] = None
+        self._messages: Optional[asyncio.Queue] = None
+        self._replies: Optional[asyncio.Queue] = None
+
+    async def load(self) -> Callable:
+        """The app, imported and started if this is the first call."""
+        if self.app is not None:
+            return self.app
+        async with self._lock:
+            if self.app is None:
+                module_name, _, attr = self.target.partition(":")
+                before = len(sys.modules)
+                started = time.perf_counter()
+                # in a thread, so requests to loaded apps keep flowing
+                module = await asyncio.to_thread(
+                    importlib.import_module, module_name)
+                app = getattr(module, attr)
+                self.import_ms = (time.perf_counter() - started) * 1000
+                self.new_modules = len(sys.modules) - before
+                await self._startup(app)
+                self.app = app
+                logger.info("Loaded %s in %.1f ms (%d new modules)",
+                            self.target, self.import_ms, self.new_modules)
+        return self.app
+
+    async def _startup(self, app: Callable) -> None:
+        """Run the app's lifespan up to startup complete, if it has one."""
+        messages: asyncio.Queue = asyncio.Queue()
+        replies: asyncio.Queue = asyncio.Queue()
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"},
+                 "state": self.state}
+        task = asyncio.create_task(app(scope, messages.get, replies.put))
+        await messages.put({"type": "lifespan.startup"})
+        reply = asyncio.create_task(replies.get())
+        await asyncio.wait({task, reply},
+                           return_when=asyncio.FIRST_COMPLETED)
+        if not reply.done():
+            # the app returned or raised instead: no lifespan support
+            reply.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return
+        message = reply.result()
+        if message["type"] == "lifespan.startup.failed":
+            await asyncio.gather(task, return_exceptions=True)
+            raise RuntimeError(f"{self.target} failed to start: "
+                               f"{message.get('message', '')}")
+        self._lifespan, self._messages, self._replies = task, messages, \
+            replies
+
+    async def close(self) -> None:
+        """Run the app's lifespan shutdown, if it was started."""
+        if self._lifespan is None:
+            return
+        await self._messages.put({"type": "lifespan.shutdown"})
+        message = await self._replies.get()
+        if message["type"] == "lifespan.shutdown.failed":
+            logger.error("%s failed to shut down: %s", self.target,
+                         message.get("message", ""))
+        await self._lifespan
+        self._lifespan = None
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        app = await self.load()
+        if self.state:
+            scope = dict(scope, state=dict(self.state))
+        await app(scope, receive, send)
+
+
+class Gateway:
+    """Routes each request to the LazyApp mounted on its path prefix."""
+
+    def __init__(self, mounts: Dict[str, str], eager: bool = False) -> None:
+        # longest prefix first, so /a/b wins over /a
+        self.mounts = {prefix.rstrip("/"): LazyApp(target)
+                       for prefix, target in sorted(
+                           mounts.items(), key=lambda m: -len(m[0]))}
+        self.eager = eager
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        path = scope["path"]
+        for prefix, app in self.mounts.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                # as Starlette's Mount: keep path, extend root_path
+                root_path = scope.get("root_path", "") + prefix
+                await app(dict(scope, root_path=root_path), receive, send)
+                return
+        if scope["type"] != "http":
+            return  # e.g. a websocket to no mount: close it
+        if path == "/":
+            await _send_json(send, 200, self.status())
+        else:
+            await _send_json(send, 404, {"detail": "Not Found"})
+
+    def status(self) -> Dict[str, Any]:
+        """What is mounted where, and what has been loaded."""
+        return {"mounts": {
+            prefix: {"app": app.target, "loaded": app.app is not None,
+                     "import_ms": app.import_ms}
+            for prefix, app in sorted(self.mounts.items())
+        }}
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        """Startup report (and eager loading); shut down loaded apps."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    if self.eager:
+                        for app in self.mounts.values():
+                            await app.load()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed",
+                                "message": str(e)})
+                    return
+                self._report()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for app in self.mounts.values():
+                    await app.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _report(self) -> None:
+        """Log the startup cost and which heavy libraries are loaded."""
+        heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+        logger.info(
+            "Gateway ready after %.0f ms of CPU since process start "
+            "(%d modules loaded; heavy: %s)", time.process_time() * 1000,
+            len(sys.modules), ", ".join(heavy) or "none")
+        for prefix, app in sorted(self.mounts.items()):
+            if app.import_ms is None:
+                logger.info("  %-8s %s (on first request)", prefix,
+                            app.target)
+            else:
+                logger.info("  %-8s %s (%.1f ms, %d modules)", prefix,
+                            app.target, app.import_ms, app.new_modules)
+
+
+async def _send_json(send: Send, status: int, body: Any) -> None:
+    """Send a small JSON response."""
+    data = json.dumps(body).encode()
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(data)).encode())]})
+    await send({"type": "http.response.body", "body": data})
+
+
+app = Gateway(MOUNTS, eager=EAGER)
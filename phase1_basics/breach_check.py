@@ -0,0 +1,348 @@
+"""
+Breached / common password checker
+Builds a compact index of a wordlist or breach dump and memory-maps it
+"""
+
+import argparse  # for the subcommands
+import getpass  # to ask for passwords without echoing them
+import hashlib  # for SHA-1 keys
+import heapq  # to merge sorted runs
+import itertools
+import mmap  # to read the index without loading it
+import os
+import re
+import string
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections import Counter
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TextIO, Tuple
+
+try:
+    from .password_generator import estimate_entropy, strength_label
+except ImportError:  # run as a script from phase1_basics/
+    from password_generator import estimate_entropy, strength_label
+
+
+# Index file: magic, number of keys, a fanout table, then the keys as
+# sorted, unique uint64s, all little-endian. A key is the first 8 bytes
+# of the SHA-1 of the UTF-8 password, so a dump of SHA-1 hashes can be
+# indexed as is. fanout[b] counts the keys whose top 16 bits are <= b,
+# which narrows each binary search to one small bucket.
+MAGIC = b"PWHASH1\n"
+HEADER = struct.Struct("<8sQ")
+FANOUT = 1 << 16
+KEYS_OFFSET = HEADER.size + 8 * FANOUT
+# Keys sorted in memory at a time while building (about 40 MB)
+RUN_SIZE = 1 << 20
+# Shortest word worth checking on its own, e.g. "pass" in "pass2024!"
+MIN_WORD = 4
+# Common letter swaps, undone to find the word: p@ssw0rd -> password
+UNLEET = str.maketrans("@4310$5!7", "aaeiossit")
+# A breach dump line: 40 hex digits, optionally ":count"
+SHA1_LINE = re.compile(r"[0-9A-Fa-f]{40}(?::\d+)?")
+
+
+def password_key(password: str) -> int:
+    """The index key of a password."""
+    digest = hashlib.sha1(password.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def iter_keys(lines: Iterable[str], sha1: bool = False,
+              stats: Optional[Counter] = None) -> Iterator[int]:
+    """
+    Keys for each non-empty line: a password, or with sha1 a hex SHA-1
+    hash optionally followed by ":count" (the HIBP dump format). With
+    sha1, other lines are skipped and counted in stats["malformed"].
+    """
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        if not sha1:
+            yield password_key(line)
+        elif SHA1_LINE.fullmatch(line.strip()):
+            yield int(line.strip()[:16], 16)
+        elif stats is not None:
+            stats["malformed"] += 1
+
+
+def _write_keys(f, keys: array) -> None:
+    """Write uint64 keys little-endian."""
+    if sys.byteorder != "little":
+        keys.byteswap()
+    keys.tofile(f)
+
+
+def _read_run(path: Path) -> Iterator[int]:
+    """Stream the keys of a sorted run file."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = array("Q")
+            try:
+                chunk.fromfile(f, 1 << 16)
+            except EOFError:  # the last, short chunk is still read
+                pass
+            if not chunk:
+                return
+            yield from chunk
+
+
+def build_index(lines: Iterable[str], path: Path, sha1: bool = False,
+                run_size: int = RUN_SIZE) -> Tuple[int, int]:
+    """
+    Write the index of lines to path and return the number of unique
+    keys and of malformed lines skipped. Keys are sorted run_size at a
+    time into temp files, which are then merged, so memory stays
+    bounded whatever the input size.
+    """
+    path = Path(path)
+    stats: Counter = Counter()
+    keys = iter_keys(lines, sha1, stats)
+    with tempfile.TemporaryDirectory(dir=path.parent) as tmp:
+        runs = []
+        while True:
+            run = sorted(itertools.islice(keys, run_size))
+            if not run:
+                break
+            runs.append(Path(tmp) / f"run{len(runs)}")
+            with open(runs[-1], "wb") as f:
+                array("Q", run).tofile(f)
+            del run
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        count = 0
+        fanout = array("Q", bytes(8 * FANOUT))
+        with open(tmp_path, "wb") as out:
+            out.seek(KEYS_OFFSET)
+            buf = array("Q")
+            last = None
+            for key in heapq.merge(*(_read_run(r) for r in runs)):
+                if key != last:
+                    buf.append(key)
+                    fanout[key >> 48] += 1
+                    last = key
+                    if len(buf) >= 1 << 16:
+                        count += len(buf)
+                        _write_keys(out, buf)
+                        buf = array("Q")
+            count += len(buf)
+            _write_keys(out, buf)
+            for b in range(1, FANOUT):
+                fanout[b] += fanout[b - 1]
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, count))
+            _write_keys(out, fanout)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, path)
+    return count, stats["malformed"]
+
+
+class BreachIndex:
+    """
+    A memory-mapped index built by build_index(). `password in index`
+    hashes the password and binary-searches the mapped keys in C, so a
+    check takes microseconds and the list is never loaded into RAM.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if (len(self._mmap) < HEADER.size
+                or self._mmap[:len(MAGIC)] != MAGIC):
+            self._mmap.close()
+            raise ValueError(f"{path} is not a password index")
+        _, count = HEADER.unpack_from(self._mmap)
+        if len(self._mmap) != KEYS_OFFSET + 8 * count:
+            self._mmap.close()
+            raise ValueError(f"{path} is truncated")
+        self._fanout = array("Q", self._mmap[HEADER.size:KEYS_OFFSET])
+        if sys.byteorder == "little":
+            self._keys = memoryview(self._mmap)[KEYS_OFFSET:].cast("Q")
+        else:
+            self._fanout.byteswap()
+            self._keys = array("Q", self._mmap[KEYS_OFFSET:])
+            self._keys.byteswap()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, password: str) -> bool:
+        return self.contains_key(password_key(password))
+
+    def contains_key(self, key: int) -> bool:
+        """True if the key is in the index."""
+        b = key >> 48
+        lo = self._fanout[b - 1] if b else 0
+        hi = self._fanout[b]
+        keys = self._keys
+        i = bisect_left(keys, key, lo, hi)
+        return i < hi and keys[i] == key
+
+    def close(self) -> None:
+        """Unmap the index."""
+        if isinstance(self._keys, memoryview):
+            self._keys.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "BreachIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def word_core(password: str) -> str:
+    """Lower-case password without leading/trailing digits and symbols."""
+    return password.lower().strip(string.digits + string.punctuation + " ")
+
+
+def check_password(password: str, index: BreachIndex) -> Optional[str]:
+    """Return why the password is unsafe, or None if it isn't listed."""
+    if password in index:
+        return "on the breach list"
+    lower = password.lower()
+    if lower != password and lower in index:
+        return "on the breach list, ignoring case"
+    core = word_core(password)
+    for word in dict.fromkeys((core, core.translate(UNLEET))):
+        if len(word) >= MIN_WORD and word != lower and word in index:
+            return f"built from the listed word {word!r}"
+    return None
+
+
+def pool_size(password: str) -> int:
+    """Size of the character classes the password draws from."""
+    size = 0
+    for chars in (string.ascii_lowercase, string.ascii_uppercase,
+                  string.digits, string.punctuation):
+        if any(ch in chars for ch in password):
+            size += len(chars)
+    if any(not ch.isascii() for ch in password):
+        size += 100
+    return size
+
+
+def rate_password(password: str,
+                  index: Optional[BreachIndex] = None) -> Tuple[str, float]:
+    """
+    Strength label and entropy bits. A password found in the index (as
+    is, ignoring case, or as its base word) is weak with 0 bits, however
+    long it is.
+    """
+    if index is not None:
+        reason = check_password(password, index)
+        if reason is not None:
+            return f"weak ({reason})", 0.0
+    bits = estimate_entropy(len(password), pool_size(password))
+    return strength_label(bits), bits
+
+
+def screen(index: BreachIndex, lines: Iterable[str], out: TextIO,
+           flagged: bool = False) -> Tuple[int, int]:
+    """
+    Check one candidate password per line, streaming: write the clean
+    ones to out (or, with flagged, the flagged ones and the reason,
+    tab-separated). Return (screened, flagged) counts.
+    """
+    screened = hits = 0
+    for line in lines:
+        password = line.rstrip("\r\n")
+        if not password:
+            continue
+        screened += 1
+        reason = check_password(password, index)
+        if reason is not None:
+            hits += 1
+            if flagged:
+                out.write(f"{password}\t{reason}\n")
+        elif not flagged:
+            out.write(password + "\n")
+    return screened, hits
+
+
+def parse_args(argv=None):
+    """Parse the subcommands."""
+    parser = argparse.ArgumentParser(
+        description="Check passwords against a breach list or wordlist.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="build an index from a wordlist")
+    build.add_argument("wordlist", help="one password per line (- = stdin)")
+    build.add_argument("index", help="index file to write")
+    build.add_argument("--sha1", action="store_true",
+                       help="lines are SHA-1 hex hashes (HASH or "
+                            "HASH:COUNT), as in breach dumps")
+
+    check = sub.add_parser("check", help="rate passwords (asks if none)")
+    check.add_argument("index")
+    check.add_argument("passwords", nargs="*")
+
+    screen_cmd = sub.add_parser(
+        "screen", help="screen a file of candidates, one per line")
+    screen_cmd.add_argument("index")
+    screen_cmd.add_argument("candidates", help="candidates file (- = stdin)")
+    screen_cmd.add_argument("-o", "--output",
+                            help="output file (default: stdout)")
+    screen_cmd.add_argument("--flagged", action="store_true",
+                            help="write the flagged passwords and why, "
+                                 "instead of the clean ones")
+    return parser.parse_args(argv)
+
+
+def open_text(name: str):
+    """Open a file for reading, or stdin for "-"."""
+    if name == "-":
+        return sys.stdin
+    return open(name, "r", encoding="utf-8", errors="replace")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+
+    if args.command == "build":
+        with open_text(args.wordlist) as lines:
+            count, skipped = build_index(lines, Path(args.index),
+                                         sha1=args.sha1)
+        print(f"Indexed {count} unique passwords in "
+              f"{time.perf_counter() - started:.1f}s "
+              f"({os.path.getsize(args.index) / 1e6:.1f} MB).")
+        if skipped:
+            print(f"Skipped {skipped} malformed line(s).", file=sys.stderr)
+        return
+
+    try:
+        index = BreachIndex(Path(args.index))
+    except (OSError, ValueError) as e:
+        sys.exit(f"Error: {e}")
+    with index:
+        if args.command == "check":
+            passwords = args.passwords or [getpass.getpass("Password: ")]
+            for n, password in enumerate(passwords, 1):
+                label, bits = rate_password(password, index)
+                print(f"#{n}: {label} ({bits:.1f} bits)")
+            return
+
+        out = open(args.output, "w", encoding="utf-8") if args.output \
+            else sys.stdout
+        try:
+            with open_text(args.candidates) as lines:
+                screened, hits = screen(index, lines, out, args.flagged)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        elapsed = time.perf_counter() - started
+        rate = screened / elapsed if elapsed else 0.0
+        print(f"Screened {screened} passwords in {elapsed:.2f}s "
+              f"({rate:,.0f}/s): {hits} flagged.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
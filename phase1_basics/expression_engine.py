@@ -0,0 +1,366 @@
+"""
+Safe expression engine for the calculator
+Parses formulas like "2 * (x + 1) ** 2 - sqrt(y)" into a tree of
+closures, without eval(), and caches compiled formulas by source text
+"""
+
+import math
+import operator
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+
+# Compiled expressions kept by compile_expression(), least recently
+# used first out
+CACHE_SIZE = 1024
+# Deepest tree allowed, so evaluation can't hit the recursion limit
+MAX_DEPTH = 200
+# Operator chains longer than this (a + b + c + ...) run as a loop
+SHORT_CHAIN = 4
+# Longest formula accepted
+MAX_LENGTH = 10_000
+
+# Tokens: numbers (1, 2.5, .5, 1e-3), names, and operators
+TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<op>\*\*|[-+*/%^(),])
+    )""", re.VERBOSE)
+
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+
+def _fsum(*args: float) -> float:
+    return math.fsum(args)
+
+
+def _min(*args: float) -> float:
+    return min(args)
+
+
+def _max(*args: float) -> float:
+    return max(args)
+
+
+def _round(x: float, digits: float = 0) -> float:
+    return round(x, int(digits))
+
+
+# name -> (function, fewest arguments, most arguments; None = any)
+FUNCTIONS: Dict[str, Tuple[Callable[..., float], int, Optional[int]]] = {
+    "abs": (abs, 1, 1),
+    "sqrt": (math.sqrt, 1, 1),
+    "exp": (math.exp, 1, 1),
+    "ln": (math.log, 1, 1),
+    "log": (math.log, 1, 2),  # log(x) or log(x, base)
+    "log10": (math.log10, 1, 1),
+    "log2": (math.log2, 1, 1),
+    "sin": (math.sin, 1, 1),
+    "cos": (math.cos, 1, 1),
+    "tan": (math.tan, 1, 1),
+    "asin": (math.asin, 1, 1),
+    "acos": (math.acos, 1, 1),
+    "atan": (math.atan, 1, 1),
+    "floor": (math.floor, 1, 1),
+    "ceil": (math.ceil, 1, 1),
+    "round": (_round, 1, 2),  # round(x) or round(x, digits)
+    "min": (_min, 1, None),
+    "max": (_max, 1, None),
+    "sum": (_fsum, 1, None),
+    "hypot": (math.hypot, 1, None),
+}
+
+# Binary operators: symbol -> (precedence, right-associative, function)
+BINARY = {
+    "+": (1, False, operator.add),
+    "-": (1, False, operator.sub),
+    "*": (2, False, operator.mul),
+    "/": (2, False, operator.truediv),
+    "%": (2, False, math.fmod),
+    # math.pow raises instead of returning a complex number
+    "**": (4, True, math.pow),
+    "^": (4, True, math.pow),
+}
+# Unary minus binds looser than **, so -2 ** 2 is -4 as in Python
+UNARY_PRECEDENCE = 3
+
+Env = Mapping[str, float]
+
+
+class ExpressionError(ValueError):
+    """A formula that can't be parsed or evaluated."""
+
+
+class Token(NamedTuple):
+    kind: str  # "number", "name", "op" or "end"
+    text: str
+    pos: int
+
+
+def tokenize(source: str) -> List[Token]:
+    """Split source into tokens, ending with an "end" token."""
+    tokens = []
+    pos = 0
+    end = len(source.rstrip())
+    while pos < end:
+        match = TOKEN.match(source, pos)
+        if match is None:
+            bad = len(source) - len(source[pos:].lstrip())
+            raise ExpressionError(
+                f"unexpected {source[bad]!r} at position {bad}")
+        kind = match.lastgroup
+        tokens.append(Token(kind, match.group(kind), match.start(kind)))
+        pos = match.end()
+    tokens.append(Token("end", "", end))
+    return tokens
+
+
+class Node(NamedTuple):
+    """A compiled subexpression."""
+    fn: Callable[[Env], float]
+    depth: int
+    value: Optional[float] = None  # set when it is a constant
+
+
+def _constant(value: float) -> Node:
+    return Node(lambda env: value, 1, value)
+
+
+def _variable(name: str) -> Node:
+    return Node(lambda env: env[name], 1)
+
+
+class _Parser:
+    """Precedence climbing over the tokens, building closures directly."""
+
+    def __init__(self, source: str) -> None:
+        self.tokens = tokenize(source)
+        self.i = 0
+        self.nesting = 0
+        self.names: Dict[str, None] = {}
+
+    def peek(self) -> Token:
+        return self.tokens[self.i]
+
+    def take(self) -> Token:
+        token = self.tokens[self.i]
+        self.i += 1
+        return token
+
+    def expect(self, text: str) -> None:
+        token = self.take()
+        if token.text != text:
+            raise ExpressionError(
+                f"expected {text!r} at position {token.pos}, "
+                f"got {token.text or 'end of input'!r}")
+
+    def parse(self) -> Node:
+        node = self.expression(0)
+        token = self.peek()
+        if token.kind != "end":
+            raise ExpressionError(
+                f"unexpected {token.text!r} at position {token.pos}")
+        return node
+
+    def expression(self, min_precedence: int) -> Node:
+        self.nesting += 1
+        if self.nesting > MAX_DEPTH:
+            raise ExpressionError("expression is too deeply nested")
+        try:
+            return self._expression(min_precedence)
+        finally:
+            self.nesting -= 1
+
+    def _expression(self, min_precedence: int) -> Node:
+        left = self.unary()
+        steps = []  # (fn, right) applied to left in order
+        while True:
+            token = self.peek()
+            op = BINARY.get(token.text) if token.kind == "op" else None
+            if op is None or op[0] < min_precedence:
+                return _fold_left(left, steps)
+            precedence, right_assoc, fn = op
+            self.take()
+            right = self.expression(
+                precedence if right_assoc else precedence + 1)
+            steps.append((fn, right))
+
+    def unary(self) -> Node:
+        token = self.peek()
+        if token.text in ("-", "+"):
+            self.take()
+            operand = self.expression(UNARY_PRECEDENCE)
+            if token.text == "+":
+                return operand
+            return _apply(operator.neg, [operand])
+        return self.primary()
+
+    def primary(self) -> Node:
+        token = self.take()
+        if token.kind == "number":
+            return _constant(float(token.text))
+        if token.text == "(":
+            node = self.expression(0)
+            self.expect(")")
+            return node
+        if token.kind == "name":
+            if self.peek().text == "(":
+                return self.call(token)
+            if token.text in CONSTANTS:
+                return _constant(CONSTANTS[token.text])
+            if token.text in FUNCTIONS:
+                raise ExpressionError(
+                    f"function {token.text!r} needs arguments "
+                    f"at position {token.pos}")
+            self.names[token.text] = None
+            return _variable(token.text)
+        raise ExpressionError(
+            f"unexpected {token.text or 'end of input'!r} "
+            f"at position {token.pos}")
+
+    def call(self, name: Token) -> Node:
+        if name.text not in FUNCTIONS:
+            raise ExpressionError(
+                f"unknown function {name.text!r} at position {name.pos}")
+        fn, fewest, most = FUNCTIONS[name.text]
+        self.expect("(")
+        args = [self.expression(0)]
+        while self.peek().text == ",":
+            self.take()
+            args.append(self.expression(0))
+        self.expect(")")
+        if len(args) < fewest or (most is not None and len(args) > most):
+            allowed = (f"{fewest} or more" if most is None
+                       else str(fewest) if fewest == most
+                       else f"{fewest} to {most}")
+            raise ExpressionError(
+                f"{name.text}() takes {allowed} argument(s), "
+                f"got {len(args)}")
+        return _apply(fn, args)
+
+
+def _check_depth(depth: int) -> int:
+    if depth > MAX_DEPTH:
+        raise ExpressionError("expression is too deeply nested")
+    return depth
+
+
+def _binary(fn: Callable[[float, float], float], left: Node,
+            right: Node) -> Node:
+    """Node for fn(left, right), folded if both sides are constant."""
+    if left.value is not None and right.value is not None:
+        return _fold(fn, [left.value, right.value])
+    a, b = left.fn, right.fn
+    depth = _check_depth(1 + max(left.depth, right.depth))
+    if left.value is not None:
+        value = left.value
+        return Node(lambda env: fn(value, b(env)), depth)
+    if right.value is not None:
+        value = right.value
+        return Node(lambda env: fn(a(env), value), depth)
+    return Node(lambda env: fn(a(env), b(env)), depth)
+
+
+def _fold_left(left: Node, steps: List[Tuple[Callable, Node]]) -> Node:
+    """
+    Node for applying each (fn, right) step to left in turn, as in
+    a - b + c. Short chains nest; long ones (sums of many terms) run as
+    one loop so they don't make the tree deep.
+    """
+    if len(steps) <= SHORT_CHAIN:
+        for fn, right in steps:
+            left = _binary(fn, left, right)
+        return left
+    first = left.fn
+    rest = [(fn, right.fn) for fn, right in steps]
+    depth = _check_depth(1 + max(left.depth,
+                                 *(right.depth for _, right in steps)))
+
+    def run(env):
+        acc = first(env)
+        for fn, right in rest:
+            acc = fn(acc, right(env))
+        return acc
+    return Node(run, depth)
+
+
+def _apply(fn: Callable[..., float], args: List[Node]) -> Node:
+    """Node for fn(*args), folded if every argument is constant."""
+    if all(arg.value is not None for arg in args):
+        return _fold(fn, [arg.value for arg in args])
+    depth = _check_depth(1 + max(arg.depth for arg in args))
+    if len(args) == 1:
+        a = args[0].fn
+        return Node(lambda env: fn(a(env)), depth)
+    if len(args) == 2:
+        a, b = args[0].fn, args[1].fn
+        return Node(lambda env: fn(a(env), b(env)), depth)
+    fns = [arg.fn for arg in args]
+    return Node(lambda env: fn(*[f(env) for f in fns]), depth)
+
+
+def _fold(fn: Callable[..., float], values: List[float]) -> Node:
+    """Constant node for fn(*values), computed now."""
+    try:
+        return _constant(float(fn(*values)))
+    except (ArithmeticError, ValueError, TypeError) as e:
+        raise ExpressionError(_math_message(e)) from None
+
+
+def _math_message(error: Exception) -> str:
+    if isinstance(error, ZeroDivisionError):
+        return "division by zero"
+    if isinstance(error, OverflowError):
+        return "result too large"
+    return f"math error: {error}"
+
+
+class Expression:
+    """
+    A compiled formula. Call it with a mapping of variable values (or
+    keywords) to get a float; `variables` lists the names it reads.
+    """
+
+    __slots__ = ("source", "variables", "_fn")
+
+    def __init__(self, source: str) -> None:
+        if len(source) > MAX_LENGTH:
+            raise ExpressionError(
+                f"expression is longer than {MAX_LENGTH} characters")
+        parser = _Parser(source)
+        self._fn = parser.parse().fn
+        self.source = source
+        self.variables: Tuple[str, ...] = tuple(parser.names)
+
+    def __call__(self, env: Optional[Env] = None, **values: float) -> float:
+        if values:
+            env = {**(env or {}), **values}
+        try:
+            return float(self._fn(env or {}))
+        except KeyError as e:
+            raise ExpressionError(
+                f"no value for variable {e.args[0]!r}") from None
+        except (ArithmeticError, ValueError) as e:
+            raise ExpressionError(_math_message(e)) from None
+        except TypeError:
+            raise ExpressionError("variable values must be numbers") \
+                from None
+
+    def __repr__(self) -> str:
+        return f"Expression({self.source!r})"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(source: str) -> Expression:
+    """
+    The compiled Expression for source. Results are cached by source
+    text, so a formula used again skips tokenizing and parsing.
+    """
+    return Expression(source)
+
+
+def evaluate(source: str, env: Optional[Env] = None, **values: float) -> float:
+    """Compile (or reuse) source and evaluate it."""
+    return compile_expression(source)(env, **values)
@@ -2,20 +2,26 @@
 This is a simple password generator
 """
 
+import argparse  # for the bulk mode flags
 import math  # for math.functions
+import os  # for os.urandom
 import string  # for the character pool
-import secrets  # for the random choice
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import FrozenSet, Iterator, List, NamedTuple, Tuple
 
 
 # Constant for ambiguous characters
 CONFUSING = set("O0ol1|`'\\\"")
 
-
-def secure_shuffle(chars: list[str]) -> None:
-    """Shuffle a list in a secure way"""
-    for i in range(len(chars) - 1, 0, -1):
-        j = secrets.randbelow(i + 1)
-        chars[i], chars[j] = chars[j], chars[i]
+# Random bytes fetched per os.urandom call, at most
+URANDOM_BLOCK = 1 << 16
+# Passwords generated per batch in bulk mode
+BATCH_SIZE = 10_000
 
 
 def estimate_entropy(length: int, pool_size: int) -> float:
@@ -36,16 +42,8 @@ def strength_label(bits: float) -> str:
     return "very strong"
 
 
-def generate_password(
-    length=12,
-    use_digits=True,
-    use_symbols=True,
-    avoid_confusing=False,
-    enforce_requirements=False,
-):
-    """
-    Generate a random password
-    """
+def build_pool(use_digits=True, use_symbols=True, avoid_confusing=False):
+    """Return the characters a password may use."""
     pool = string.ascii_letters
     if use_digits:
         pool += string.digits
@@ -53,40 +51,178 @@ def generate_password(
         pool += string.punctuation
     if avoid_confusing:
         pool = "".join(ch for ch in pool if ch not in CONFUSING)
-
     if not pool:
         raise ValueError("Character pool is empty")
+    return pool
 
+
+def required_pools(use_digits=True, use_symbols=True, avoid_confusing=False):
+    """Return the pools a password must use at least once each."""
+    required = []
+    if use_digits:
+        required.append(string.digits)
+    if use_symbols:
+        required.append(string.punctuation)
+    if avoid_confusing:
+        required = ["".join(ch for ch in p if ch not in CONFUSING)
+                    for p in required]
+    return [p for p in required if p]
+
+
+def _byte_table(pool: str) -> tuple[bytes, bytes]:
+    """
+    A bytes.translate() table mapping random bytes onto pool, and the
+    bytes to delete. Only the first 256 - 256 % len(pool) byte values
+    are kept (rejection sampling), so every character is equally likely.
+    """
+    limit = 256 - 256 % len(pool)
+    table = bytes(ord(pool[b % len(pool)]) for b in range(limit))
+    return table + bytes(256 - limit), bytes(range(limit, 256))
+
+
+def random_chars(pool: str, count: int) -> str:
+    """
+    Return count characters drawn uniformly from pool. Randomness comes
+    from os.urandom (the source secrets uses) in blocks of up to
+    URANDOM_BLOCK bytes, mapped to the pool in C by bytes.translate().
+    """
+    return _translated_urandom(*_byte_table(pool), count)
+
+
+def _translated_urandom(table: bytes, rejected: bytes, count: int) -> str:
+    """count random characters through a _byte_table() table."""
+    chunks = []
+    have = 0
+    while have < count:
+        # at least half of all byte values are kept, so 2x usually does
+        need = count - have
+        chunk = os.urandom(min(URANDOM_BLOCK, 2 * need + 16))
+        chunk = chunk.translate(table, rejected)
+        chunks.append(chunk)
+        have += len(chunk)
+    return b"".join(chunks)[:count].decode("ascii")
+
+
+class PasswordPolicy(NamedTuple):
+    """
+    Password options with everything derived from them worked out once:
+    the pool, its byte table, the required pools and the entropy
+    estimate. Get one from password_policy(), which caches them.
+    """
+    length: int
+    use_digits: bool
+    use_symbols: bool
+    avoid_confusing: bool
+    enforce_requirements: bool
+    pool: str
+    required: Tuple[FrozenSet[str], ...]
+    table: bytes
+    rejected: bytes
+    bits: float
+
+    @property
+    def strength(self) -> str:
+        """strength_label() of the entropy estimate."""
+        return strength_label(self.bits)
+
+    def iter_batches(self, n: int,
+                     batch_size: int = BATCH_SIZE) -> Iterator[List[str]]:
+        """
+        Yield n passwords in lists of batch_size (the last one may be
+        shorter). With enforce_requirements, passwords missing a digit
+        or symbol are thrown away and drawn again, so the result is
+        uniform over every password that meets the requirements.
+        """
+        length = self.length
+        left = n
+        while left > 0:
+            count = min(left, batch_size)
+            batch: List[str] = []
+            # top up until full: rejection can empty a whole draw
+            while len(batch) < count:
+                chars = _translated_urandom(self.table, self.rejected,
+                                            (count - len(batch)) * length)
+                drawn = [chars[i:i + length]
+                         for i in range(0, len(chars), length)]
+                for req in self.required:
+                    drawn = [pw for pw in drawn if not req.isdisjoint(pw)]
+                batch.extend(drawn)
+            left -= count
+            yield batch
+
+    def generate(self, n: int) -> List[str]:
+        """n passwords at once."""
+        passwords = []
+        for batch in self.iter_batches(n):
+            passwords.extend(batch)
+        return passwords
+
+
+@lru_cache(maxsize=256)
+def password_policy(
+    length=12,
+    use_digits=True,
+    use_symbols=True,
+    avoid_confusing=False,
+    enforce_requirements=False,
+):
+    """
+    The PasswordPolicy for these options, built on first use and cached.
+    Raises ValueError for options no password can meet.
+    """
+    if length < 1:
+        raise ValueError("Password length must be at least 1")
+    pool = build_pool(use_digits, use_symbols, avoid_confusing)
+    required = ()
     if enforce_requirements:
-        # ensure at least one of each selected type
-        required = []
-        if use_digits:
-            digits_pool = (
-                "".join(ch for ch in string.digits if ch not in CONFUSING)
-                if avoid_confusing
-                else string.digits
-            )
-            if digits_pool:
-                required.append(secrets.choice(digits_pool))
-        if use_symbols:
-            symbols_pool = (
-                "".join(ch for ch in string.punctuation if ch not in CONFUSING)
-                if avoid_confusing
-                else string.punctuation
-            )
-            if symbols_pool:
-                required.append(secrets.choice(symbols_pool))
+        required = tuple(frozenset(p) for p in required_pools(
+            use_digits, use_symbols, avoid_confusing))
         if len(required) > length:
             raise ValueError(
                 "Password length is too short to meet requirements"
                 )
-        password_chars = required + [
-            secrets.choice(pool) for _ in range(length - len(required))
-        ]
-        secure_shuffle(password_chars)
-        return "".join(password_chars)
-    else:
-        return "".join(secrets.choice(pool) for _ in range(length))
+    table, rejected = _byte_table(pool)
+    return PasswordPolicy(
+        length, bool(use_digits), bool(use_symbols), bool(avoid_confusing),
+        bool(enforce_requirements), pool, required, table, rejected,
+        estimate_entropy(length, len(pool)),
+    )
+
+
+def iter_passwords(n, batch_size=BATCH_SIZE, **options):
+    """
+    Yield n passwords in lists of up to batch_size. Takes the same
+    options as generate_password().
+    """
+    return password_policy(**options).iter_batches(n, batch_size)
+
+
+def generate_passwords(n, **options):
+    """
+    Generate n random passwords at once. Takes the same options as
+    generate_password().
+    """
+    return password_policy(**options).generate(n)
+
+
+def generate_password(
+    length=12,
+    use_digits=True,
+    use_symbols=True,
+    avoid_confusing=False,
+    enforce_requirements=False,
+):
+    """
+    Generate a random password
+    """
+    return generate_passwords(
+        1,
+        length=length,
+        use_digits=use_digits,
+        use_symbols=use_symbols,
+        avoid_confusing=avoid_confusing,
+        enforce_requirements=enforce_requirements,
+    )[0]
 
 
 def ask_int(prompt: str, minimum: int = 4, maximum: int = 128) -> int:
@@ -117,7 +253,139 @@ def ask_bool(prompt: str) -> bool:
         print("Please enter y/n or yes/no.")
 
 
-def main():
+@contextmanager
+def open_output(output=None):
+    """
+    Open output for writing passwords, created readable by the owner
+    only (0600); None means stdout, which is left open.
+    """
+    if output is None:
+        yield sys.stdout
+        return
+    fd = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with open(fd, "w", encoding="ascii") as f:
+        yield f
+
+
+def write_passwords(n, output=None, **options):
+    """
+    Generate n passwords, one per line, to the file output or stdout.
+    Passwords are written batch by batch, so memory stays flat however
+    many are asked for.
+    """
+    with open_output(output) as f:
+        for batch in iter_passwords(n, **options):
+            if batch:
+                f.write("\n".join(batch))
+                f.write("\n")
+
+
+def _password_chunk(count, options):
+    """Worker: count passwords as newline-terminated text."""
+    # each process reads os.urandom (the kernel CSPRNG) itself, so the
+    # workers share no random state
+    return "\n".join(generate_passwords(count, **options)) + "\n"
+
+
+def write_passwords_parallel(n, output=None, workers=None, ordered=True,
+                             batch_size=BATCH_SIZE, **options):
+    """
+    Like write_passwords(), but batches are generated by a pool of worker
+    processes (default: one per CPU). At most two batches per worker
+    are in flight, so memory stays bounded. With ordered=False batches
+    are written as soon as any worker finishes one.
+    """
+    workers = workers or os.cpu_count() or 1
+    password_policy(**options)  # raise bad options here, not in a worker
+    counts = [batch_size] * (n // batch_size)
+    if n % batch_size:
+        counts.append(n % batch_size)
+    with open_output(output) as f, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for count in counts:
+            if len(pending) >= 2 * workers:
+                _write_next(f, pending, ordered)
+            pending.append(pool.submit(_password_chunk, count, options))
+        while pending:
+            _write_next(f, pending, ordered)
+
+
+def _write_next(f, pending, ordered):
+    """Write one finished batch: the oldest, or any if not ordered."""
+    if ordered:
+        future = pending.popleft()
+    else:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        future = done.pop()
+        pending.remove(future)
+    f.write(future.result())
+
+
+def parse_args(argv=None):
+    """Parse the bulk mode flags."""
+    parser = argparse.ArgumentParser(
+        description="Secure password generator. Without --count it asks "
+                    "for the options interactively.")
+    parser.add_argument("--count", type=int, metavar="N",
+                        help="generate N passwords, one per line, and exit")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the passwords to FILE (default: stdout)")
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--no-digits", action="store_true")
+    parser.add_argument("--no-symbols", action="store_true")
+    parser.add_argument("--avoid-confusing", action="store_true",
+                        help="leave out characters like O0Ol1|")
+    parser.add_argument("--enforce", action="store_true",
+                        help="at least one digit and one symbol each")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="with --count, generate in N processes "
+                             "(0 = one per CPU; default 1, no pool)")
+    parser.add_argument("--unordered", action="store_true",
+                        help="with --workers, write batches as they finish")
+    args = parser.parse_args(argv)
+    if args.count is not None and args.count < 0:
+        parser.error("--count must not be negative")
+    if args.length < 1:
+        parser.error("--length must be at least 1")
+    if args.workers < 0:
+        parser.error("--workers must not be negative")
+    return args
+
+
+def run_bulk(args):
+    """Write args.count passwords and report the rate on stderr."""
+    options = dict(
+        length=args.length,
+        use_digits=not args.no_digits,
+        use_symbols=not args.no_symbols,
+        avoid_confusing=args.avoid_confusing,
+        enforce_requirements=args.enforce,
+    )
+    started = time.perf_counter()
+    try:
+        if args.workers == 1:
+            write_passwords(args.count, args.output, **options)
+        else:
+            write_passwords_parallel(args.count, args.output,
+                                     workers=args.workers,
+                                     ordered=not args.unordered, **options)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+    elapsed = time.perf_counter() - started
+    policy = password_policy(**options)
+    rate = args.count / elapsed if elapsed else 0.0
+    print(f"Generated {args.count} passwords in {elapsed:.3f}s "
+          f"({rate:,.0f}/s), {policy.strength} ({policy.bits:.1f} bits) "
+          f"each", file=sys.stderr)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.count is not None:
+        run_bulk(args)
+        return
+
     print("=== Password Generator ===")
     length = ask_int("Length (4-128): ", minimum=4, maximum=128)
     use_digits = ask_bool("Include digits 0-9?")
@@ -125,7 +393,7 @@ def main():
     enforce = ask_bool("Enforce at least one of each selected type?")
     avoid_confusing = ask_bool("Avoid confusing characters like O0Ol1|`'\\\"?")
 
-    password = generate_password(
+    policy = password_policy(
         length=length,
         use_digits=use_digits,
         use_symbols=use_symbols,
@@ -133,24 +401,11 @@ def main():
         avoid_confusing=avoid_confusing,
     )
 
-    # strength estimate
-    pool = "".join(
-        ch
-        for ch in (
-            string.ascii_letters
-            + (string.digits if use_digits else "")
-            + (string.punctuation if use_symbols else "")
-        )
-        if not (avoid_confusing and ch in CONFUSING)
-    )
-    pool_size = len(pool)
-    bits = estimate_entropy(length, pool_size)
-
     print("\nYour password:")
-    print(password)
+    print(policy.generate(1)[0])
     print(
-        f"\nEstimated strength: {strength_label(bits)} ({bits:.1f} bits) "
-        f"from pool {pool_size} x length {length}"
+        f"\nEstimated strength: {policy.strength} ({policy.bits:.1f} bits) "
+        f"from pool {len(policy.pool)} x length {length}"
     )
 
 
@@ -1,8 +1,14 @@
 # This is a simple calculator that can add, subtract, multiply,
-# and divide two numbers
+# and divide two numbers, or evaluate a whole formula
 
 # Basic calculator using loops, conditionals, and functions
 
+try:
+    from .expression_engine import ExpressionError, evaluate
+except ImportError:  # run as a script from phase1_basics/
+    from expression_engine import ExpressionError, evaluate
+
+
 def add(x, y):
     return x + y
 
@@ -17,36 +23,52 @@ def multiply(x, y):
 
 def divide(x, y):
     if y == 0:
-        return "Error: Division by zero"
+        raise ZeroDivisionError("Division by zero")
     return x / y
 
 
-while True:
-    print("\nOptions: add, subtract, multiply, divide, quit")
-    choice = input("Choose an operation: ").strip().lower()
+OPERATIONS = {
+    "add": add,
+    "subtract": subtract,
+    "multiply": multiply,
+    "divide": divide,
+}
+
+
+def main():
+    # the last result, available in formulas as "ans"
+    answer = 0.0
+    while True:
+        print("\nOptions: add, subtract, multiply, divide, quit")
+        print("Or type a formula, e.g. 2 * (3 + 4) ** 2 or sqrt(ans)")
+        choice = input("Choose an operation: ").strip()
 
-    if choice == "quit":
-        print("Exiting the calculator...")
-        break
+        if choice.lower() == "quit":
+            print("Exiting the calculator...")
+            break
 
-    if choice not in ["add", "subtract", "multiply", "divide"]:
-        print("Invalid choice. Please try again.")
-        continue
+        if choice.lower() in OPERATIONS:
+            try:
+                num1 = float(input("Enter first number: "))
+                num2 = float(input("Enter second number: "))
+            except ValueError:
+                print("Error: please enter numeric values.")
+                continue
+            try:
+                result = OPERATIONS[choice.lower()](num1, num2)
+            except ZeroDivisionError as e:
+                print(f"Error: {e}")
+                continue
+        else:
+            try:
+                result = evaluate(choice, ans=answer)
+            except ExpressionError as e:
+                print(f"Invalid choice or formula: {e}")
+                continue
 
-    try:
-        num1 = float(input("Enter first number: "))
-        num2 = float(input("Enter second number: "))
-    except ValueError:
-        print("Error: please enter numeric values.")
-        continue
+        answer = result
+        print(f"Result: {result}")
 
-    if choice == "add":
-        result = add(num1, num2)
-    elif choice == "subtract":
-        result = subtract(num1, num2)
-    elif choice == "multiply":
-        result = multiply(num1, num2)
-    else:
-        result = divide(num1, num2)
 
-    print(f"Result: {result}")
+if __name__ == "__main__":
+    main()
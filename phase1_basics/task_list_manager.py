@@ -3,37 +3,163 @@ Phase 1, Step 1: Add + List tasks
 """
 
 
+import argparse
+import gc
 import json
+import os
+import re
+import struct
+import sys
+import time
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict
-
-
-Task = Dict[str, object]
-
-
-def next_id(tasks: List[Task]) -> int:
-    """Return the next task ID"""
-    if not tasks:
-        return 1
-    return max(int(t["id"]) for t in tasks) + 1
-
-
-def add_task(tasks: List[Task], title: str, priority: str = "med") -> Task:
-    """Create a new task and append it to tasks."""
+from typing import (BinaryIO, Dict, Iterable, Iterator, List, TextIO,
+                    Tuple)
+
+
+class Task:
+    """One task. __slots__ keeps it small: no per-task attribute dict."""
+
+    __slots__ = ("id", "title", "priority", "done")
+
+    def __init__(self, task_id: int, title: str, priority: str = "med",
+                 done: bool = False) -> None:
+        self.id = task_id
+        self.title = title
+        self.priority = priority
+        self.done = done
+
+    def __repr__(self) -> str:
+        return (f"Task({self.id!r}, {self.title!r}, {self.priority!r}, "
+                f"done={self.done!r})")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Task):
+            return NotImplemented
+        return (self.id, self.title, self.priority, self.done) == (
+            other.id, other.title, other.priority, other.done)
+
+
+class TaskStore:
+    """
+    Tasks indexed by id, done and priority.
+
+    - get/add/mark_done/delete are dict operations; ids come from a
+      counter, so adding never scans the tasks.
+    - filter() reads only the index buckets that match, so its cost
+      follows the size of the result rather than the store.
+    - Iterating yields tasks in the order they were added; filter()
+      yields them in the order they entered their done/priority bucket.
+    - Change tasks through the store only, or the indexes go stale.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()) -> None:
+        self._by_id: Dict[int, Task] = {}
+        self._by_done: Dict[bool, Dict[int, Task]] = {False: {}, True: {}}
+        self._by_priority: Dict[str, Dict[int, Task]] = {}
+        self._next_id = 1
+        self.extend(tasks)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._by_id.values())
+
+    @property
+    def next_id(self) -> int:
+        """The ID the next added task gets (never reused in a session)."""
+        return self._next_id
+
+    def get(self, task_id: int) -> Task | None:
+        """Return the task with the given ID, or None if not found."""
+        return self._by_id.get(task_id)
+
+    def add(self, title: str, priority: str = "med") -> Task:
+        """Create a task with the next ID and add it."""
+        task = Task(self._next_id, title, priority)
+        self.put(task)
+        return task
+
+    def put(self, task: Task) -> None:
+        """Add a task, replacing any task with the same ID."""
+        old = self._by_id.get(task.id)
+        if old is not None:
+            self._unindex(old)
+        self._by_id[task.id] = task
+        self._index(task)
+        if task.id >= self._next_id:
+            self._next_id = task.id + 1
+
+    def extend(self, tasks: Iterable[Task]) -> None:
+        """put() every task; the fast path for loading a whole file."""
+        by_id = self._by_id
+        by_done = self._by_done
+        by_priority = self._by_priority
+        for task in tasks:
+            old = by_id.get(task.id)
+            if old is not None:
+                self._unindex(old)
+            by_id[task.id] = task
+            by_done[task.done][task.id] = task
+            bucket = by_priority.get(task.priority)
+            if bucket is None:
+                bucket = by_priority[task.priority] = {}
+            bucket[task.id] = task
+        if by_id:
+            self._next_id = max(self._next_id, max(by_id) + 1)
+
+    def mark_done(self, task_id: int) -> Task | None:
+        """Mark a task as done; return it, or None if not found."""
+        task = self._by_id.get(task_id)
+        if task is not None and not task.done:
+            del self._by_done[False][task_id]
+            task.done = True
+            self._by_done[True][task_id] = task
+        return task
+
+    def delete(self, task_id: int) -> bool:
+        """Remove a task; return False if it did not exist."""
+        task = self._by_id.pop(task_id, None)
+        if task is None:
+            return False
+        self._unindex(task)
+        return True
+
+    def filter(self, *, done: bool | None = None,
+               priority: str | None = None) -> List[Task]:
+        """Tasks matching both filters (None = don't filter)."""
+        if done is None and priority is None:
+            return list(self._by_id.values())
+        if priority is None:
+            return list(self._by_done[done].values())
+        by_priority = self._by_priority.get(priority, {})
+        if done is None:
+            return list(by_priority.values())
+        # both: walk the smaller bucket and check the other field
+        by_done = self._by_done[done]
+        if len(by_done) < len(by_priority):
+            return [t for t in by_done.values() if t.priority == priority]
+        return [t for t in by_priority.values() if t.done is done]
+
+    def _index(self, task: Task) -> None:
+        self._by_done[task.done][task.id] = task
+        self._by_priority.setdefault(task.priority, {})[task.id] = task
+
+    def _unindex(self, task: Task) -> None:
+        del self._by_done[task.done][task.id]
+        del self._by_priority[task.priority][task.id]
+
+
+def add_task(store: TaskStore, title: str, priority: str = "med") -> Task:
+    """Create a new task and add it to the store."""
     title = title.strip()
     if not title:
         raise ValueError("Task title cannot be empty")
-    task = {
-        "id": next_id(tasks),
-        "title": title,
-        "priority": priority,
-        "done": False,
-    }
-    tasks.append(task)
-    return task
+    return store.add(title, priority)
 
 
-def list_tasks(tasks: List[Task]) -> None:
+def list_tasks(tasks: Iterable[Task]) -> None:
     """List all tasks in the task list."""
     if not tasks:
         print("No tasks yet.")
@@ -41,10 +167,10 @@ def list_tasks(tasks: List[Task]) -> None:
     print("\nID  |  Title                         | Pri | Done")
     print("-" * 50)
     for t in tasks:
-        tid = str(t["id"]).rjust(2)
-        title = str(t["title"])[:27].ljust(27)
-        pri = str(t["priority"]).rjust(3)
-        done = "Yes" if t["done"] else "No"
+        tid = str(t.id).rjust(2)
+        title = str(t.title)[:27].ljust(27)
+        pri = str(t.priority).rjust(3)
+        done = "Yes" if t.done else "No"
         print(f"{tid}  |  {title}  |  {pri}  |  {done}")
     print()
 
@@ -61,49 +187,29 @@ def parse_priority(raw: str) -> str:
     return "med"
 
 
-def find_task_index(tasks: List[Task], task_id: int) -> int | None:
-    """Return the index of the task with the given ID, or None if not found."""
-    for i, t in enumerate(tasks):
-        if int(t["id"]) == task_id:
-            return i
-    return None
-
-
-def mark_done(tasks: List[Task], task_id: int) -> bool:
+def mark_done(store: TaskStore, task_id: int) -> bool:
     """Mark a task as done. Return True if successful, False if not found."""
-    idx = find_task_index(tasks, task_id)
-    if idx is None:
-        return False
-    tasks[idx]["done"] = True
-    return True
+    return store.mark_done(task_id) is not None
 
 
-def delete_task(tasks: List[Task], task_id: int) -> bool:
+def delete_task(store: TaskStore, task_id: int) -> bool:
     """Delete a task. Return True if successful, False if not found."""
-    idx = find_task_index(tasks, task_id)
-    if idx is None:
-        return False
-    del tasks[idx]
-    return True
+    return store.delete(task_id)
 
 
 def filter_tasks(
-    tasks: List[Task],
+    store: TaskStore,
     *,
     done: bool | None = None,
     priority: str | None = None,
 ) -> List[Task]:
-    """Filter tasks based on done and priority."""
-    out = tasks
-    if done is not None:
-        out = [t for t in out if bool(t["done"]) is done]
+    """Filter tasks based on done and priority, using the store indexes."""
     if priority is not None:
-        p = parse_priority(priority)
-        out = [t for t in out if str(t["priority"]) == p]
-    return out
+        priority = parse_priority(priority)
+    return store.filter(done=done, priority=priority)
 
 
-def list_filtered(tasks: List[Task]) -> None:
+def list_filtered(store: TaskStore) -> None:
     """Prompt user for filters and print result."""
     raw_done = input("Filter by done? (y/n/blank for no filter): "
                      ).strip().lower()
@@ -119,7 +225,7 @@ def list_filtered(tasks: List[Task]) -> None:
                     ).strip()
     pri_filter = parse_priority(raw_pri) if raw_pri else None
 
-    results = filter_tasks(tasks, done=done_filter, priority=pri_filter)
+    results = filter_tasks(store, done=done_filter, priority=pri_filter)
     if not results:
         print("No tasks match the filters.\n")
         return
@@ -128,52 +234,384 @@ def list_filtered(tasks: List[Task]) -> None:
 
 DEFAULT_PATH = Path("tasks.json")
 
+# Files ending in .bin use the binary format, anything else is JSON.
+BINARY_SUFFIX = ".bin"
+BINARY_MAGIC = b"TASKS1\n"
+# Binary record: id, title length in bytes, priority index, done; then
+# the UTF-8 title.
+BINARY_RECORD = struct.Struct("<IIBB")
+MAX_BINARY_ID = 2 ** 32 - 1  # the id field is a uint32
+PRIORITIES = ("low", "med", "high")
+CHUNK_SIZE = 1 << 16
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+_DECODER = json.JSONDecoder()
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def serialize_task(t: Task) -> dict:
+    """Convert one task to a JSON safe dict."""
+    return {
+        "id": int(t.id),
+        "title": str(t.title),
+        "priority": str(t.priority),
+        "done": bool(t.done),
+    }
 
-def serialize_tasks(tasks: List[Task]) -> list[dict]:
+
+def deserialize_task(item: dict) -> Task:
+    """Convert a JSON dict back to a task (ids may be strings)."""
+    return Task(int(item["id"]), item["title"], item["priority"],
+                bool(item["done"]))
+
+
+def serialize_tasks(tasks: Iterable[Task]) -> list[dict]:
     """Convert tasks list to JSON safe list of dicts."""
-    out: list[dict] = []
+    return [serialize_task(t) for t in tasks]
+
+
+def journal_path(path: Path) -> Path:
+    """The journal kept next to a tasks file, e.g. tasks.json.journal."""
+    return path.with_name(path.name + ".journal")
+
+
+def write_json_tasks(f: TextIO, tasks: Iterable[Task]) -> None:
+    """Write tasks as a JSON array, one compact object per line."""
+    sep = "\n"
+    f.write("[")
+    for t in tasks:
+        f.write(sep)
+        f.write(_ENCODER.encode(serialize_task(t)))
+        sep = ",\n"
+    f.write("\n]\n")
+
+
+def iter_json_tasks(f: TextIO) -> Iterator[Task]:
+    """
+    Yield the tasks of a JSON array one at a time, reading the file in
+    chunks, so the whole document is never held in memory.
+    """
+    buf = f.read(CHUNK_SIZE)
+    pos = _SEPARATORS.match(buf).end()
+    if buf[pos:pos + 1] != "[":
+        raise json.JSONDecodeError("Expecting '['", buf, pos)
+    pos += 1
+    while True:
+        pos = _SEPARATORS.match(buf, pos).end()
+        if buf[pos:pos + 1] == "]":
+            return
+        try:
+            item, pos = _DECODER.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # most likely an object cut off at the end of the chunk
+            more = f.read(CHUNK_SIZE)
+            if not more:
+                raise
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+        yield deserialize_task(item)
+
+
+def write_binary_tasks(f: BinaryIO, tasks: Iterable[Task]) -> None:
+    """Write tasks as length-prefixed binary records."""
+    f.write(BINARY_MAGIC)
     for t in tasks:
-        out.append({
-            "id": str(t["id"]),
-            "title": str(t["title"]),
-            "priority": str(t["priority"]),
-            "done": bool(t["done"]),
-        })
-    return out
-
-
-def save_tasks(path: Path, tasks: List[Task]) -> None:
-    """Save tasks to a file."""
-    data = serialize_tasks(tasks)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
-
-def load_tasks(path: Path) -> List[Task]:
-    """Read tasks from JSON file. Return empty list if file doesn't exist."""
-    if not path.exists():
-        return []
+        priority = str(t.priority)
+        if priority not in PRIORITIES:
+            raise ValueError(f"Cannot store priority {priority!r} in a "
+                             f"binary file")
+        if not 0 <= int(t.id) <= MAX_BINARY_ID:
+            raise ValueError(f"Cannot store task ID {t.id} in a "
+                             f"binary file")
+        title = str(t.title).encode("utf-8")
+        f.write(BINARY_RECORD.pack(int(t.id), len(title),
+                                   PRIORITIES.index(priority),
+                                   bool(t.done)))
+        f.write(title)
+
+
+def iter_binary_tasks(f: BinaryIO) -> Iterator[Task]:
+    """Yield the tasks of a binary file one at a time."""
+    if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+        raise ValueError("Not a binary task file")
+    size = BINARY_RECORD.size
+    buf = b""
+    pos = 0
+    while True:
+        more = f.read(CHUNK_SIZE)
+        if not more:
+            break
+        buf = buf[pos:] + more
+        pos = 0
+        while len(buf) - pos >= size:
+            task_id, length, priority, done = BINARY_RECORD.unpack_from(
+                buf, pos)
+            end = pos + size + length
+            if end > len(buf):
+                break
+            yield Task(task_id, buf[pos + size:end].decode("utf-8"),
+                       PRIORITIES[priority], bool(done))
+            pos = end
+    if pos != len(buf):
+        raise ValueError("Binary task file is truncated")
+
+
+def save_tasks(path: Path, tasks: Iterable[Task]) -> None:
+    """
+    Save all tasks to a file and drop its journal. The data is written
+    to a temp file that then replaces the old one, so a crash mid-save
+    leaves the previous file intact.
+    """
+    tmp = path.with_name(path.name + ".tmp")
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        tasks: List[Task] = []
-        for item in data:
-            tasks.append({
-                "id": int(item["id"]),
-                "title": item["title"],
-                "priority": item["priority"],
-                "done": bool(item["done"]),
-            })
-        return tasks
+        if path.suffix == BINARY_SUFFIX:
+            with tmp.open("wb") as f:
+                write_binary_tasks(f, tasks)
+                f.flush()
+                os.fsync(f.fileno())
+        else:
+            with tmp.open("w", encoding="utf-8") as f:
+                write_json_tasks(f, tasks)
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, path)
+    journal = journal_path(path)
+    if journal.exists():
+        journal.unlink()
+
+
+def replay_journal(path: Path, store: TaskStore) -> int:
+    """
+    Apply the journal of a tasks file to the store and return the number
+    of records applied. A half-written last line is cut off.
+    """
+    journal = journal_path(path)
+    if not journal.exists():
+        return 0
+    good_bytes = 0
+    count = 0
+    with journal.open("rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            task_id = int(record["id"])
+            if record["task"] is None:
+                store.delete(task_id)
+            else:
+                store.put(deserialize_task(record["task"]))
+            good_bytes += len(line)
+            count += 1
+    size = journal.stat().st_size
+    if good_bytes < size:
+        print(f"Dropping {size - good_bytes} bytes of torn journal "
+              f"at the end of {journal}.\n")
+        os.truncate(journal, good_bytes)
+    return count
+
+
+def read_tasks(path: Path) -> TaskStore:
+    """
+    Read tasks from a file and apply its journal, if any. Return an
+    empty store if the file doesn't exist; raise OSError or ValueError
+    if it can't be read.
+    """
+    store = TaskStore()
+    # Tasks hold no reference cycles, but the cyclic GC would rescan all
+    # of them again and again while a big file loads, so pause it.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if path.suffix == BINARY_SUFFIX and path.exists():
+            with path.open("rb") as f:
+                store.extend(iter_binary_tasks(f))
+        elif path.exists():
+            with path.open("r", encoding="utf-8") as f:
+                store.extend(iter_json_tasks(f))
+        replay_journal(path, store)
+        return store
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def load_tasks(path: Path) -> TaskStore:
+    """
+    Read tasks from JSON file and apply its journal, if any. Return an
+    empty store if the file doesn't exist or can't be read.
+    """
+    try:
+        return read_tasks(path)
     except OSError as e:
         print(f"File error: {e}\n")
-        return []
+        return TaskStore()
     except json.JSONDecodeError as e:
         print(f"JSON error: {e}\n")
-        return []
-
-
-def handle_add_task(tasks: List[Task]) -> None:
+        return TaskStore()
+    except ValueError as e:
+        print(f"Error: {e}\n")
+        return TaskStore()
+
+
+# A journal record: task ID and its serialized task, or None if deleted.
+Change = Tuple[int, dict | None]
+
+
+class TaskJournal:
+    """
+    Journaled storage for a tasks file: save() appends only the tasks
+    changed since the last save to `<file>.journal`, so its cost grows
+    with the number of changes, not the number of tasks. Once the
+    journal holds `compact_every` records (0 = never) it is folded back
+    into the file by compact().
+    """
+
+    def __init__(self, path: Path, compact_every: int = 1000) -> None:
+        self.path = path
+        self.journal = journal_path(path)
+        self.compact_every = compact_every
+        self.pending: List[Change] = []
+        self.records = 0
+
+    def load(self, strict: bool = False) -> TaskStore:
+        """
+        Load the file plus journal, forgetting unsaved changes. With
+        strict, read errors are raised instead of giving an empty store.
+        """
+        store = read_tasks(self.path) if strict else load_tasks(self.path)
+        self.pending.clear()
+        self.records = 0
+        if self.journal.exists():
+            with self.journal.open("rb") as f:
+                self.records = sum(1 for _ in f)
+        return store
+
+    def record(self, task_id: int, task: Task | None) -> None:
+        """Remember a changed task, or a deleted one (task=None)."""
+        data = None if task is None else serialize_task(task)
+        self.pending.append((task_id, data))
+
+    def save(self, tasks: Iterable[Task]) -> int:
+        """Append pending changes and return how many were written."""
+        written = len(self.pending)
+        if self.pending:
+            lines = b"".join(
+                _ENCODER.encode({"id": task_id, "task": data}).encode()
+                + b"\n"
+                for task_id, data in self.pending
+            )
+            with self.journal.open("ab") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self.records += written
+            self.pending.clear()
+        if self.compact_every and self.records >= self.compact_every:
+            self.compact(tasks)
+        return written
+
+    def compact(self, tasks: Iterable[Task]) -> None:
+        """Rewrite the whole file from tasks and drop the journal."""
+        save_tasks(self.path, tasks)
+        self.pending.clear()
+        self.records = 0
+
+
+# Commands a batch file may use; see parse_batch_line().
+BATCH_OPS = ("add", "done", "delete")
+MAX_BATCH_ERRORS = 20
+
+
+def parse_batch_line(line: str) -> dict | None:
+    """
+    Parse one batch command into a dict like {"op": "add", ...}; return
+    None for blank lines and # comments. A line is either NDJSON:
+        {"op": "add", "title": "Buy milk", "priority": "high"}
+        {"op": "done", "id": 3}
+    or plain words, where the title is the rest of the line:
+        add Buy milk
+        add:high Buy milk
+        done 3
+        delete 3
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("{"):
+        cmd = json.loads(line)
+        if not isinstance(cmd, dict):
+            raise ValueError("JSON command must be an object")
+        return cmd
+    word, _, rest = line.partition(" ")
+    op, _, priority = word.lower().partition(":")
+    rest = rest.strip()
+    if op == "add":
+        return {"op": op, "title": rest, "priority": priority or "med"}
+    if op in ("done", "delete") and rest.isdigit():
+        return {"op": op, "id": int(rest)}
+    raise ValueError(f"Bad command: {line!r}")
+
+
+def apply_command(store: TaskStore, cmd: dict,
+                  journal: TaskJournal | None = None) -> None:
+    """Apply one parsed batch command; raise ValueError if it fails."""
+    op = cmd.get("op")
+    if op == "add":
+        task = add_task(store, str(cmd.get("title", "")),
+                        parse_priority(str(cmd.get("priority", "med"))))
+        if journal is not None:
+            journal.record(task.id, task)
+        return
+    if op not in ("done", "delete"):
+        raise ValueError(f"Unknown op {op!r}")
+    try:
+        tid = int(cmd["id"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"{op} needs an integer id") from None
+    if op == "done":
+        task = store.mark_done(tid)
+        if task is None:
+            raise ValueError(f"No task with ID {tid}")
+        if journal is not None:
+            journal.record(tid, task)
+    else:
+        if not store.delete(tid):
+            raise ValueError(f"No task with ID {tid}")
+        if journal is not None:
+            journal.record(tid, None)
+
+
+def run_batch(store: TaskStore, lines: Iterable[str],
+              journal: TaskJournal | None = None) -> Counter:
+    """
+    Apply every command in lines to the store. Bad commands are
+    reported on stderr and skipped. Return counts per op and "errors".
+    """
+    counts: Counter = Counter()
+    for lineno, line in enumerate(lines, 1):
+        try:
+            cmd = parse_batch_line(line)
+            if cmd is None:
+                continue
+            apply_command(store, cmd, journal)
+        except ValueError as e:  # includes JSON errors
+            counts["errors"] += 1
+            if counts["errors"] <= MAX_BATCH_ERRORS:
+                print(f"Line {lineno}: {e}", file=sys.stderr)
+            continue
+        counts[cmd["op"]] += 1
+    return counts
+
+
+def handle_add_task(store: TaskStore,
+                    journal: TaskJournal | None = None) -> None:
     """Handle adding a new task."""
     title = input("Title: ").strip()
     if not title:
@@ -182,60 +620,186 @@ def handle_add_task(tasks: List[Task]) -> None:
     pri_raw = input("Priority (low/med/high) [med]: ")
     pri = parse_priority(pri_raw if pri_raw else "med")
     try:
-        task = add_task(tasks, title, pri)
-        print(f"Added task {task['id']}: "
-              f"{task['title']} (pri {task['priority']})\n")
+        task = add_task(store, title, pri)
+        if journal is not None:
+            journal.record(task.id, task)
+        print(f"Added task {task.id}: "
+              f"{task.title} (pri {task.priority})\n")
     except ValueError as e:
         print(f"Error: {e}\n")
 
 
-def handle_mark_done(tasks: List[Task]) -> None:
+def handle_mark_done(store: TaskStore,
+                     journal: TaskJournal | None = None) -> None:
     """Handle marking a task as done."""
     raw = input("Enter task ID to mark done: ").strip()
     if not raw.isdigit():
         print("Please enter a valid task ID.\n")
         return
     tid = int(raw)
-    if mark_done(tasks, tid):
+    if mark_done(store, tid):
+        if journal is not None:
+            journal.record(tid, store.get(tid))
         print(f"Task #{tid} marked done.\n")
     else:
         print(f"No task with ID {tid}.\n")
 
 
-def handle_delete_task(tasks: List[Task]) -> None:
+def handle_delete_task(store: TaskStore,
+                       journal: TaskJournal | None = None) -> None:
     """Handle deleting a task."""
     raw = input("Enter task ID to delete: ").strip()
     if not raw.isdigit():
         print("Please enter a valid task ID.\n")
         return
     tid = int(raw)
-    if delete_task(tasks, tid):
+    if delete_task(store, tid):
+        if journal is not None:
+            journal.record(tid, None)
         print(f"Task #{tid} deleted.\n")
     else:
         print(f"No task with ID {tid}.\n")
 
 
-def handle_save_tasks(tasks: List[Task]) -> None:
-    """Handle saving tasks to file."""
+def handle_save_tasks(store: TaskStore, path: Path = DEFAULT_PATH,
+                      journal: TaskJournal | None = None) -> bool:
+    """
+    Handle saving tasks to file (only the changes with a journal).
+    Return False if the save failed.
+    """
     try:
-        save_tasks(DEFAULT_PATH, tasks)
-        print(f"Saved {len(tasks)} tasks to {DEFAULT_PATH}.\n")
+        if journal is None:
+            save_tasks(path, store)
+            print(f"Saved {len(store)} tasks to {path}.\n")
+            return True
+        written = journal.save(store)
+        if journal.records == 0:
+            print(f"Saved {written} changes and compacted "
+                  f"{len(store)} tasks into {path}.\n")
+        else:
+            print(f"Saved {written} changes to {journal.journal}.\n")
+        return True
     except OSError as e:  # file/permission problems
         print(f"File error: {e}\n")
-    except json.JSONDecodeError as e:
-        print(f"JSON error: {e}\n")
+    except ValueError as e:  # e.g. a priority the binary format can't store
+        print(f"Error: {e}\n")
+    return False
 
 
-def handle_load_tasks() -> List[Task]:
+def handle_load_tasks(path: Path = DEFAULT_PATH,
+                      journal: TaskJournal | None = None) -> TaskStore:
     """Handle loading tasks from file."""
-    tasks = load_tasks(DEFAULT_PATH)
-    print(f"Loaded {len(tasks)} tasks from {DEFAULT_PATH}.\n")
-    return tasks
+    store = journal.load() if journal is not None else load_tasks(path)
+    print(f"Loaded {len(store)} tasks from {path}.\n")
+    return store
+
+
+def handle_batch(source: str, path: Path = DEFAULT_PATH,
+                 journal: TaskJournal | None = None) -> bool:
+    """
+    Run a batch file ("-" = stdin): load the tasks once, apply every
+    command in memory, save once, and print a summary with timings.
+    Return False if the tasks couldn't be loaded or saved, the batch
+    file couldn't be read, or a command failed.
+    """
+    started = time.perf_counter()
+    try:
+        store = journal.load(strict=True) if journal is not None \
+            else read_tasks(path)
+    except (OSError, ValueError) as e:
+        print(f"Could not load {path}: {e}. Nothing was changed.",
+              file=sys.stderr)
+        return False
+    loaded = time.perf_counter()
 
+    try:
+        if source == "-":
+            counts = run_batch(store, sys.stdin, journal)
+        else:
+            with open(source, "r", encoding="utf-8") as f:
+                counts = run_batch(store, f, journal)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Could not read batch {source}: {e}. Nothing was changed.",
+              file=sys.stderr)
+        return False
+    applied = time.perf_counter()
 
-def main() -> None:
+    if not handle_save_tasks(store, path, journal):
+        print(f"Could not save the batch to {path}.", file=sys.stderr)
+        return False
+    saved = time.perf_counter()
+
+    ops = sum(counts[op] for op in BATCH_OPS)
+    apply_seconds = applied - loaded
+    rate = ops / apply_seconds if apply_seconds else 0.0
+    print(f"Batch: {counts['add']} added, {counts['done']} marked done, "
+          f"{counts['delete']} deleted, {counts['errors']} errors; "
+          f"{len(store)} tasks now.")
+    print(f"Time: load {loaded - started:.3f}s, apply {apply_seconds:.3f}s "
+          f"({rate:,.0f} ops/s), save {saved - applied:.3f}s, "
+          f"total {saved - started:.3f}s.")
+    return counts["errors"] == 0
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(
+        description="Simple CLI task list manager.")
+    parser.add_argument("--file", type=Path, default=DEFAULT_PATH,
+                        help="tasks file (default: tasks.json); a .bin "
+                             "file uses the binary format")
+    parser.add_argument("--journal", action="store_true",
+                        help="save only changed tasks, to <file>.journal")
+    parser.add_argument("--compact-every", type=int, default=1000,
+                        metavar="N",
+                        help="with --journal, fold the journal into the "
+                             "file after N records (0 = never)")
+    parser.add_argument("--compact", action="store_true",
+                        help="fold the journal into the file and exit")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run the commands in FILE (- = stdin), save "
+                             "once and exit; one per line, as words "
+                             "(add[:pri] TITLE, done ID, delete ID) or "
+                             "NDJSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
     """Main function to run the task list manager."""
-    tasks: List[Task] = []
+    args = parse_args(argv)
+    path: Path = args.file
+    store = TaskStore()
+
+    if args.compact:
+        # strict: compacting an unreadable file would replace it (and
+        # drop its journal) with an empty list
+        try:
+            store = read_tasks(path)
+        except (OSError, ValueError) as e:
+            print(f"Could not load {path}: {e}. Nothing was changed.",
+                  file=sys.stderr)
+            sys.exit(1)
+        try:
+            save_tasks(path, store)
+        except (OSError, ValueError) as e:
+            print(f"Could not save {path}: {e}. Nothing was changed.",
+                  file=sys.stderr)
+            sys.exit(1)
+        print(f"Compacted {len(store)} tasks into {path}.")
+        return
+
+    journal = None
+    if args.journal:
+        journal = TaskJournal(path, compact_every=args.compact_every)
+
+    if args.batch:
+        if not handle_batch(args.batch, path, journal):
+            sys.exit(1)
+        return
+
+    if journal is not None:
+        # the journal only holds changes, so start from the saved tasks
+        store = handle_load_tasks(path, journal)
 
     while True:
         print("Task List Manager")
@@ -251,19 +815,19 @@ def main() -> None:
         choice = input("Choose: ").strip()
 
         if choice == "1":
-            handle_add_task(tasks)
+            handle_add_task(store, journal)
         elif choice == "2":
-            list_tasks(tasks)
+            list_tasks(store)
         elif choice == "3":
-            handle_mark_done(tasks)
+            handle_mark_done(store, journal)
         elif choice == "4":
-            handle_delete_task(tasks)
+            handle_delete_task(store, journal)
         elif choice == "5":
-            list_filtered(tasks)
+            list_filtered(store)
         elif choice == "6":
-            handle_save_tasks(tasks)
+            handle_save_tasks(store, path, journal)
         elif choice == "7":
-            tasks = handle_load_tasks()
+            store = handle_load_tasks(path, journal)
         elif choice == "8":
             print("Goodbye.")
             break
@@ -0,0 +1,59 @@
+"""Batch calculator API
+Phase 2, Step 3: Apply calculator operations to whole columns over HTTP
+"""
+
+import math
+from typing import List, Literal, Optional
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+from phase1_basics.batch_calculator import calculate
+
+# Rows per request, at most
+MAX_ROWS = 100_000
+
+# Create the FastAPI app instance
+app = FastAPI()
+
+
+class Calculation(BaseModel):
+    """
+    Pydantic model for a batch calculation: op applied to x[i], y[i].
+    """
+    op: Literal["add", "subtract", "multiply", "divide"]
+    x: List[float] = Field(max_length=MAX_ROWS)
+    y: List[float] = Field(max_length=MAX_ROWS)
+
+
+class CalculationResult(BaseModel):
+    """
+    Pydantic model for the results. Rows without a finite result
+    (divided by zero, or out of float range) are null in results and
+    listed in errors.
+    """
+    results: List[Optional[float]]
+    errors: List[int]
+
+
+# Route: POST /calculate
+@app.post("/calculate", response_model=CalculationResult,
+          tags=["Calculator"])
+def post_calculate(payload: Calculation):
+    """
+    Apply the operation to every row at once.
+    400 if x and y differ in length.
+    """
+    try:
+        results, zero = calculate(payload.op, payload.x, payload.y)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    results = results.tolist()
+    errors = set(zero)
+    # JSON has no inf or nan
+    if not all(map(math.isfinite, results)):
+        errors.update(i for i, r in enumerate(results)
+                      if not math.isfinite(r))
+    for i in errors:
+        results[i] = None
+    return {"results": results, "errors": sorted(errors)}
@@ -0,0 +1,61 @@
+"""Password generator API
+Phase 2, Step 2: Serve the Phase 1 password generator over HTTP
+"""
+
+from typing import List
+
+from fastapi import FastAPI, HTTPException, Query, Response
+from pydantic import BaseModel
+
+from phase1_basics.password_generator import password_policy
+
+# Passwords per request, at most
+MAX_COUNT = 10_000
+MAX_LENGTH = 128
+
+# Create the FastAPI app instance
+app = FastAPI()
+
+
+class PasswordBatch(BaseModel):
+    """
+    Pydantic model for a batch of passwords and their policy.
+    """
+    length: int
+    pool_size: int
+    bits: float
+    strength: str
+    passwords: List[str]
+
+
+# Route: GET /passwords
+@app.get("/passwords", response_model=PasswordBatch, tags=["Passwords"])
+def get_passwords(
+    response: Response,
+    count: int = Query(1, ge=1, le=MAX_COUNT),
+    length: int = Query(16, ge=1, le=MAX_LENGTH),
+    digits: bool = True,
+    symbols: bool = True,
+    avoid_confusing: bool = False,
+    enforce: bool = False,
+):
+    """
+    Return count new passwords for the given policy.
+    The policy (pool, byte table, entropy) is built once and cached, so
+    a request only draws random bytes.
+    400 if no password can meet the policy.
+    """
+    try:
+        policy = password_policy(length, digits, symbols, avoid_confusing,
+                                 enforce)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # the body is secret: keep it out of caches
+    response.headers["Cache-Control"] = "no-store"
+    return {
+        "length": policy.length,
+        "pool_size": len(policy.pool),
+        "bits": policy.bits,
+        "strength": policy.strength,
+        "passwords": policy.generate(count),
+    }
@@ -1,19 +1,52 @@
 """
 Phase 3, Step 1: Create a CRUD API with FastAPI
 """
-from typing import List, Dict, Any, Optional
+import os
+from contextlib import asynccontextmanager
+from typing import List, Optional
 
 from fastapi import FastAPI, HTTPException, status, Response
 from pydantic import BaseModel
 
+from .durable_store import DurableTaskStore
+from .task_store import TaskStore
 
-app = FastAPI()
 
+# Persistence is off unless TASKS_DATA_DIR is set. Then every change is
+# appended to a log in that directory, fsynced every
+# TASKS_FSYNC_INTERVAL_MS (0 = on every change, "off" = never), and
+# compacted into a snapshot every TASKS_SNAPSHOT_EVERY changes.
+DATA_DIR = os.getenv("TASKS_DATA_DIR")
+FSYNC_INTERVAL_MS = os.getenv("TASKS_FSYNC_INTERVAL_MS", "10")
+SNAPSHOT_EVERY = int(os.getenv("TASKS_SNAPSHOT_EVERY", "100000"))
 
-# In memory storage for this phase
-tasks: List[Dict[str, Any]] = []
-# simple ID counter for created tasks
-next_id = 1  # pylint: disable=invalid-name
+
+def open_store() -> TaskStore:
+    """The task store configured by the environment."""
+    if not DATA_DIR:
+        return TaskStore()
+    return DurableTaskStore(
+        DATA_DIR,
+        fsync_interval=(None if FSYNC_INTERVAL_MS == "off"
+                        else float(FSYNC_INTERVAL_MS) / 1000),
+        snapshot_every=SNAPSHOT_EVERY,
+    )
+
+
+# In memory storage for this phase: dict by id, with a lock (and an
+# on-disk log when TASKS_DATA_DIR is set)
+store = open_store()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """On shutdown, snapshot a durable store so restarts are fast."""
+    yield
+    if isinstance(store, DurableTaskStore):
+        store.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 # ------------------------------------------------------
@@ -45,31 +78,13 @@ class Task(BaseModel):
     done: bool
 
 
-# ------------------------------------------------------
-# Helpers
-# ------------------------------------------------------
-def find_task_index(task_id: int) -> Optional[int]:
-    """Return the index of the task with the given ID, or None if not found."""
-    for i, t in enumerate(tasks):
-        if int(t.get("id", -1)) == int(task_id):
-            return i
-    return None
-
-
-def generate_next_id() -> int:
-    """Generate a new ID for a task."""
-    if not tasks:
-        return 1
-    return max(int(t.get("id", 0)) for t in tasks) + 1
-
-
 # ------------------------------------------------------
 # Routes
 # ------------------------------------------------------
 @app.get("/tasks", response_model=List[Task], tags=["Tasks"])
 def get_tasks():
     """Get all tasks"""
-    return tasks
+    return store.list()
 
 
 @app.get("/tasks/{task_id}", response_model=Task, tags=["Tasks"])
@@ -79,9 +94,9 @@ def get_task(task_id: int):
     Raise 404 if not found.
     """
 
-    idx = find_task_index(task_id)
-    if idx is not None:
-        return tasks[idx]
+    task = store.get(task_id)
+    if task is not None:
+        return task
     raise HTTPException(status_code=404, detail="Task not found")
 
 
@@ -91,13 +106,7 @@ def create_task(payload: CreateTask):
     """
     Create a new task with an auto-incremented integer ID.
     """
-    task = {
-        "id": generate_next_id(),
-        "title": payload.title,
-        "done": payload.done,
-    }
-    tasks.append(task)
-    return task
+    return store.create(payload.title, payload.done)
 
 
 @app.patch("/tasks/{task_id}", response_model=Task, tags=["Tasks"])
@@ -108,22 +117,18 @@ def update_task(task_id: int, payload: UpdateTask):
     400 if body has no updateable fields.
     """
     # find the task
-    idx = find_task_index(task_id)
-    if idx is None:
+    if store.get(task_id) is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
     # at least one field must be provided
     if payload.title is None and payload.done is None:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    # update the task
-    if payload.title is not None:
-        tasks[idx]["title"] = payload.title
-
-    if payload.done is not None:
-        tasks[idx]["done"] = payload.done
-
-    return tasks[idx]
+    # update the task (None if it was deleted in the meantime)
+    task = store.update(task_id, title=payload.title, done=payload.done)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
 
 
 @app.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT,
@@ -133,10 +138,7 @@ def delete_task(task_id: int):
     Delete a task by ID.
     Returns 204 if successful, 404 if not found.
     """
-    idx = find_task_index(task_id)
-    if idx is None:
-        raise HTTPException(status_code=404, detail="Task not found")
-
     # delete the task
-    tasks.pop(idx)
+    if not store.delete(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
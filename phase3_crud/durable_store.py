@@ -0,0 +1,201 @@
+"""
+Phase 3, Step 3: Snapshot + append-only log persistence for TaskStore
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .task_store import TaskStore
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "tasks.snapshot.json"
+LOG_FILE = "tasks.log"
+# The log being folded into a snapshot that is still being written.
+OLD_LOG_FILE = "tasks.log.1"
+
+
+class DurableTaskStore(TaskStore):
+    """
+    TaskStore that survives restarts, keeping reads at in-memory speed.
+
+    - Every change is appended to `tasks.log` as one JSON line
+      {"id": ..., "task": {...} or null} and flushed to the OS before
+      the call returns, so a killed process loses nothing.
+    - `fsync_interval` decides when the log reaches the disk itself:
+      0 fsyncs every change, N > 0 fsyncs in the background every N
+      seconds (a machine crash may lose that window), None never.
+    - After `snapshot_every` logged changes (0 = never) a compacted
+      snapshot of all tasks is written in the background and the log
+      restarts empty. close() writes a final snapshot.
+    - On startup the latest snapshot is loaded and the log tail is
+      replayed; a torn last line from a crash is cut off.
+    """
+
+    def __init__(self, data_dir: Union[str, Path], *,
+                 fsync_interval: Optional[float] = 0.0,
+                 snapshot_every: int = 100_000) -> None:
+        super().__init__()
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self._records = 0  # log lines not yet covered by a snapshot
+        self._dirty = False
+        self._snapshot_pending = False
+        self._snapshot_lock = threading.Lock()
+
+        started = time.perf_counter()
+        self._load()
+        self.load_seconds = time.perf_counter() - started
+
+        self._log = open(self.data_dir / LOG_FILE, "ab")
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if fsync_interval:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="task-log-fsync", daemon=True)
+            self._flusher.start()
+
+    def _load(self) -> None:
+        """Load the snapshot, then replay the old and current logs."""
+        snapshot = self.data_dir / SNAPSHOT_FILE
+        if snapshot.exists():
+            data = json.loads(snapshot.read_bytes())
+            self._tasks = {task["id"]: task for task in data["tasks"]}
+            self._next_id = data["next_id"]
+        # replaying a log the snapshot already covers is harmless: every
+        # record sets a task to its full value at that point
+        for name in (OLD_LOG_FILE, LOG_FILE):
+            path = self.data_dir / name
+            if path.exists():
+                self._records += self._replay(path)
+
+    def _replay(self, path: Path) -> int:
+        """Apply one log file; return the number of records applied."""
+        good_bytes = 0
+        count = 0
+        with open(path, "rb") as log:
+            for line in log:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self._apply(record["id"], record["task"])
+                good_bytes += len(line)
+                count += 1
+        size = path.stat().st_size
+        if good_bytes < size:
+            logger.warning("Dropping %d bytes of torn log at the end of %s",
+                           size - good_bytes, path)
+            os.truncate(path, good_bytes)
+        return count
+
+    def _apply(self, task_id: int, task: Optional[Dict[str, Any]]) -> None:
+        """Set or remove one task during replay."""
+        if task is None:
+            self._tasks.pop(task_id, None)
+        else:
+            self._tasks[task_id] = task
+        self._next_id = max(self._next_id, task_id + 1)
+
+    def _changed(self, task_id: int, task: Optional[Dict[str, Any]]) -> None:
+        """Append the change to the log (called with the lock held)."""
+        line = json.dumps({"id": task_id, "task": task},
+                          separators=(",", ":"))
+        self._log.write(line.encode() + b"\n")
+        self._log.flush()
+        if self.fsync_interval == 0:
+            os.fsync(self._log.fileno())
+        else:
+            self._dirty = True
+        self._records += 1
+        if (self.snapshot_every and self._records >= self.snapshot_every
+                and not self._snapshot_pending):
+            self._snapshot_pending = True
+            threading.Thread(target=self.snapshot, name="task-snapshot",
+                             daemon=True).start()
+
+    def _flush_loop(self) -> None:
+        """Background fsync every `fsync_interval` seconds."""
+        while not self._stop.wait(self.fsync_interval):
+            self.sync()
+
+    def sync(self) -> None:
+        """fsync the log if anything was written since the last sync."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            # a duplicate fd stays valid even if the log is rotated
+            fd = os.dup(self._log.fileno())
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def snapshot(self) -> None:
+        """
+        Write all tasks to a new snapshot and drop the log it covers.
+        Writers are only paused while the task list is copied and the
+        log is rotated, not while the snapshot is written.
+        """
+        with self._snapshot_lock:
+            log_path = self.data_dir / LOG_FILE
+            old_log_path = self.data_dir / OLD_LOG_FILE
+            with self._lock:
+                tasks = list(self._tasks.values())
+                next_id = self._next_id
+                self._log.flush()
+                os.fsync(self._log.fileno())
+                self._log.close()
+                if old_log_path.exists():
+                    # an earlier snapshot failed: keep both logs
+                    with open(old_log_path, "ab") as old, \
+                            open(log_path, "rb") as new:
+                        shutil.copyfileobj(new, old)
+                        old.flush()
+                        os.fsync(old.fileno())
+                    os.remove(log_path)
+                else:
+                    os.replace(log_path, old_log_path)
+                self._log = open(log_path, "ab")
+                self._dirty = False
+                self._records = 0
+                self._snapshot_pending = False
+
+            snapshot_path = self.data_dir / SNAPSHOT_FILE
+            tmp_path = snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as out:
+                out.write(json.dumps({"next_id": next_id, "tasks": tasks},
+                                     separators=(",", ":")).encode())
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp_path, snapshot_path)
+            _fsync_dir(self.data_dir)
+            os.remove(old_log_path)
+
+    def close(self) -> None:
+        """Stop background fsyncs and write a final snapshot."""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.snapshot()
+        with self._lock:
+            self._log.close()
+
+
+def _fsync_dir(path: Path) -> None:
+    """Make renames inside `path` durable."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
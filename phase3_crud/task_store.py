@@ -0,0 +1,76 @@
+"""
+Phase 3, Step 2: Thread-safe in-memory task store
+"""
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class TaskStore:
+    """
+    In-memory tasks kept in a dict by id, so get/create/update/delete
+    are O(1); listing is O(n) and returns tasks in creation order.
+
+    - Ids come from a counter and are never reused, even after the
+      newest task is deleted.
+    - A lock guards every change, since FastAPI runs sync routes in a
+      threadpool.
+    - Stored task dicts are never mutated: update() replaces the dict,
+      so a task already handed to a response can't change under it.
+    - Every change is passed to _changed() under the lock, before it is
+      applied; subclasses override it to persist changes in order (if
+      it raises, the store is left unchanged).
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Return all tasks, oldest first."""
+        with self._lock:
+            return list(self._tasks.values())
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Return a task by ID, or None if not found."""
+        return self._tasks.get(task_id)
+
+    def create(self, title: str, done: bool = False) -> Dict[str, Any]:
+        """Add a task with the next ID and return it."""
+        with self._lock:
+            task = {"id": self._next_id, "title": title, "done": done}
+            self._changed(self._next_id, task)
+            self._tasks[self._next_id] = task
+            self._next_id += 1
+            return task
+
+    def update(self, task_id: int, *, title: Optional[str] = None,
+               done: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        """Change the given fields; return the new task, or None."""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return None
+            task = dict(task)
+            if title is not None:
+                task["title"] = title
+            if done is not None:
+                task["done"] = done
+            self._changed(task_id, task)
+            self._tasks[task_id] = task
+            return task
+
+    def delete(self, task_id: int) -> bool:
+        """Remove a task; return False if it did not exist."""
+        with self._lock:
+            if task_id not in self._tasks:
+                return False
+            self._changed(task_id, None)
+            del self._tasks[task_id]
+            return True
+
+    def _changed(self, task_id: int, task: Optional[Dict[str, Any]]) -> None:
+        """Hook: `task_id` now holds `task` (None = deleted)."""
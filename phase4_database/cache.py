@@ -0,0 +1,99 @@
+"""
+Phase 4, cache: bounded in-process LRU cache with optional TTL
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Returned by LRUCache.get() when the key is not cached.
+MISSING: Any = object()
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache.
+
+    - `maxsize` bounds the number of entries (0 disables the cache).
+    - `ttl` (seconds) expires entries on read; None keeps them until
+      evicted or invalidated.
+    - `generation` is bumped on every invalidation. A reader captures it
+      before going to the database and passes it to put(); if anything
+      was invalidated in between, the (possibly stale) value is dropped.
+    """
+
+    def __init__(self, maxsize: int = 1024,
+                 ttl: Optional[float] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value or MISSING, counting hits and misses."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return MISSING
+
+    def put(self, key: Hashable, value: Any,
+            generation: Optional[int] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+        Skipped if `generation` is given and no longer current.
+        """
+        if self.maxsize <= 0:
+            return
+        expires_at = (time.monotonic() + self.ttl
+                      if self.ttl else float("inf"))
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop one key."""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every key."""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
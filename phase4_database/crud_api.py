@@ -1,21 +1,74 @@
 """
 Phase 4 - Wire up the database layer
 """
-from typing import List, Optional
+from typing import (
+    Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set,
+)
 from contextlib import asynccontextmanager
+import base64
+import json
 
-from fastapi import FastAPI, HTTPException, status, Response, Depends
+from fastapi import (
+    APIRouter, Body, Depends, FastAPI, Header, HTTPException, Query, Request,
+    Response, status,
+)
+from fastapi.responses import (
+    JSONResponse, PlainTextResponse, StreamingResponse,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from .database_orm import (
+    METRICS_ENABLED,
+    STREAM_BATCH_SIZE,
+    Cursor,
+    SortOrder,
+    TaskRecord,
+    USE_ASYNC_DB,
+    VersionConflict,
+    async_engine,
+    async_session_scope,
+    cache_stats,
+    get_async_session,
+    get_async_write_session,
     get_session,
+    get_write_session,
+    group_commit_stats,
+    group_committer,
     init_db,
+    metrics,
+    run_write,
+    run_write_async,
+    session_scope,
     orm_list_tasks,
+    orm_iter_tasks,
+    orm_count_tasks,
     orm_get_task,
+    orm_get_task_version,
+    orm_tasks_fingerprint,
     orm_create_task,
     orm_update_task,
     orm_delete_task,
+    orm_bulk_create_tasks,
+    orm_bulk_update_tasks,
+    orm_bulk_delete_tasks,
+    orm_list_tasks_async,
+    orm_iter_tasks_async,
+    orm_count_tasks_async,
+    orm_get_task_async,
+    orm_get_task_version_async,
+    orm_tasks_fingerprint_async,
+    orm_bulk_create_tasks_async,
+    orm_bulk_update_tasks_async,
+    orm_bulk_delete_tasks_async,
+    page_cursor,
 )
+from .metrics import MetricsMiddleware
+
+try:  # optional: a much faster JSON encoder for list responses
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # ------------------------------------------------------
@@ -24,11 +77,24 @@ from .database_orm import (
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     """
-    Initialize the database on startup.
+    Initialize the database on startup; on shutdown, commit queued
+    group-commit writes and release the async engine's connections.
     """
     init_db()
     yield
+    if group_committer is not None:
+        group_committer.stop()
+    await async_engine.dispose()
+
+
+# Largest page a client may request from GET /tasks
+MAX_PAGE_SIZE = 1000
 
+# Largest number of items accepted by one /tasks/bulk request
+MAX_BULK_ITEMS = 10_000
+
+# Largest id SQLite can bind (signed 64-bit); cursors beyond it are bad
+MAX_CURSOR_ID = 2 ** 63 - 1
 
 # FastAPI instance
 app = FastAPI(
@@ -36,6 +102,13 @@ app = FastAPI(
     version="0.4.0",
     lifespan=lifespan,
 )
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+# Routes are grouped by database engine; only one set is mounted on the
+# app, picked by USE_ASYNC_DB (TASKS_ASYNC_DB=1).
+sync_router = APIRouter()
+async_router = APIRouter()
 
 
 # ------------------------------------------------------
@@ -68,62 +141,604 @@ class Task(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class BulkUpdateTask(UpdateTask):
+    """
+    One item of a bulk update: the task id plus the fields to change.
+    """
+    id: int
+
+
+class BulkDeleteTasks(BaseModel):
+    """
+    Pydantic model for a bulk delete request.
+    """
+    ids: List[int] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkFailure(BaseModel):
+    """
+    An item of a bulk request that was not applied, by request index.
+    """
+    index: int
+    id: Optional[int] = None
+    detail: str
+
+
+class BulkResult(BaseModel):
+    """
+    Outcome of a bulk create or update.
+    """
+    succeeded: List[Task]
+    failed: List[BulkFailure]
+
+
+class BulkDeleteResult(BaseModel):
+    """
+    Outcome of a bulk delete.
+    """
+    deleted: List[int]
+    failed: List[BulkFailure]
+
+
+class TaskCount(BaseModel):
+    """
+    Response model for GET /tasks/count.
+    """
+    count: int
+
+
 # ------------------------------------------------------
-# Routes
+# Helpers
 # ------------------------------------------------------
-@app.get("/tasks", response_model=List[Task], tags=["Tasks"])
-def get_tasks(session: Session = Depends(get_session)):
-    """Get all tasks"""
-    return orm_list_tasks(session)
+def task_filters(
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = Query(None, min_length=1),
+) -> Dict[str, Any]:
+    """
+    Shared query parameters of GET /tasks and GET /tasks/count.
+    Both filters are served by indexes on the tasks table.
+    """
+    return {"completed": completed, "title_prefix": title_prefix}
+
+
+def stream_tasks(**query: Any) -> Iterator[bytes]:
+    """
+    Encode tasks as one JSON array, a batch of rows at a time.
+    Uses its own session so the transaction lives as long as the stream.
+    The first item is not body: it is the collection ETag, read in the
+    same transaction as the rows, for the response headers.
+    """
+    with session_scope() as session:
+        yield list_etag(orm_tasks_fingerprint(session)).encode()
+        yield b"["
+        chunk: List[TaskRecord] = []
+        first = True
+        for record in orm_iter_tasks(session, **query):
+            chunk.append(record)
+            if len(chunk) >= STREAM_BATCH_SIZE:
+                yield join_chunk(chunk, first)
+                chunk.clear()
+                first = False
+        if chunk:
+            yield join_chunk(chunk, first)
+        yield b"]"
 
 
-@app.get("/tasks/{task_id}", response_model=Task, tags=["Tasks"])
-def get_task(task_id: int, session: Session = Depends(get_session)):
+async def stream_tasks_async(**query: Any) -> AsyncIterator[bytes]:
+    """
+    Async stream_tasks(), reading from the async engine; the first
+    item is the ETag as well.
+    """
+    async with async_session_scope() as session:
+        yield list_etag(await orm_tasks_fingerprint_async(session)).encode()
+        yield b"["
+        chunk: List[TaskRecord] = []
+        first = True
+        async for record in orm_iter_tasks_async(session, **query):
+            chunk.append(record)
+            if len(chunk) >= STREAM_BATCH_SIZE:
+                yield join_chunk(chunk, first)
+                chunk.clear()
+                first = False
+        if chunk:
+            yield join_chunk(chunk, first)
+        yield b"]"
+
+
+def dump_json(obj: Any) -> bytes:
+    """Compact JSON bytes, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False,
+                      separators=(",", ":")).encode()
+
+
+def encode_tasks(records: Iterable[TaskRecord]) -> bytes:
+    """
+    Encode records as a JSON array of the Task response model,
+    straight from the row tuples (no Pydantic validation per row).
+    """
+    return dump_json([{"id": r.id, "title": r.title,
+                       "completed": r.completed} for r in records])
+
+
+def join_chunk(chunk: List[TaskRecord], first: bool) -> bytes:
+    """Encode tasks as one piece of a streamed JSON array."""
+    return (b"" if first else b",") + encode_tasks(chunk)[1:-1]
+
+
+def tasks_response(tasks: List[TaskRecord],
+                   headers: Dict[str, str]) -> Response:
+    """
+    JSON response for a list of tasks, bypassing response_model
+    validation (the fields are exactly those of the Task model).
+    """
+    return Response(encode_tasks(tasks), media_type="application/json",
+                    headers=headers)
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """
+    X-Next-Cursor value: the id for id orderings, (title, id) as
+    URL-safe base64 JSON for title orderings. Clients pass it back
+    as `after` without looking inside.
+    """
+    if isinstance(cursor, int):
+        return str(cursor)
+    data = json.dumps(list(cursor), ensure_ascii=False,
+                      separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def parse_cursor(after: Optional[str], sort: SortOrder) -> Optional[Cursor]:
+    """Decode an `after` cursor for `sort`; 400 if it is not one."""
+    if after is None:
+        return None
+    try:
+        if sort.lstrip("-") != "title":
+            if after.isascii() and after.isdigit():
+                if int(after) <= MAX_CURSOR_ID:
+                    return int(after)
+        else:
+            data = base64.urlsafe_b64decode(after + "=" * (-len(after) % 4))
+            title, task_id = json.loads(data)
+            if (isinstance(title, str) and type(task_id) is int
+                    and -MAX_CURSOR_ID - 1 <= task_id <= MAX_CURSOR_ID):
+                return title, task_id
+    except (ValueError, TypeError):  # bad base64, JSON or shape
+        pass
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def next_page(headers: Dict[str, str], tasks: list, limit: int,
+              sort: SortOrder) -> list:
+    """
+    Trim a page fetched with limit + 1 rows and, if there was an
+    extra row, advertise the next cursor in X-Next-Cursor.
+    """
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(
+            page_cursor(tasks[-1], sort))
+    return tasks
+
+
+def task_etag(task_id: int, version: int) -> str:
+    """Strong ETag for one state of one task."""
+    return f'"{task_id}-{version}"'
+
+
+def list_etag(fingerprint: str) -> str:
+    """Strong ETag for the task collection (any page or filter)."""
+    return f'"tasks-{fingerprint}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header lists `etag` or is `*`."""
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags
+
+
+def if_match_versions(header: Optional[str],
+                      task_id: int) -> Optional[Set[int]]:
+    """
+    Versions of `task_id` allowed by an If-Match header.
+    None means no precondition (no header, or `*`); an empty set means
+    no listed ETag belongs to this task, so the write must fail.
+    """
+    if header is None or header.strip() == "*":
+        return None
+    versions: Set[int] = set()
+    prefix = f"{task_id}-"
+    for tag in header.split(","):
+        tag = tag.strip().strip('"')
+        if tag.startswith(prefix) and tag[len(prefix):].isdigit():
+            versions.add(int(tag[len(prefix):]))
+    return versions
+
+
+def not_modified(etag: str) -> Response:
+    """304 response: the client's copy is current."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag})
+
+
+def to_failures(errors) -> List[BulkFailure]:
+    """Convert ORM BulkError tuples into response models."""
+    return [BulkFailure(index=e.index, id=e.task_id, detail=e.detail)
+            for e in errors]
+
+
+# ------------------------------------------------------
+# Routes (sync engine)
+# ------------------------------------------------------
+@sync_router.get("/tasks", response_model=List[Task], tags=["Tasks"])
+def get_tasks(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    sort: SortOrder = "id",
+    stream: bool = False,
+    filters: Dict[str, Any] = Depends(task_filters),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Get tasks, optionally filtered by `completed` and `title_prefix`
+    and sorted by `sort` (id, -id, title, -title; default id).
+    With `limit`, return one page and put the cursor for the next page
+    in the X-Next-Cursor header (pass it back as `after`; 400 if it
+    is not a cursor for this `sort`).
+    With `stream=true`, stream the result instead of building it in memory.
+    Answers 304 if If-None-Match holds the current collection ETag.
+    """
+    cursor = parse_cursor(after, sort)
+    if stream:
+        # the stream has its own session, which outlives this function
+        body = stream_tasks(limit=limit, after=cursor, sort=sort, **filters)
+        etag = next(body).decode()
+        if etag_matches(if_none_match, etag):
+            body.close()
+            return not_modified(etag)
+        return StreamingResponse(body, media_type="application/json",
+                                 headers={"ETag": etag})
+
+    with session_scope() as session:
+        # taken before reading rows, so a concurrent write can only make
+        # the ETag older than the body, never newer
+        etag = list_etag(orm_tasks_fingerprint(session))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        headers = {"ETag": etag}
+        if limit is None:
+            tasks = orm_list_tasks(session, after=cursor, sort=sort,
+                                   **filters)
+            return tasks_response(tasks, headers)
+
+        # fetch one extra row to learn whether another page exists
+        tasks = orm_list_tasks(session, limit=limit + 1, after=cursor,
+                               sort=sort, **filters)
+    return tasks_response(next_page(headers, tasks, limit, sort), headers)
+
+
+@sync_router.get("/tasks/count", response_model=TaskCount, tags=["Tasks"])
+def count_tasks(filters: Dict[str, Any] = Depends(task_filters),
+                session: Session = Depends(get_session)):
+    """
+    Count tasks matching the same filters as GET /tasks.
+    """
+    return TaskCount(count=orm_count_tasks(session, **filters))
+
+
+# /tasks/count and the bulk routes are declared before /tasks/{task_id}
+# so "count" and "bulk" are not parsed as task ids.
+@sync_router.post("/tasks/bulk", response_model=BulkResult, tags=["Tasks"])
+def bulk_create_tasks(
+    payload: List[CreateTask] = Body(min_length=1, max_length=MAX_BULK_ITEMS),
+    session: Session = Depends(get_write_session),
+):
+    """
+    Create many tasks in one transaction.
+    Items that fail are listed in `failed` by their index in the request.
+    """
+    created, errors = orm_bulk_create_tasks(
+        session, [item.model_dump() for item in payload])
+    return BulkResult(
+        succeeded=[Task.model_validate(obj) for obj in created],
+        failed=to_failures(errors),
+    )
+
+
+@sync_router.patch("/tasks/bulk", response_model=BulkResult, tags=["Tasks"])
+def bulk_update_tasks(
+    payload: List[BulkUpdateTask] = Body(min_length=1,
+                                         max_length=MAX_BULK_ITEMS),
+    session: Session = Depends(get_write_session),
+):
+    """
+    Partially update many tasks in one transaction.
+    Unknown ids and items with no fields are reported in `failed`.
+    """
+    updated, errors = orm_bulk_update_tasks(
+        session, [item.model_dump(exclude_unset=True) for item in payload])
+    return BulkResult(
+        succeeded=[Task.model_validate(obj) for obj in updated],
+        failed=to_failures(errors),
+    )
+
+
+@sync_router.delete("/tasks/bulk", response_model=BulkDeleteResult,
+                    tags=["Tasks"])
+def bulk_delete_tasks(payload: BulkDeleteTasks,
+                      session: Session = Depends(get_write_session)):
+    """
+    Delete many tasks in one transaction.
+    Unknown ids are reported in `failed`.
+    """
+    deleted, errors = orm_bulk_delete_tasks(session, payload.ids)
+    return BulkDeleteResult(deleted=deleted, failed=to_failures(errors))
+
+
+@sync_router.get("/tasks/{task_id}", response_model=Task, tags=["Tasks"])
+def get_task(task_id: int, response: Response,
+             if_none_match: Optional[str] = Header(None),
+             session: Session = Depends(get_session)):
     """
     Return a single task by its integer ID.
     Raise 404 if not found.
+    Answers 304 if If-None-Match holds the task's current ETag.
     """
+    if if_none_match is not None:
+        version = orm_get_task_version(session, task_id)
+        if version is not None:
+            etag = task_etag(task_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
 
     obj = orm_get_task(session, task_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Task not found")
+    response.headers["ETag"] = task_etag(obj.id, obj.version)
     return obj
 
 
-@app.post("/tasks", response_model=Task, tags=["Tasks"])
-def create_task(payload: CreateTask, session: Session = Depends(get_session)):
+@sync_router.post("/tasks", response_model=Task, tags=["Tasks"])
+def create_task(payload: CreateTask, response: Response):
     """
     Create a new task with an auto-incremented integer ID.
     """
-    return orm_create_task(session, payload.title, None, payload.completed)
+    obj = run_write(orm_create_task, payload.title, None, payload.completed)
+    response.headers["ETag"] = task_etag(obj.id, obj.version)
+    return obj
 
 
-@app.patch("/tasks/{task_id}", response_model=Task, tags=["Tasks"])
-def update_task(task_id: int, payload: UpdateTask,
-                session: Session = Depends(get_session)):
+@sync_router.patch("/tasks/{task_id}", response_model=Task, tags=["Tasks"])
+def update_task(task_id: int, payload: UpdateTask, response: Response,
+                if_match: Optional[str] = Header(None)):
     """
     Partially update a task. Only fields provided are changed.
     404 if not found.
     400 if body has no updateable fields.
+    412 if If-Match does not hold the task's current ETag.
     """
     updates = payload.model_dump(exclude_unset=True)
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    obj = orm_update_task(session, task_id, **updates)
+    obj = run_write(
+        orm_update_task, task_id,
+        expected_versions=if_match_versions(if_match, task_id), **updates)
     if not obj:
         raise HTTPException(status_code=404, detail="Task not found")
+    response.headers["ETag"] = task_etag(obj.id, obj.version)
     return obj
 
 
-@app.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT,
-            tags=["Tasks"])
-def delete_task(task_id: int, session: Session = Depends(get_session)):
+@sync_router.delete("/tasks/{task_id}",
+                    status_code=status.HTTP_204_NO_CONTENT, tags=["Tasks"])
+def delete_task(task_id: int, if_match: Optional[str] = Header(None)):
     """
     Delete a task by ID.
     Returns 204 if successful, 404 if not found.
+    412 if If-Match does not hold the task's current ETag.
     """
-    ok = orm_delete_task(session, task_id)
+    ok = run_write(
+        orm_delete_task, task_id,
+        expected_versions=if_match_versions(if_match, task_id))
+    if not ok:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+# ------------------------------------------------------
+# Routes (async engine)
+# ------------------------------------------------------
+@async_router.get("/tasks", response_model=List[Task], tags=["Tasks"])
+async def get_tasks_async(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    sort: SortOrder = "id",
+    stream: bool = False,
+    filters: Dict[str, Any] = Depends(task_filters),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Get tasks, filtered, sorted and paged (see get_tasks)."""
+    cursor = parse_cursor(after, sort)
+    if stream:
+        body = stream_tasks_async(limit=limit, after=cursor, sort=sort,
+                                  **filters)
+        etag = (await body.__anext__()).decode()
+        if etag_matches(if_none_match, etag):
+            await body.aclose()
+            return not_modified(etag)
+        return StreamingResponse(body, media_type="application/json",
+                                 headers={"ETag": etag})
+
+    async with async_session_scope() as session:
+        etag = list_etag(await orm_tasks_fingerprint_async(session))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        headers = {"ETag": etag}
+        if limit is None:
+            tasks = await orm_list_tasks_async(session, after=cursor,
+                                               sort=sort, **filters)
+            return tasks_response(tasks, headers)
+
+        tasks = await orm_list_tasks_async(
+            session, limit=limit + 1, after=cursor, sort=sort, **filters)
+    return tasks_response(next_page(headers, tasks, limit, sort), headers)
+
+
+@async_router.get("/tasks/count", response_model=TaskCount, tags=["Tasks"])
+async def count_tasks_async(
+    filters: Dict[str, Any] = Depends(task_filters),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Count tasks matching the same filters as GET /tasks."""
+    return TaskCount(count=await orm_count_tasks_async(session, **filters))
+
+
+@async_router.post("/tasks/bulk", response_model=BulkResult, tags=["Tasks"])
+async def bulk_create_tasks_async(
+    payload: List[CreateTask] = Body(min_length=1, max_length=MAX_BULK_ITEMS),
+    session: AsyncSession = Depends(get_async_write_session),
+):
+    """Create many tasks in one transaction."""
+    created, errors = await orm_bulk_create_tasks_async(
+        session, [item.model_dump() for item in payload])
+    return BulkResult(
+        succeeded=[Task.model_validate(obj) for obj in created],
+        failed=to_failures(errors),
+    )
+
+
+@async_router.patch("/tasks/bulk", response_model=BulkResult, tags=["Tasks"])
+async def bulk_update_tasks_async(
+    payload: List[BulkUpdateTask] = Body(min_length=1,
+                                         max_length=MAX_BULK_ITEMS),
+    session: AsyncSession = Depends(get_async_write_session),
+):
+    """Partially update many tasks in one transaction."""
+    updated, errors = await orm_bulk_update_tasks_async(
+        session, [item.model_dump(exclude_unset=True) for item in payload])
+    return BulkResult(
+        succeeded=[Task.model_validate(obj) for obj in updated],
+        failed=to_failures(errors),
+    )
+
+
+@async_router.delete("/tasks/bulk", response_model=BulkDeleteResult,
+                     tags=["Tasks"])
+async def bulk_delete_tasks_async(
+    payload: BulkDeleteTasks,
+    session: AsyncSession = Depends(get_async_write_session),
+):
+    """Delete many tasks in one transaction."""
+    deleted, errors = await orm_bulk_delete_tasks_async(session, payload.ids)
+    return BulkDeleteResult(deleted=deleted, failed=to_failures(errors))
+
+
+@async_router.get("/tasks/{task_id}", response_model=Task, tags=["Tasks"])
+async def get_task_async(task_id: int, response: Response,
+                         if_none_match: Optional[str] = Header(None),
+                         session: AsyncSession = Depends(get_async_session)):
+    """Return a single task by its integer ID, or 404 (see get_task)."""
+    if if_none_match is not None:
+        version = await orm_get_task_version_async(session, task_id)
+        if version is not None:
+            etag = task_etag(task_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    obj = await orm_get_task_async(session, task_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Task not found")
+    response.headers["ETag"] = task_etag(obj.id, obj.version)
+    return obj
+
+
+@async_router.post("/tasks", response_model=Task, tags=["Tasks"])
+async def create_task_async(payload: CreateTask, response: Response):
+    """Create a new task with an auto-incremented integer ID."""
+    obj = await run_write_async(orm_create_task, payload.title, None,
+                                payload.completed)
+    response.headers["ETag"] = task_etag(obj.id, obj.version)
+    return obj
+
+
+@async_router.patch("/tasks/{task_id}", response_model=Task, tags=["Tasks"])
+async def update_task_async(
+    task_id: int,
+    payload: UpdateTask,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+):
+    """Partially update a task; 404 if missing, 400 if body is empty."""
+    updates = payload.model_dump(exclude_unset=True)
+    if not updates:
+        raise HTTPException(status_code=400, detail="No fields to update")
+
+    obj = await run_write_async(
+        orm_update_task, task_id,
+        expected_versions=if_match_versions(if_match, task_id), **updates)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Task not found")
+    response.headers["ETag"] = task_etag(obj.id, obj.version)
+    return obj
+
+
+@async_router.delete("/tasks/{task_id}",
+                     status_code=status.HTTP_204_NO_CONTENT, tags=["Tasks"])
+async def delete_task_async(
+    task_id: int,
+    if_match: Optional[str] = Header(None),
+):
+    """Delete a task by ID; 204 if deleted, 404 if not found."""
+    ok = await run_write_async(
+        orm_delete_task, task_id,
+        expected_versions=if_match_versions(if_match, task_id))
     if not ok:
         raise HTTPException(status_code=404, detail="Task not found")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+# ------------------------------------------------------
+# Error handlers
+# ------------------------------------------------------
+@app.exception_handler(VersionConflict)
+async def version_conflict_handler(_request: Request, exc: VersionConflict):
+    """
+    An If-Match precondition failed: 412 with the current ETag.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        content={"detail": "Task has been modified"},
+        headers={"ETag": task_etag(exc.task_id, exc.current_version)},
+    )
+
+
+# ------------------------------------------------------
+# Routes (operations)
+# ------------------------------------------------------
+@app.get("/stats", tags=["Stats"])
+def get_stats():
+    """
+    Return runtime counters: read cache hits and misses, and group
+    commit batch sizes (null unless TASKS_GROUP_COMMIT=1).
+    """
+    return {"cache": cache_stats(), "group_commit": group_commit_stats()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Stats"])
+def get_metrics():
+    """
+    Request latency, status counts and SQL metrics in the Prometheus
+    text format (empty histograms if TASKS_METRICS=0).
+    """
+    return PlainTextResponse(metrics.render(),
+                             media_type="text/plain; version=0.0.4")
+
+
+app.include_router(async_router if USE_ASYNC_DB else sync_router)
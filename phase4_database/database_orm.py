@@ -3,11 +3,54 @@ Phase 4, ORM: SQLAlchemy setup and Task model
 """
 from __future__ import annotations
 
-from contextlib import contextmanager
+import asyncio
+import os
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
 from pathlib import Path
-from typing import List, Optional, Generator
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Collection,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from sqlalchemy import Boolean, Integer, String, create_engine, select
+from sqlalchemy import (
+    Boolean,
+    Index,
+    Integer,
+    String,
+    bindparam,
+    create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -16,9 +59,85 @@ from sqlalchemy.orm import (
     sessionmaker,
 )
 
-# Store the SQLite file at the repo root as "tasks.db"
-DB_PATH = Path(__file__).resolve().parent / "tasks.db"
+from .cache import MISSING, LRUCache
+from .group_commit import GroupCommitter
+from .metrics import CHUNKED_OPTIONS, Metrics, instrument_engine
+
+T = TypeVar("T")
+
+# Store the SQLite file next to this module as "tasks.db"
+# (override with TASKS_DB_PATH, e.g. for benchmarks).
+DB_PATH = Path(os.getenv(
+    "TASKS_DB_PATH", Path(__file__).resolve().parent / "tasks.db"))
 DATABASE_URL = f"sqlite:///{DB_PATH}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
+
+# Serve the API from the async engine instead of the blocking one.
+# Set TASKS_ASYNC_DB=1 before starting uvicorn to switch.
+USE_ASYNC_DB = os.getenv("TASKS_ASYNC_DB", "0") == "1"
+
+# Rows fetched per round trip when streaming the tasks table.
+STREAM_BATCH_SIZE = 500
+
+# Orderings accepted by the list helpers; "-" means descending.
+SortOrder = Literal["id", "-id", "title", "-title"]
+
+# Keyset position of the last task already listed: its id for id
+# orderings, its (title, id) for title orderings (see page_cursor()).
+Cursor = Union[int, Tuple[str, int]]
+
+# Rows per executemany / IN (...) batch in the bulk helpers.
+BULK_CHUNK_SIZE = 500
+
+# Read-through caches in front of orm_get_task() and paged
+# orm_list_tasks(). Size 0 disables a cache; TTL 0 means no expiry.
+CACHE_SIZE = int(os.getenv("TASKS_CACHE_SIZE", "1024"))
+LIST_CACHE_SIZE = int(os.getenv("TASKS_LIST_CACHE_SIZE", "128"))
+CACHE_TTL = float(os.getenv("TASKS_CACHE_TTL", "0")) or None
+
+# Group commit: single-task writes from concurrent requests are queued
+# and committed together, one transaction per batch. A batch closes
+# after the window (ms) or at max batch writes, whichever comes first.
+GROUP_COMMIT = os.getenv("TASKS_GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("TASKS_GROUP_COMMIT_WINDOW_MS",
+                                         "2"))
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("TASKS_GROUP_COMMIT_MAX_BATCH",
+                                       "64"))
+
+# Request and SQL metrics served on /metrics. Statements slower than
+# TASKS_SLOW_QUERY_MS are logged; so is any request that runs one
+# statement TASKS_N_PLUS_ONE_THRESHOLD times or more (an N+1 pattern).
+METRICS_ENABLED = os.getenv("TASKS_METRICS", "1") == "1"
+SLOW_QUERY_MS = float(os.getenv("TASKS_SLOW_QUERY_MS", "100"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("TASKS_N_PLUS_ONE_THRESHOLD", "10"))
+
+# SQLite tuning profiles. Each profile lists the PRAGMAs run on every
+# new connection and the connection pool size. Pick one with
+# TASKS_DB_PROFILE; "default" keeps SQLite's and SQLAlchemy's defaults.
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {
+        "pragmas": {},
+        "pool": {},
+    },
+    "production": {
+        "pragmas": {
+            "journal_mode": "WAL",      # readers no longer block the writer
+            "synchronous": "NORMAL",    # fsync at checkpoints, safe with WAL
+            "cache_size": -65536,       # negative = KiB, so 64 MB page cache
+            "mmap_size": 268435456,     # map up to 256 MB of the file
+            "busy_timeout": 5000,       # wait 5 s for a lock, don't fail
+            "temp_store": "MEMORY",
+        },
+        # One connection per Starlette threadpool worker (40), plus room
+        # for streams and background work, so a worker never waits on
+        # the pool while holding a thread another request needs.
+        "pool": {"pool_size": 40, "max_overflow": 20, "pool_timeout": 10},
+    },
+}
+DB_PROFILE = os.getenv("TASKS_DB_PROFILE", "production")
+if DB_PROFILE not in SQLITE_PROFILES:
+    raise ValueError(f"Unknown TASKS_DB_PROFILE {DB_PROFILE!r}; "
+                     f"expected one of {sorted(SQLITE_PROFILES)}")
 
 # Engine: manages DB connections.
 engine = create_engine(
@@ -26,7 +145,51 @@ engine = create_engine(
     echo=False,  # set to True temporarily to see SQL written to the console
     future=True,
     connect_args={"check_same_thread": False},
+    **SQLITE_PROFILES[DB_PROFILE]["pool"],
+)
+
+# Pass as Session.connection(execution_options=...) to start the
+# transaction with BEGIN IMMEDIATE: the write lock is taken up front,
+# so a read-then-write transaction waits for busy_timeout instead of
+# failing with "database is locked" when it upgrades its lock.
+WRITE_OPTIONS = {"sqlite_begin": "IMMEDIATE"}
+
+
+# pysqlite opens transactions lazily and breaks SAVEPOINT semantics
+# (its RELEASE commits). In every profile SQLAlchemy emits BEGIN
+# itself, so nested transactions (used by the bulk helpers and group
+# commit) are real savepoints inside one outer transaction and
+# WRITE_OPTIONS can ask for BEGIN IMMEDIATE.
+def _sqlite_connect(dbapi_connection, _connection_record) -> None:
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PROFILES[DB_PROFILE]["pragmas"].items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+
+
+def _sqlite_begin(conn) -> None:
+    mode = conn.get_execution_options().get("sqlite_begin", "DEFERRED")
+    conn.exec_driver_sql(f"BEGIN {mode}")
+
+
+# Async engine over the same file, driven by aiosqlite.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    **SQLITE_PROFILES[DB_PROFILE]["pool"],
 )
+event.listen(engine, "connect", _sqlite_connect)
+event.listen(engine, "begin", _sqlite_begin)
+event.listen(async_engine.sync_engine, "connect", _sqlite_connect)
+event.listen(async_engine.sync_engine, "begin", _sqlite_begin)
+
+# Process-wide metrics; both engines report their statements to it.
+metrics = Metrics(slow_query_seconds=SLOW_QUERY_MS / 1000,
+                  n_plus_one_threshold=N_PLUS_ONE_THRESHOLD)
+if METRICS_ENABLED:
+    instrument_engine(engine, metrics)
+    instrument_engine(async_engine.sync_engine, metrics)
 
 
 class Base(DeclarativeBase):
@@ -40,6 +203,17 @@ class Task(Base):
     """
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # filter on completed, then keyset-page on id
+        Index("ix_tasks_completed_id", "completed", "id"),
+        # title prefix ranges and title ordering (id breaks ties)
+        Index("ix_tasks_title_id", "title", "id"),
+        # filter on completed, then keyset-page on (title, id)
+        Index("ix_tasks_completed_title_id", "completed", "title", "id"),
+        # AUTOINCREMENT: ids are never reused, so (id, version)
+        # identifies one state of one task and can be used as an ETag.
+        {"sqlite_autoincrement": True},
+    )
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True)
@@ -48,6 +222,9 @@ class Task(Base):
         String, default="", nullable=False)
     completed: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=False)
+    # Bumped by every write; drives ETags and If-Match checks.
+    version: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1", nullable=False)
 
     # API-facing convenience so Pydantic can read 'done' when serializing
     @property
@@ -56,6 +233,67 @@ class Task(Base):
         return self.completed
 
 
+class TaskRecord(NamedTuple):
+    """
+    Immutable snapshot of a tasks row. Safe to cache and share across
+    sessions and threads, unlike a Task instance.
+    """
+
+    id: int
+    title: str
+    description: str
+    completed: bool
+    version: int
+
+    @property
+    def done(self) -> bool:
+        """Return the completed status as 'done' for API serialization."""
+        return self.completed
+
+    @classmethod
+    def from_task(cls, task: Task) -> "TaskRecord":
+        """Snapshot a loaded Task."""
+        return cls(task.id, task.title, task.description, task.completed,
+                   task.version)
+
+
+class TasksMeta(Base):
+    """
+    One-row table holding the version of the tasks table. Every write
+    helper bumps it in its own transaction, so it identifies one state
+    of the whole table and backs the collection ETag.
+    """
+
+    __tablename__ = "tasks_meta"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False)
+
+
+_BUMP_TASKS_VERSION = (update(TasksMeta)
+                       .where(TasksMeta.id == 1)
+                       .values(version=TasksMeta.version + 1))
+
+
+# Columns of a TaskRecord, in field order. List reads select just these
+# and build records from the row tuples, skipping ORM identity-map work.
+RECORD_COLUMNS = (Task.id, Task.title, Task.description, Task.completed,
+                  Task.version)
+
+
+class VersionConflict(Exception):
+    """
+    Raised by a conditional write when the task's current version is
+    not one the caller expected (HTTP If-Match failed).
+    """
+
+    def __init__(self, task_id: int, current_version: int) -> None:
+        super().__init__(f"Task {task_id} is at version {current_version}")
+        self.task_id = task_id
+        self.current_version = current_version
+
+
 # Session factory: creates Session objects for DB interactions.
 SessionLocal = sessionmaker(
     bind=engine,
@@ -65,21 +303,156 @@ SessionLocal = sessionmaker(
     future=True,
 )
 
+# Async session factory: creates AsyncSession objects for async routes.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+# ------------------------------------------------------------
+# Read cache with transactional invalidation
+# ------------------------------------------------------------
+task_cache = LRUCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+list_cache = LRUCache(maxsize=LIST_CACHE_SIZE, ttl=CACHE_TTL)
+
+# session.info keys
+_PENDING_INVALIDATIONS = "pending_cache_invalidations"
+_TASK_GENERATION = "task_cache_generation"
+_LIST_GENERATION = "list_cache_generation"
+
+
+@event.listens_for(Session, "after_begin")
+def _remember_cache_generation(session, _transaction, _connection) -> None:
+    # Taken before the transaction's first read, so anything invalidated
+    # after this point makes the session's cache writes stale.
+    session.info[_TASK_GENERATION] = task_cache.generation
+    session.info[_LIST_GENERATION] = list_cache.generation
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_cache_invalidations(session) -> None:
+    if session.in_nested_transaction():
+        return  # a savepoint was released; wait for the real commit
+    pending = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if pending is None:
+        return
+    for task_id in pending:
+        task_cache.invalidate(task_id)
+    list_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_cache_invalidations(session) -> None:
+    if session.in_nested_transaction():
+        return  # keep what the outer transaction already wrote
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+def _record_write(session: Session, task_ids: Iterable[int]) -> None:
+    """
+    Note rows this session wrote: bump the tasks table version in the
+    same transaction, and queue cache invalidations, which are applied
+    after the commit and dropped on rollback.
+    """
+    pending = session.info.setdefault(_PENDING_INVALIDATIONS, set())
+    task_ids = set(task_ids)
+    if task_ids:
+        session.connection().execute(_BUMP_TASKS_VERSION)
+        pending.update(task_ids)
+
+
+def _cache_usable(session: Session) -> bool:
+    """
+    A session with uncommitted writes must neither read stale entries
+    nor publish its own uncommitted rows, so it bypasses the cache.
+    """
+    return _PENDING_INVALIDATIONS not in session.info
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters of the read caches."""
+    return {"task": task_cache.stats(), "list": list_cache.stats()}
+
 
 def init_db() -> None:
-    """Create tables if missing."""
+    """Create tables if missing and add columns newer than the file."""
     Base.metadata.create_all(bind=engine)
+    _upgrade_schema()
+    with engine.begin() as conn:
+        conn.execute(insert(TasksMeta).prefix_with("OR IGNORE")
+                     .values(id=1, version=0))
+
+
+def _upgrade_schema() -> None:
+    """
+    Bring a tasks.db created by an older version up to date.
+    create_all() only creates missing tables, not missing columns.
+    """
+    with engine.begin() as conn:
+        columns = {c["name"] for c in inspect(conn).get_columns("tasks")}
+        if "version" not in columns:
+            conn.exec_driver_sql(
+                "ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL "
+                "DEFAULT 1")
+        table_sql = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'tasks'").scalar()
+    if "AUTOINCREMENT" not in (table_sql or "").upper():
+        _rebuild_tasks_table()
+    with engine.begin() as conn:
+        for index in Task.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _rebuild_tasks_table() -> None:
+    """
+    Recreate a tasks table made without AUTOINCREMENT, which hands out
+    the ids of deleted tasks again (and with them their ETags), and
+    copy the rows over. SQLite cannot add AUTOINCREMENT to a table.
+    Runs as one transaction on a raw connection, whatever the profile.
+    """
+    table = Task.__table__
+    columns = ", ".join(column.name for column in table.columns)
+    create = str(CreateTable(table).compile(dialect=engine.dialect))
+    raw = engine.raw_connection()
+    dbapi_connection = raw.driver_connection
+    isolation_level = dbapi_connection.isolation_level
+    dbapi_connection.isolation_level = None  # BEGIN/COMMIT issued below
+    try:
+        dbapi_connection.execute("BEGIN IMMEDIATE")
+        try:
+            for index in table.indexes:
+                dbapi_connection.execute(f"DROP INDEX IF EXISTS {index.name}")
+            dbapi_connection.execute("ALTER TABLE tasks RENAME TO tasks_old")
+            dbapi_connection.execute(create)
+            # explicit ids also move sqlite_sequence up to the highest one
+            dbapi_connection.execute(
+                f"INSERT INTO tasks ({columns}) "
+                f"SELECT {columns} FROM tasks_old")
+            dbapi_connection.execute("DROP TABLE tasks_old")
+            dbapi_connection.execute("COMMIT")
+        except BaseException:
+            dbapi_connection.execute("ROLLBACK")
+            raise
+    finally:
+        dbapi_connection.isolation_level = isolation_level
+        raw.close()
 
 
 @contextmanager
-def session_scope() -> Generator[Session, None, None]:
+def session_scope(*, write: bool = False) -> Generator[Session, None, None]:
     """
     Transaction scope: commit on success, rollback on error,
     and always close the session.
+    With write=True the transaction takes SQLite's write lock up front.
     """
 
     session = SessionLocal()
     try:
+        if write:
+            session.connection(execution_options=WRITE_OPTIONS)
         yield session
         session.commit()
     except Exception:
@@ -90,7 +463,7 @@ def session_scope() -> Generator[Session, None, None]:
 
 
 # ------------------------------------------------------------
-# FastAPI dependency
+# FastAPI dependencies
 # ------------------------------------------------------------
 def get_session() -> Generator[Session, None, None]:
     """
@@ -101,15 +474,286 @@ def get_session() -> Generator[Session, None, None]:
         yield session
 
 
-def orm_list_tasks(session: Session) -> List[Task]:
-    """List all tasks from the database."""
-    result = session.execute(select(Task).order_by(Task.id))
-    return list(result.scalars())
+def get_write_session() -> Generator[Session, None, None]:
+    """
+    Like get_session(), for routes that write: the transaction starts
+    with BEGIN IMMEDIATE so concurrent writers queue on busy_timeout.
+    """
+    with session_scope(write=True) as session:
+        yield session
+
+
+@asynccontextmanager
+async def async_session_scope(
+    *, write: bool = False
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async transaction scope: same contract as session_scope().
+    """
+    session = AsyncSessionLocal()
+    try:
+        if write:
+            await session.connection(execution_options=WRITE_OPTIONS)
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yield a live AsyncSession to async FastAPI route handlers.
+    """
+    async with async_session_scope() as session:
+        yield session
+
+
+async def get_async_write_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async get_write_session().
+    """
+    async with async_session_scope(write=True) as session:
+        yield session
+
+
+# ------------------------------------------------------------
+# Write execution: own transaction or group commit
+# ------------------------------------------------------------
+# Shared write queue; None unless TASKS_GROUP_COMMIT=1.
+group_committer: Optional[GroupCommitter] = (
+    GroupCommitter(partial(session_scope, write=True),
+                   window=GROUP_COMMIT_WINDOW_MS / 1000,
+                   max_batch=GROUP_COMMIT_MAX_BATCH)
+    if GROUP_COMMIT else None
+)
+
+
+def run_write(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run fn(session, *args, **kwargs) in a committed write transaction
+    and return its result: its own transaction, or a slot in the next
+    group commit batch when group commit is enabled.
+    """
+    if group_committer is not None:
+        return group_committer.run(fn, *args, **kwargs)
+    with session_scope(write=True) as session:
+        return fn(session, *args, **kwargs)
+
+
+async def run_write_async(fn: Callable[..., T], *args: Any,
+                          **kwargs: Any) -> T:
+    """Async run_write(); `fn` is a sync helper, run via run_sync()."""
+    if group_committer is not None:
+        return await asyncio.wrap_future(
+            group_committer.submit(fn, *args, **kwargs))
+    async with async_session_scope(write=True) as session:
+        return await session.run_sync(fn, *args, **kwargs)
+
+
+def group_commit_stats() -> Optional[Dict[str, Any]]:
+    """Batch counters of the group commit queue (None if disabled)."""
+    return group_committer.stats() if group_committer is not None else None
+
+
+# ------------------------------------------------------------
+# ORM helpers
+# ------------------------------------------------------------
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    Smallest string greater than every string starting with `prefix`,
+    so `title LIKE 'abc%'` becomes an index range: 'abc' <= title < 'abd'.
+    """
+    prefix = prefix.rstrip(chr(0x10FFFF))
+    if not prefix:
+        return None
+    code = ord(prefix[-1]) + 1
+    if 0xD800 <= code <= 0xDFFF:
+        # surrogates can't be encoded (or stored); U+E000 sorts next
+        code = 0xE000
+    return prefix[:-1] + chr(code)
+
+
+def _filter_stmt(stmt, *, completed: Optional[bool] = None,
+                 title_prefix: Optional[str] = None):
+    """Apply the completed / title prefix filters to a SELECT."""
+    if completed is not None:
+        stmt = stmt.where(Task.completed == completed)
+    if title_prefix:
+        stmt = stmt.where(Task.title >= title_prefix)
+        upper = _prefix_upper_bound(title_prefix)
+        if upper is not None:
+            stmt = stmt.where(Task.title < upper)
+    return stmt
+
+
+def _page_stmt(
+    *,
+    limit: Optional[int] = None,
+    after: Optional[Cursor] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    sort: SortOrder = "id",
+):
+    """
+    Build a filtered, keyset-paginated SELECT of RECORD_COLUMNS.
+    `after` is the page_cursor() of the last task the caller has
+    already seen. It carries the title for title orderings, so paging
+    goes on even if that task has been deleted since.
+    """
+    stmt = _filter_stmt(select(*RECORD_COLUMNS), completed=completed,
+                        title_prefix=title_prefix)
+    descending = sort.startswith("-")
+    if sort.lstrip("-") == "title":
+        key = tuple_(Task.title, Task.id)
+        cursor = tuple_(*after) if after is not None else None
+        order = (Task.title, Task.id)
+    else:
+        key = Task.id
+        cursor = after
+        order = (Task.id,)
+    if descending:
+        order = tuple(column.desc() for column in order)
+    if after is not None:
+        stmt = stmt.where(key < cursor if descending else key > cursor)
+    stmt = stmt.order_by(*order)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def page_cursor(record: TaskRecord, sort: SortOrder = "id") -> Cursor:
+    """The `after` cursor that resumes a `sort` listing after record."""
+    if sort.lstrip("-") == "title":
+        return (record.title, record.id)
+    return record.id
+
+
+def orm_list_tasks(
+    session: Session,
+    *,
+    limit: Optional[int] = None,
+    after: Optional[Cursor] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    sort: SortOrder = "id",
+) -> List[TaskRecord]:
+    """
+    List tasks, optionally filtered, sorted and one keyset page at a
+    time. Pages (calls with a limit) are served from the list cache.
+    """
+    key = ("page", limit, after, completed, title_prefix, sort)
+    use_cache = limit is not None and _cache_usable(session)
+    if use_cache:
+        cached = list_cache.get(key)
+        if cached is not MISSING:
+            return list(cached)
+
+    # plain Core execution: rows come back as tuples, no Task instances
+    result = session.connection().execute(_page_stmt(
+        limit=limit, after=after, completed=completed,
+        title_prefix=title_prefix, sort=sort))
+    records = list(map(TaskRecord._make, result))
+    if use_cache:
+        list_cache.put(key, tuple(records),
+                       session.info.get(_LIST_GENERATION, -1))
+    return records
+
 
+def orm_iter_tasks(
+    session: Session,
+    *,
+    limit: Optional[int] = None,
+    after: Optional[Cursor] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    sort: SortOrder = "id",
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> Iterator[TaskRecord]:
+    """
+    Yield tasks like orm_list_tasks(), fetching `batch_size` rows at a
+    time so memory stays flat no matter how big the table is.
+    """
+    stmt = _page_stmt(
+        limit=limit, after=after, completed=completed,
+        title_prefix=title_prefix, sort=sort,
+    ).execution_options(yield_per=batch_size)
+    yield from map(TaskRecord._make, session.connection().execute(stmt))
 
-def orm_get_task(session: Session, task_id: int) -> Optional[Task]:
-    """Get a task by id."""
-    return session.get(Task, task_id)
+
+def orm_count_tasks(
+    session: Session,
+    *,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+) -> int:
+    """
+    Count tasks matching the filters with an index-only scan.
+    Cached in the list cache until the next write commits.
+    """
+    key = ("count", completed, title_prefix)
+    use_cache = _cache_usable(session)
+    if use_cache:
+        cached = list_cache.get(key)
+        if cached is not MISSING:
+            return cached
+    stmt = _filter_stmt(select(func.count()).select_from(Task),
+                        completed=completed, title_prefix=title_prefix)
+    count = session.scalar(stmt)
+    if use_cache:
+        list_cache.put(key, count, session.info.get(_LIST_GENERATION, -1))
+    return count
+
+
+def orm_get_task(session: Session, task_id: int) -> Optional[TaskRecord]:
+    """Get a task by id, through the task cache."""
+    use_cache = _cache_usable(session)
+    if use_cache:
+        cached = task_cache.get(task_id)
+        if cached is not MISSING:
+            return cached
+
+    task = session.get(Task, task_id)
+    if task is None:
+        return None
+    record = TaskRecord.from_task(task)
+    if use_cache:
+        task_cache.put(task_id, record,
+                       session.info.get(_TASK_GENERATION, -1))
+    return record
+
+
+def orm_get_task_version(session: Session, task_id: int) -> Optional[int]:
+    """
+    Return only a task's version (None if missing), for conditional
+    GETs: answered from the cache or a one-column query, no hydration.
+    """
+    if _cache_usable(session):
+        cached = task_cache.get(task_id)
+        if cached is not MISSING:
+            return cached.version
+    return session.scalar(select(Task.version).where(Task.id == task_id))
+
+
+def orm_tasks_fingerprint(session: Session) -> str:
+    """
+    Return a token that changes whenever any task is created, updated
+    or deleted: the tasks table version, one primary key lookup.
+    Cached in the list cache until the next write commits.
+    """
+    if _cache_usable(session):
+        cached = list_cache.get("fingerprint")
+        if cached is not MISSING:
+            return cached
+    version = session.scalar(
+        select(TasksMeta.version).where(TasksMeta.id == 1))
+    fingerprint = str(version or 0)
+    if _cache_usable(session):
+        list_cache.put("fingerprint", fingerprint,
+                       session.info.get(_LIST_GENERATION, -1))
+    return fingerprint
 
 
 def orm_create_task(
@@ -126,41 +770,335 @@ def orm_create_task(
     )
     session.add(task)
     session.flush()  # assign autoincrement id before commit
+    _record_write(session, [task.id])
     return task
 
 
+def _conditional_write(stmt, task_id: int,
+                       expected_versions: Optional[Collection[int]]):
+    """Restrict an UPDATE/DELETE to one task and the expected versions."""
+    stmt = stmt.where(Task.id == task_id)
+    if expected_versions is not None:
+        stmt = stmt.where(Task.version.in_(list(expected_versions)))
+    return stmt
+
+
+def _forget_loaded(session: Session, task_id: int) -> None:
+    """
+    Drop a Task this session may have loaded before a Core write changed
+    its row, so a later session.get() reloads it.
+    """
+    task = session.identity_map.get(session.identity_key(Task, task_id))
+    if task is not None:
+        session.expunge(task)
+
+
+def _check_version(session: Session, task_id: int,
+                   expected_versions: Optional[Collection[int]]) -> None:
+    """
+    A conditional write matched no row: raise VersionConflict if the
+    task exists after all (the caller reports a 404 otherwise).
+    """
+    if expected_versions is None:
+        return
+    version = session.scalar(select(Task.version).where(Task.id == task_id))
+    if version is not None:
+        raise VersionConflict(task_id, version)
+
+
 def orm_update_task(
     session: Session,
     task_id: int,
     *,
+    expected_versions: Optional[Collection[int]] = None,
     title: Optional[str] = None,
     description: Optional[str] = None,
     completed: Optional[bool] = None,
-) -> Optional[Task]:
-    """Partially update a task and return the updated ORM object."""
-    task = session.get(Task, task_id)
-    if not task:
-        return None
+) -> Optional[TaskRecord]:
+    """
+    Partially update a task and return the updated record, with a
+    single UPDATE ... RETURNING (None if there is no such task).
+    With `expected_versions`, raise VersionConflict unless the task is
+    currently at one of them.
+    """
+    values: Dict[str, Any] = {"version": Task.version + 1}
     if title is not None:
-        task.title = title
+        values["title"] = title
     if description is not None:
-        task.description = description
+        values["description"] = description
     if completed is not None:
-        task.completed = completed
-    session.flush()
-    return task
+        values["completed"] = completed
+    stmt = _conditional_write(update(Task), task_id, expected_versions)
+    # Core execution: ORM-enabled DML would add a lot of per-call overhead
+    row = session.connection().execute(
+        stmt.values(values).returning(*RECORD_COLUMNS)).first()
+    if row is None:
+        _check_version(session, task_id, expected_versions)
+        return None
+    _forget_loaded(session, task_id)
+    _record_write(session, [task_id])
+    return TaskRecord._make(row)
 
 
-def orm_delete_task(session: Session, task_id: int) -> bool:
-    """Delete a task from the database."""
-    task = session.get(Task, task_id)
-    if not task:
+def orm_delete_task(
+    session: Session,
+    task_id: int,
+    *,
+    expected_versions: Optional[Collection[int]] = None,
+) -> bool:
+    """
+    Delete a task from the database with a single DELETE ... RETURNING.
+    `expected_versions` works as in orm_update_task().
+    """
+    stmt = _conditional_write(delete(Task), task_id, expected_versions)
+    row = session.connection().execute(stmt.returning(Task.id)).first()
+    if row is None:
+        _check_version(session, task_id, expected_versions)
         return False
-    session.delete(task)
-    session.flush()
+    _forget_loaded(session, task_id)
+    _record_write(session, [task_id])
     return True
 
 
+# ------------------------------------------------------------
+# Bulk helpers: many rows, one transaction
+# ------------------------------------------------------------
+class BulkError(NamedTuple):
+    """One item of a bulk request that could not be applied."""
+
+    index: int
+    task_id: Optional[int]
+    detail: str
+
+
+def _chunks(seq: Sequence[Any], size: int = BULK_CHUNK_SIZE):
+    """Yield (start offset, slice) pairs of at most `size` items."""
+    for start in range(0, len(seq), size):
+        yield start, seq[start:start + size]
+
+
+def _existing_ids(session: Session, ids: Sequence[int]) -> set[int]:
+    """Return which of `ids` exist, with one IN query per chunk."""
+    found: set[int] = set()
+    for _, chunk in _chunks(list(set(ids))):
+        stmt = (select(Task.id)
+                .where(Task.id.in_(chunk))
+                .execution_options(**CHUNKED_OPTIONS))
+        found.update(session.scalars(stmt))
+    return found
+
+
+def orm_bulk_create_tasks(
+    session: Session,
+    rows: Sequence[Dict[str, Any]],
+) -> Tuple[List[Task], List[BulkError]]:
+    """
+    Insert many tasks with executemany-style INSERT ... RETURNING.
+    Each chunk runs in a savepoint; if a chunk fails it is retried row
+    by row so only the bad rows are reported and the rest are kept.
+    """
+    created: List[Task] = []
+    failed: List[BulkError] = []
+    values = [
+        {
+            "title": row["title"],
+            "description": row.get("description") or "",
+            "completed": bool(row.get("completed", False)),
+        }
+        for row in rows
+    ]
+    stmt = insert(Task).returning(Task)
+    for start, chunk in _chunks(values):
+        try:
+            with session.begin_nested():
+                created.extend(session.scalars(stmt, chunk))
+            continue
+        except SQLAlchemyError:
+            pass
+        for offset, value in enumerate(chunk):
+            try:
+                with session.begin_nested():
+                    created.extend(session.scalars(stmt, [value]))
+            except SQLAlchemyError as exc:
+                failed.append(BulkError(start + offset, None,
+                                         str(getattr(exc, "orig", exc))))
+    _record_write(session, [task.id for task in created])
+    return created, failed
+
+
+def orm_bulk_update_tasks(
+    session: Session,
+    rows: Sequence[Dict[str, Any]],
+) -> Tuple[List[Task], List[BulkError]]:
+    """
+    Patch many tasks by primary key. Each row is {"id": ..., <fields>}.
+    Missing ids and rows without fields are reported, not raised.
+    """
+    failed: List[BulkError] = []
+    existing = _existing_ids(session, [row["id"] for row in rows])
+    params: List[Dict[str, Any]] = []
+    for index, row in enumerate(rows):
+        fields = {k: v for k, v in row.items()
+                  if k != "id" and v is not None}
+        if not fields:
+            failed.append(BulkError(index, row["id"], "No fields to update"))
+        elif row["id"] not in existing:
+            failed.append(BulkError(index, row["id"], "Task not found"))
+        else:
+            params.append({"id": row["id"], **fields})
+
+    # one executemany UPDATE per distinct set of changed columns
+    by_columns: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for param in params:
+        columns = tuple(sorted(k for k in param if k != "id"))
+        by_columns.setdefault(columns, []).append(param)
+
+    table = Task.__table__
+    updated_ids: List[int] = []
+    for columns, group in by_columns.items():
+        values: Dict[str, Any] = {c: bindparam(f"b_{c}") for c in columns}
+        values["version"] = table.c.version + 1
+        stmt = (update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(values))
+        for _, chunk in _chunks(group):
+            session.execute(
+                stmt, [{f"b_{k}": v for k, v in p.items()} for p in chunk])
+            updated_ids.extend(p["id"] for p in chunk)
+    _record_write(session, updated_ids)
+
+    updated: List[Task] = []
+    for _, chunk in _chunks(list(dict.fromkeys(updated_ids))):
+        stmt = (
+            select(Task)
+            .where(Task.id.in_(chunk))
+            .order_by(Task.id)
+            .execution_options(populate_existing=True, **CHUNKED_OPTIONS)
+        )
+        updated.extend(session.scalars(stmt))
+    return updated, failed
+
+
+def orm_bulk_delete_tasks(
+    session: Session,
+    task_ids: Sequence[int],
+) -> Tuple[List[int], List[BulkError]]:
+    """Delete many tasks by id with one DELETE ... IN per chunk."""
+    existing = _existing_ids(session, task_ids)
+    failed = [
+        BulkError(index, task_id, "Task not found")
+        for index, task_id in enumerate(task_ids)
+        if task_id not in existing
+    ]
+    deleted = list(dict.fromkeys(t for t in task_ids if t in existing))
+    for _, chunk in _chunks(deleted):
+        session.execute(
+            delete(Task)
+            .where(Task.id.in_(chunk))
+            .execution_options(synchronize_session=False,
+                               **CHUNKED_OPTIONS)
+        )
+    _record_write(session, deleted)
+    return deleted, failed
+
+
+# ------------------------------------------------------------
+# Async variants
+# ------------------------------------------------------------
+# Each helper runs its sync counterpart through AsyncSession.run_sync,
+# so both paths share one implementation while the async one never
+# blocks the event loop.
+async def orm_list_tasks_async(
+    session: AsyncSession, **kwargs: Any
+) -> List[TaskRecord]:
+    """Async orm_list_tasks()."""
+    return await session.run_sync(orm_list_tasks, **kwargs)
+
+
+async def orm_iter_tasks_async(
+    session: AsyncSession,
+    *,
+    batch_size: int = STREAM_BATCH_SIZE,
+    **kwargs: Any,
+) -> AsyncIterator[TaskRecord]:
+    """Async orm_iter_tasks(), streamed from a server-side cursor."""
+    stmt = _page_stmt(**kwargs).execution_options(yield_per=batch_size)
+    connection = await session.connection()
+    result = await connection.stream(stmt)
+    async for row in result:
+        yield TaskRecord._make(row)
+
+
+async def orm_count_tasks_async(session: AsyncSession, **kwargs: Any) -> int:
+    """Async orm_count_tasks()."""
+    return await session.run_sync(orm_count_tasks, **kwargs)
+
+
+async def orm_get_task_async(
+    session: AsyncSession, task_id: int
+) -> Optional[TaskRecord]:
+    """Async orm_get_task()."""
+    return await session.run_sync(orm_get_task, task_id)
+
+
+async def orm_get_task_version_async(
+    session: AsyncSession, task_id: int
+) -> Optional[int]:
+    """Async orm_get_task_version()."""
+    return await session.run_sync(orm_get_task_version, task_id)
+
+
+async def orm_tasks_fingerprint_async(session: AsyncSession) -> str:
+    """Async orm_tasks_fingerprint()."""
+    return await session.run_sync(orm_tasks_fingerprint)
+
+
+async def orm_create_task_async(
+    session: AsyncSession,
+    title: str,
+    description: Optional[str],
+    completed: bool,
+) -> Task:
+    """Async orm_create_task()."""
+    return await session.run_sync(
+        orm_create_task, title, description, completed)
+
+
+async def orm_update_task_async(
+    session: AsyncSession, task_id: int, **fields: Any
+) -> Optional[TaskRecord]:
+    """Async orm_update_task()."""
+    return await session.run_sync(orm_update_task, task_id, **fields)
+
+
+async def orm_delete_task_async(
+    session: AsyncSession, task_id: int, **kwargs: Any
+) -> bool:
+    """Async orm_delete_task()."""
+    return await session.run_sync(orm_delete_task, task_id, **kwargs)
+
+
+async def orm_bulk_create_tasks_async(
+    session: AsyncSession, rows: Sequence[Dict[str, Any]]
+) -> Tuple[List[Task], List[BulkError]]:
+    """Async orm_bulk_create_tasks()."""
+    return await session.run_sync(orm_bulk_create_tasks, rows)
+
+
+async def orm_bulk_update_tasks_async(
+    session: AsyncSession, rows: Sequence[Dict[str, Any]]
+) -> Tuple[List[Task], List[BulkError]]:
+    """Async orm_bulk_update_tasks()."""
+    return await session.run_sync(orm_bulk_update_tasks, rows)
+
+
+async def orm_bulk_delete_tasks_async(
+    session: AsyncSession, task_ids: Sequence[int]
+) -> Tuple[List[int], List[BulkError]]:
+    """Async orm_bulk_delete_tasks()."""
+    return await session.run_sync(orm_bulk_delete_tasks, task_ids)
+
+
 if __name__ == "__main__":
     # Quick manual test for the ORM layer.
     # Run:
@@ -0,0 +1,171 @@
+"""
+Phase 4, group commit: apply concurrent writes in shared transactions
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import (
+    Any, Callable, ContextManager, Dict, List, NamedTuple, Optional,
+)
+
+from sqlalchemy.orm import Session
+
+
+class _Op(NamedTuple):
+    """One queued write: fn(session, *args, **kwargs) -> future."""
+
+    future: Future
+    fn: Callable[..., Any]
+    args: tuple
+    kwargs: Dict[str, Any]
+
+
+class GroupCommitter:
+    """
+    Funnel writes from many threads through one worker that batches them.
+
+    - The worker takes the first queued write, then keeps collecting for
+      up to `window` seconds or until `max_batch` writes are queued.
+    - The batch runs in one transaction from `scope()` (a session_scope
+      style context manager), each write in its own SAVEPOINT, so one
+      failing write is rolled back alone and only its caller sees the
+      error.
+    - Futures resolve only after the batch has committed; if the commit
+      itself fails, every write of the batch fails with that error.
+    """
+
+    def __init__(self, scope: Callable[[], ContextManager[Session]], *,
+                 window: float = 0.002, max_batch: int = 64) -> None:
+        self.scope = scope
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: "queue.SimpleQueue[Optional[_Op]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.ops = 0
+        self.failed_ops = 0
+        self.failed_commits = 0
+        self.max_batch_seen = 0
+        # batch size histogram: bucket upper bound (1, 2, 4, ...) -> count
+        self._sizes: Dict[int, int] = {}
+
+    def submit(self, fn: Callable[..., Any], *args: Any,
+               **kwargs: Any) -> Future:
+        """Queue fn(session, *args, **kwargs); return its future."""
+        self._start()
+        future: Future = Future()
+        self._queue.put(_Op(future, fn, args, kwargs))
+        return future
+
+    def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """submit() and wait for the committed result (or raise)."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def stop(self) -> None:
+        """Commit what is queued, then stop the worker thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _start(self) -> None:
+        """Start the worker thread on first use."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name="group-commit", daemon=True)
+                self._thread.start()
+
+    def _worker(self) -> None:
+        """Collect batches and commit them until stop() is called."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                try:
+                    op = self._queue.get(
+                        timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if op is None:
+                    stopping = True
+                    break
+                batch.append(op)
+            self._commit(batch)
+            if stopping:
+                return
+
+    def _commit(self, batch: List[_Op]) -> None:
+        """Apply one batch in one transaction and resolve its futures."""
+        batch = [op for op in batch
+                 if op.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        outcomes: List[tuple] = []
+        try:
+            with self.scope() as session:
+                for op in batch:
+                    try:
+                        with session.begin_nested():
+                            result = op.fn(session, *op.args, **op.kwargs)
+                        outcomes.append((True, result))
+                    except Exception as exc:  # pylint: disable=broad-except
+                        outcomes.append((False, exc))
+        except Exception as exc:  # pylint: disable=broad-except
+            # BEGIN or COMMIT failed: nothing of this batch was written
+            self._record(len(batch), len(batch), commit_failed=True)
+            for op in batch:
+                op.future.set_exception(exc)
+            return
+
+        failed = sum(1 for ok, _ in outcomes if not ok)
+        self._record(len(batch), failed)
+        for op, (ok, value) in zip(batch, outcomes):
+            if ok:
+                op.future.set_result(value)
+            else:
+                op.future.set_exception(value)
+
+    def _record(self, size: int, failed: int,
+                commit_failed: bool = False) -> None:
+        """Update the batch counters."""
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+        with self._lock:
+            self.batches += 1
+            self.ops += size
+            self.failed_ops += failed
+            self.failed_commits += commit_failed
+            self.max_batch_seen = max(self.max_batch_seen, size)
+            self._sizes[bucket] = self._sizes.get(bucket, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        with self._lock:
+            return {
+                "window_ms": self.window * 1000,
+                "max_batch": self.max_batch,
+                "batches": self.batches,
+                "ops": self.ops,
+                "failed_ops": self.failed_ops,
+                "failed_commits": self.failed_commits,
+                "avg_batch_size": (self.ops / self.batches
+                                   if self.batches else 0.0),
+                "max_batch_size": self.max_batch_seen,
+                "batch_size_histogram": {
+                    f"<={bucket}": count
+                    for bucket, count in sorted(self._sizes.items())
+                },
+            }
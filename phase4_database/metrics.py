@@ -0,0 +1,274 @@
+"""
+Phase 4, metrics: request timing, SQL instrumentation, Prometheus text
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds (seconds, and queries per request).
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Execution options for a statement run once per chunk of a bulk
+# operation. Like executemany calls, it is left out of N+1 detection.
+CHUNKED_OPTIONS = {"metrics_chunked": True}
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label set."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.series: Dict[Labels, List[float]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        """Count one value (caller holds the registry lock)."""
+        series = self.series.get(labels)
+        if series is None:
+            # per-bucket counts, then +Inf count and sum
+            series = self.series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+
+class QueryStats:
+    """SQL executed on behalf of one HTTP request."""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+
+# Set by MetricsMiddleware for the duration of a request. Starlette runs
+# sync routes and dependencies in a copy of the context, so queries they
+# execute still land on the request's QueryStats.
+current_queries: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_queries", default=None)
+
+
+class Metrics:
+    """
+    Process-wide metrics registry.
+
+    - HTTP: latency histogram and response counter per method, route
+      template and status.
+    - SQL: query latency histogram, queries per request, slow queries
+      (at least `slow_query_seconds`), and N+1 suspects: requests that
+      ran one statement `n_plus_one_threshold` times or more.
+    """
+
+    def __init__(self, slow_query_seconds: float = 0.1,
+                 n_plus_one_threshold: int = 10) -> None:
+        self.slow_query_seconds = slow_query_seconds
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self.request_seconds = Histogram(LATENCY_BUCKETS)
+        self.requests: Counter = Counter()
+        self.query_seconds = Histogram(LATENCY_BUCKETS)
+        self.queries_per_request = Histogram(QUERY_COUNT_BUCKETS)
+        self.slow_queries = 0
+        self.n_plus_one: Counter = Counter()
+        self._n_plus_one_logged: set = set()
+
+    def observe_query(self, statement: str, seconds: float,
+                      bulk: bool = False) -> None:
+        """
+        Record one executed statement. A bulk statement (executemany,
+        a batch of a multi-row insert, or one run with CHUNKED_OPTIONS)
+        is timed and counted but not considered for N+1: bulk work
+        repeats it by design.
+        """
+        stats = current_queries.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            if not bulk:
+                stats.statements[statement] += 1
+        with self._lock:
+            self.query_seconds.observe((), seconds)
+            if seconds >= self.slow_query_seconds:
+                self.slow_queries += 1
+        if seconds >= self.slow_query_seconds:
+            logger.warning("Slow query (%.1f ms): %s", seconds * 1000,
+                           statement)
+
+    def observe_request(self, method: str, route: str, status: int,
+                        seconds: float,
+                        queries: Optional[QueryStats]) -> None:
+        """Record one finished request and the SQL it ran."""
+        labels = (("method", method), ("route", route))
+        suspects: List[str] = []
+        if queries is not None and queries.statements:
+            suspects = [
+                statement
+                for statement, count in queries.statements.items()
+                if count >= self.n_plus_one_threshold
+            ]
+        first_seen = []
+        with self._lock:
+            self.request_seconds.observe(labels, seconds)
+            self.requests[labels + (("status", str(status)),)] += 1
+            if queries is not None:
+                self.queries_per_request.observe(labels, queries.count)
+            if suspects:
+                self.n_plus_one[labels] += 1
+            for statement in suspects:
+                if (route, statement) not in self._n_plus_one_logged:
+                    self._n_plus_one_logged.add((route, statement))
+                    first_seen.append(statement)
+        # log each suspect statement once per route
+        for statement in first_seen:
+            logger.warning(
+                "Possible N+1 in %s %s: statement ran %d times: %s",
+                method, route, queries.statements[statement], statement)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            _render_histogram(
+                lines, "tasks_http_request_duration_seconds",
+                "HTTP request latency by route.", self.request_seconds)
+            _render_counter(
+                lines, "tasks_http_requests_total",
+                "HTTP responses by route and status.", self.requests)
+            _render_histogram(
+                lines, "tasks_db_query_duration_seconds",
+                "SQL statement latency.", self.query_seconds)
+            _render_histogram(
+                lines, "tasks_db_queries_per_request",
+                "SQL statements executed per HTTP request.",
+                self.queries_per_request)
+            _render_counter(
+                lines, "tasks_db_slow_queries_total",
+                "SQL statements slower than the slow query threshold.",
+                {(): self.slow_queries})
+            _render_counter(
+                lines, "tasks_db_n_plus_one_total",
+                "Requests that repeated one statement past the N+1 "
+                "threshold.", self.n_plus_one)
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    """{a="1",b="2"} with Prometheus escaping ("" if no labels)."""
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels:
+        value = (value.replace("\\", "\\\\").replace("\n", "\\n")
+                 .replace('"', '\\"'))
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _render_counter(lines: List[str], name: str, doc: str,
+                    values: Dict[Labels, Any]) -> None:
+    """Append HELP/TYPE and one sample per label set."""
+    lines.append(f"# HELP {name} {doc}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, value in sorted(values.items()):
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+
+def _render_histogram(lines: List[str], name: str, doc: str,
+                      histogram: Histogram) -> None:
+    """Append HELP/TYPE and the _bucket/_sum/_count samples."""
+    lines.append(f"# HELP {name} {doc}")
+    lines.append(f"# TYPE {name} histogram")
+    bounds = [f"{bound:g}" for bound in histogram.buckets] + ["+Inf"]
+    for labels, series in sorted(histogram.series.items()):
+        cumulative = 0
+        for bound, count in zip(bounds, series):
+            cumulative += count
+            bucket_labels = _format_labels(labels + (("le", bound),))
+            lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {series[-1]}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+
+def instrument_engine(engine: Engine, metrics: "Metrics") -> None:
+    """
+    Time every statement the engine runs. For an AsyncEngine, pass its
+    sync_engine.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, _cursor, _statement, _parameters, _context,
+                _executemany):
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, _cursor, statement, _parameters, context,
+               executemany):
+        started = conn.info.pop("query_start", None)
+        if started is None:
+            return
+        # executemany is also True for each insertmanyvalues batch
+        bulk = executemany or (
+            context is not None
+            and context.execution_options.get("metrics_chunked", False))
+        metrics.observe_query(statement, time.perf_counter() - started,
+                              bulk)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # the statement failed: after_cursor_execute will not run
+        if context.connection is not None:
+            context.connection.info.pop("query_start", None)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware overhead) that times each
+    HTTP request and collects the SQL it runs via `current_queries`.
+    Requests are labelled by route template, e.g. /tasks/{task_id}.
+    """
+
+    def __init__(self, app, metrics: Metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        queries = QueryStats()
+        token = current_queries.set(queries)
+        started = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_queries.reset(token)
+            route = scope.get("route")
+            self.metrics.observe_request(
+                scope["method"],
+                getattr(route, "path", "<unmatched>"),
+                status, elapsed, queries)
@@ -0,0 +1,19 @@
+from phase1_basics.breach_check import BreachIndex, build_index
+
+DUMP = [
+    "HASH:COUNT\n",  # header
+    "5BAA61E4C9B93F3F0682250B6CF8331B7EE68FD8:3\n",  # "password"
+    "5BAA61E4C9B93F\n",  # truncated record
+    "\n",
+    "7C4A8D09CA3762AF61E59520943DC26494F8941B\n",  # "123456"
+    "not a hash\n",
+]
+
+
+def test_build_skips_malformed_sha1_lines(tmp_path):
+    path = tmp_path / "dump.idx"
+    assert build_index(DUMP, path, sha1=True) == (2, 3)
+    with BreachIndex(path) as index:
+        assert "password" in index
+        assert "123456" in index
+        assert "letmein" not in index
@@ -0,0 +1,20 @@
+import pytest
+from fastapi import HTTPException
+
+from phase4_database.crud_api import encode_cursor, parse_cursor
+
+BIG = 2 ** 63
+
+
+def test_id_cursor_range():
+    assert parse_cursor(str(BIG - 1), "id") == BIG - 1
+    with pytest.raises(HTTPException) as info:
+        parse_cursor(str(BIG), "-id")
+    assert info.value.status_code == 400
+
+
+def test_title_cursor_range():
+    assert parse_cursor(encode_cursor(("a", 7)), "title") == ("a", 7)
+    with pytest.raises(HTTPException) as info:
+        parse_cursor(encode_cursor(("a", BIG)), "title")
+    assert info.value.status_code == 400
@@ -0,0 +1,23 @@
+import pytest
+
+from phase1_basics.expression_engine import Expression, ExpressionError
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("min(3)", 3.0),
+    ("max(3)", 3.0),
+    ("min(3, 1, 2)", 1.0),
+    ("max(-1, 4)", 4.0),
+])
+def test_min_max_fold(source, expected):
+    assert Expression(source)() == expected
+
+
+def test_min_max_single_variable():
+    assert Expression("max(x)")(x=5) == 5.0
+    assert Expression("min(x)")(x=-2) == -2.0
+
+
+def test_min_needs_an_argument():
+    with pytest.raises(ExpressionError):
+        Expression("min()")